@@ -1,7 +1,19 @@
-from functools import lru_cache
-from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, TypeVar
 
-from .connection import PyreConnection
+from .connection import PyreConnection, PyreQueryResult
+from .snapshot_cache import SnapshotCache
+
+
+T = TypeVar("T")
+
+# When set, the class hierarchy and call graph are shared through this cache.
+_snapshot_cache: Optional[SnapshotCache] = None
+
+
+def set_snapshot_cache(cache: Optional[SnapshotCache]) -> None:
+    global _snapshot_cache
+    _snapshot_cache = cache
 
 
 class DefineParameter(NamedTuple):
@@ -44,6 +56,16 @@ class CallGraphTarget:
             _parse_location(location) for location in call["locations"]
         ]
 
+    @classmethod
+    def _create(
+        cls, target: str, kind: str, locations: List[Location]
+    ) -> "CallGraphTarget":
+        call_graph_target = cls.__new__(cls)
+        call_graph_target.target = target
+        call_graph_target.kind = kind
+        call_graph_target.locations = locations
+        return call_graph_target
+
     def __eq__(self, other: "CallGraphTarget") -> bool:
         return (
             self.target == other.target
@@ -53,13 +75,19 @@ class CallGraphTarget:
 
 
 class ClassHierarchy:
-    def __init__(self, hierarchy: Dict[str, List[str]]) -> None:
+    def __init__(
+        self,
+        hierarchy: Dict[str, List[str]],
+        reverse_hierarchy: Optional[Dict[str, List[str]]] = None,
+    ) -> None:
         self.hierarchy = hierarchy
+        self._reverse_hierarchy: Optional[Dict[str, List[str]]] = reverse_hierarchy
 
-    # Poor man's cached property.
     @property
-    @lru_cache(maxsize=1)
     def reverse_hierarchy(self) -> Dict[str, List[str]]:
+        reversed_mapping = self._reverse_hierarchy
+        if reversed_mapping is not None:
+            return reversed_mapping
         reversed_mapping = {}
         # In order to distinguish between missing types and types
         # with no subclasses, we initialize everything to [] for known keys.
@@ -68,6 +96,7 @@ class ClassHierarchy:
         for key, values in self.hierarchy.items():
             for value in values:
                 reversed_mapping[value].append(key)
+        self._reverse_hierarchy = reversed_mapping
         return reversed_mapping
 
     def subclasses(self, class_name: str) -> Optional[List[str]]:
@@ -97,32 +126,55 @@ def _defines(pyre_connection: PyreConnection, modules: Iterable[str]) -> List[De
     ]
 
 
-def defines(
-    pyre_connection: PyreConnection,
-    modules: Iterable[str],
-    batch_size: Optional[int] = None,
-) -> List[Define]:
-    modules = list(modules)
+def _chunks(items: List[str], batch_size: Optional[int]) -> List[List[str]]:
     if batch_size is None:
-        return _defines(pyre_connection, modules)
+        return [items]
     if batch_size <= 0:
         raise ValueError(
             "batch_size must a positive integer, provided: `{}`".format(batch_size)
         )
-    found_defines: List[Define] = []
-    module_chunks = [
-        modules[index : index + batch_size]
-        for index in range(0, len(modules), batch_size)
+    return [
+        items[index : index + batch_size] for index in range(0, len(items), batch_size)
     ]
-    for modules in module_chunks:
-        found_defines.extend(_defines(pyre_connection, modules))
+
+
+def _map_chunks(
+    pyre_connection: PyreConnection,
+    function: Callable[[PyreConnection, List[str]], T],
+    chunks: List[List[str]],
+    number_of_workers: Optional[int],
+) -> List[T]:
+    """Applies `function` to every chunk, running up to `number_of_workers`
+    queries at a time. Results are returned in the order of `chunks`."""
+    if number_of_workers is None or number_of_workers <= 1 or len(chunks) <= 1:
+        return [function(pyre_connection, chunk) for chunk in chunks]
+    if not pyre_connection.server_initialized:
+        # Avoid starting the server from several threads.
+        pyre_connection.start_server()
+    with ThreadPoolExecutor(max_workers=number_of_workers) as executor:
+        return list(
+            executor.map(lambda chunk: function(pyre_connection, chunk), chunks)
+        )
+
+
+def defines(
+    pyre_connection: PyreConnection,
+    modules: Iterable[str],
+    batch_size: Optional[int] = None,
+    number_of_workers: Optional[int] = None,
+) -> List[Define]:
+    found_defines: List[Define] = []
+    for chunk_defines in _map_chunks(
+        pyre_connection,
+        _defines,
+        _chunks(list(modules), batch_size),
+        number_of_workers,
+    ):
+        found_defines.extend(chunk_defines)
     return found_defines
 
 
-def get_class_hierarchy(pyre_connection: PyreConnection) -> Optional[ClassHierarchy]:
-    result = pyre_connection.query_server("dump_class_hierarchy()")
-    if result is None or "response" not in result:
-        return None
+def _build_class_hierarchy(result: PyreQueryResult) -> ClassHierarchy:
     hierarchy = {
         key: edges
         for annotation_and_edges in result["response"]
@@ -131,6 +183,72 @@ def get_class_hierarchy(pyre_connection: PyreConnection) -> Optional[ClassHierar
     return ClassHierarchy(hierarchy)
 
 
+class _StringTable:
+    """Numbers the strings of a snapshot, which repeat a lot."""
+
+    def __init__(self) -> None:
+        self.strings: List[str] = []
+        self._indices: Dict[str, int] = {}
+
+    def index(self, string: str) -> int:
+        index = self._indices.get(string)
+        if index is None:
+            index = len(self.strings)
+            self._indices[string] = index
+            self.strings.append(string)
+        return index
+
+
+def _encode_class_hierarchy(class_hierarchy: ClassHierarchy) -> Dict[str, Any]:
+    # The reverse hierarchy is stored as well, so loading a snapshot does not
+    # index the hierarchy again.
+    table = _StringTable()
+
+    def encode(hierarchy: Dict[str, List[str]]) -> List[List[int]]:
+        return [
+            [table.index(key), *(table.index(edge) for edge in edges)]
+            for key, edges in hierarchy.items()
+        ]
+
+    hierarchy = encode(class_hierarchy.hierarchy)
+    reverse_hierarchy = encode(class_hierarchy.reverse_hierarchy)
+    return {
+        "strings": table.strings,
+        "hierarchy": hierarchy,
+        "reverse_hierarchy": reverse_hierarchy,
+    }
+
+
+def _decode_class_hierarchy(value: Dict[str, Any]) -> ClassHierarchy:
+    strings: List[str] = value["strings"]
+
+    def decode(hierarchy: List[List[int]]) -> Dict[str, List[str]]:
+        return {
+            strings[key]: [strings[edge] for edge in edges] for key, *edges in hierarchy
+        }
+
+    return ClassHierarchy(
+        decode(value["hierarchy"]), decode(value["reverse_hierarchy"])
+    )
+
+
+def get_class_hierarchy(pyre_connection: PyreConnection) -> Optional[ClassHierarchy]:
+    cache = _snapshot_cache
+    if cache is not None:
+        return cache.get(
+            pyre_connection,
+            "class_hierarchy",
+            "dump_class_hierarchy()",
+            _build_class_hierarchy,
+            _encode_class_hierarchy,
+            _decode_class_hierarchy,
+        )
+    result = pyre_connection.query_server("dump_class_hierarchy()")
+    if result is None or "response" not in result:
+        return None
+    return _build_class_hierarchy(result)
+
+
 def get_superclasses(pyre_connection: PyreConnection, class_name: str) -> List[str]:
     query = f"superclasses({class_name})"
     result = pyre_connection.query_server(query)
@@ -147,17 +265,92 @@ def get_attributes(pyre_connection: PyreConnection, class_name: str) -> List[str
     return [attribute["name"] for attribute in result["response"]["attributes"]]
 
 
+CallGraph = Dict[str, List[CallGraphTarget]]
+
+
+def _build_call_graph(result: PyreQueryResult) -> CallGraph:
+    call_graph = {}
+
+    for function, calls in result["response"].items():
+        call_graph[function] = [CallGraphTarget(call) for call in calls]
+    return call_graph
+
+
+def _encode_call_graph(call_graph: CallGraph) -> Dict[str, Any]:
+    # Calls are stored as [target, kind, locations], where locations are
+    # flattened into [path, start line, start column, stop line, stop column]
+    # for each location.
+    table = _StringTable()
+    functions = [
+        [
+            table.index(function),
+            [
+                [
+                    table.index(call.target),
+                    table.index(call.kind),
+                    [
+                        field
+                        for location in call.locations
+                        for field in (
+                            table.index(location.path),
+                            location.start.line,
+                            location.start.column,
+                            location.stop.line,
+                            location.stop.column,
+                        )
+                    ],
+                ]
+                for call in calls
+            ],
+        ]
+        for function, calls in call_graph.items()
+    ]
+    return {"strings": table.strings, "call_graph": functions}
+
+
+def _decode_call_graph(value: Dict[str, Any]) -> CallGraph:
+    strings: List[str] = value["strings"]
+    return {
+        strings[function]: [
+            CallGraphTarget._create(
+                strings[target],
+                strings[kind],
+                [
+                    Location(
+                        path=strings[locations[index]],
+                        start=Position(
+                            line=locations[index + 1], column=locations[index + 2]
+                        ),
+                        stop=Position(
+                            line=locations[index + 3], column=locations[index + 4]
+                        ),
+                    )
+                    for index in range(0, len(locations), 5)
+                ],
+            )
+            for target, kind, locations in calls
+        ]
+        for function, calls in value["call_graph"]
+    }
+
+
 def get_call_graph(
     pyre_connection: PyreConnection,
 ) -> Optional[Dict[str, List[CallGraphTarget]]]:
+    cache = _snapshot_cache
+    if cache is not None:
+        return cache.get(
+            pyre_connection,
+            "call_graph",
+            "dump_call_graph()",
+            _build_call_graph,
+            _encode_call_graph,
+            _decode_call_graph,
+        )
     result = pyre_connection.query_server("dump_call_graph()")
     if result is None or "response" not in result:
         return None
-    call_graph = {}
-
-    for function, calls in result["response"].items():
-        call_graph[function] = [CallGraphTarget(call) for call in calls]
-    return call_graph
+    return _build_call_graph(result)
 
 
 def _parse_location(location_json: Dict[str, Any]) -> Location:
@@ -0,0 +1,247 @@
+# Copyright (c) 2016-present, Facebook, Inc.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from .connection import PyreConnection, PyreQueryResult
+
+
+LOG: logging.Logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SNAPSHOT_SUFFIX = ".json.gz"
+# Snapshots written in another format are ignored and recomputed.
+SNAPSHOT_FORMAT_VERSION = 1
+CONFIGURATION_FILES: List[str] = [".pyre_configuration", ".pyre_configuration.local"]
+SOURCE_SUFFIXES: Tuple[str, ...] = (".py", ".pyi")
+
+
+def _find_configurations(root: Path) -> List[Path]:
+    """The nearest Pyre configuration of each kind above `root`."""
+    configurations = []
+    for name in CONFIGURATION_FILES:
+        directory = root.resolve()
+        while True:
+            path = directory / name
+            if path.is_file():
+                configurations.append(path)
+                break
+            if directory.parent == directory:
+                break
+            directory = directory.parent
+    return configurations
+
+
+def _search_path_directories(configuration: Path) -> List[Path]:
+    """The search path and typeshed directories of a configuration, relative to
+    the directory of the configuration. Site packages are not included."""
+    try:
+        contents = json.loads(configuration.read_text())
+    except (OSError, ValueError):
+        return []
+    if not isinstance(contents, dict):
+        return []
+    elements = contents.get("search_path", [])
+    if not isinstance(elements, list):
+        elements = [elements]
+    elements.append(contents.get("typeshed"))
+
+    directories = []
+    for element in elements:
+        if isinstance(element, str):
+            # Search path elements can be written as `root$subdirectory`.
+            directory = element.replace("$", "/")
+        elif isinstance(element, dict) and isinstance(element.get("root"), str):
+            directory = os.path.join(element["root"], element.get("subdirectory", ""))
+        else:
+            continue
+        directories.append(configuration.parent / directory)
+    return directories
+
+
+def _source_paths(directory: Path) -> Iterator[str]:
+    for root, directories, files in os.walk(str(directory)):
+        # Skip the Pyre log directory and version control metadata.
+        directories[:] = sorted(
+            name for name in directories if not name.startswith(".")
+        )
+        for name in sorted(files):
+            if name.endswith(SOURCE_SUFFIXES):
+                yield os.path.join(root, name)
+
+
+def source_fingerprint(root: Path) -> str:
+    """Hashes the state the server of the project at `root` checks: the
+    contents of its nearest Pyre configurations, and the path, size and
+    modification time of every source and stub in the project and its search
+    path."""
+    digest = hashlib.sha1()
+    configurations = _find_configurations(root)
+    directories = [root.resolve()]
+    for configuration in configurations:
+        digest.update(f"{configuration}\0".encode())
+        digest.update(configuration.read_bytes())
+        if configuration.name == ".pyre_configuration":
+            directories[0] = configuration.parent
+        directories.extend(_search_path_directories(configuration))
+    for directory in directories:
+        for path in _source_paths(directory):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode())
+    return digest.hexdigest()
+
+
+class SnapshotCache:
+    """Shares the results of whole-program queries, such as the class hierarchy
+    or the call graph, between all consumers and across runs.
+
+    Results are kept in memory as the objects built from the responses of the
+    server, and stored on disk in a compact, compressed JSON encoding. They are
+    keyed by the project of the connection and by the `source_fingerprint` of
+    its sources, so results are recomputed once the sources change. The
+    fingerprint of a project is only computed the first time it is looked up:
+    a cache describes the sources as they are during one run, and a new cache
+    must be created to observe later changes. An optional `key`, such as the
+    revision of the repository, further separates snapshots. Snapshots are only
+    read from disk when they are first requested.
+
+    Objects are shared by all consumers, which must not modify them.
+    """
+
+    def __init__(self, directory: str, key: Optional[str] = None) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.key = key
+        self._objects: Dict[Tuple[str, str], object] = {}
+        self._fingerprints: Dict[Path, str] = {}
+        self._lock = threading.Lock()
+
+    def _fingerprint(self, pyre_connection: PyreConnection) -> str:
+        """The project of the connection, followed by the state of its
+        sources."""
+        root = pyre_connection.pyre_directory.resolve()
+        with self._lock:
+            fingerprint = self._fingerprints.get(root)
+        if fingerprint is not None:
+            return fingerprint
+
+        # Sources are walked without holding the lock, so lookups of projects
+        # that are already fingerprinted do not wait.
+        project = hashlib.sha1(str(root).encode()).hexdigest()
+        state = hashlib.sha1(source_fingerprint(root).encode())
+        if self.key is not None:
+            state.update(f"\0{self.key}".encode())
+        with self._lock:
+            return self._fingerprints.setdefault(
+                root, f"{project}-{state.hexdigest()}"
+            )
+
+    def _path(self, name: str, fingerprint: str) -> str:
+        return os.path.join(self.directory, f"{name}-{fingerprint}{SNAPSHOT_SUFFIX}")
+
+    def get(
+        self,
+        pyre_connection: PyreConnection,
+        name: str,
+        query: str,
+        build: Callable[[PyreQueryResult], T],
+        encode: Callable[[T], Any],
+        decode: Callable[[Any], T],
+    ) -> Optional[T]:
+        """Returns the object `build` creates from the result of `query` for the
+        current state of the sources. Objects are stored as the JSON value
+        returned by `encode`, and read back with `decode`. Failed queries are not
+        stored."""
+        fingerprint = self._fingerprint(pyre_connection)
+        with self._lock:
+            key = (name, fingerprint)
+            if key in self._objects:
+                # pyre-ignore[7]: Objects of `name` are built by `build`.
+                return self._objects[key]
+
+            path = self._path(name, fingerprint)
+            built = self._load(path, decode)
+            if built is None:
+                result = pyre_connection.query_server(query)
+                if result is None or "response" not in result:
+                    return None
+                built = build(result)
+                self._store(name, fingerprint, path, encode(built))
+
+            # Objects of previous states are never returned again.
+            for previous in [
+                previous for previous in self._objects if previous[0] == name
+            ]:
+                del self._objects[previous]
+            self._objects[key] = built
+            return built
+
+    def _load(self, path: str, decode: Callable[[Any], T]) -> Optional[T]:
+        try:
+            with gzip.open(path, "rt") as file:
+                snapshot = json.load(file)
+            if snapshot["version"] != SNAPSHOT_FORMAT_VERSION:
+                return None
+            return decode(snapshot["value"])
+        except FileNotFoundError:
+            return None
+        except (
+            OSError,
+            EOFError,
+            ValueError,
+            KeyError,
+            IndexError,
+            TypeError,
+        ) as error:
+            LOG.debug(f"Ignoring invalid snapshot `{path}`: {str(error)}")
+            return None
+
+    def _store(self, name: str, fingerprint: str, path: str, value: Any) -> None:
+        temporary_path = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=self.directory, delete=False
+            ) as file:
+                temporary_path = file.name
+                with gzip.open(file, "wt") as compressed:
+                    json.dump(
+                        {"version": SNAPSHOT_FORMAT_VERSION, "value": value},
+                        compressed,
+                        separators=(",", ":"),
+                    )
+            os.replace(temporary_path, path)
+        except (OSError, TypeError, ValueError) as error:
+            LOG.warning(f"Could not store snapshot `{path}`: {str(error)}")
+            if temporary_path is not None and os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            return
+
+        # Snapshots of previous states of the same project are never read
+        # again. The directory may be shared with other projects, whose
+        # snapshots are kept.
+        project = fingerprint.split("-")[0]
+        for entry in os.listdir(self.directory):
+            entry_path = os.path.join(self.directory, entry)
+            if (
+                entry.startswith(f"{name}-{project}-")
+                and entry.endswith(SNAPSHOT_SUFFIX)
+                and entry_path != path
+            ):
+                try:
+                    os.remove(entry_path)
+                except OSError:
+                    pass
@@ -90,6 +90,34 @@ class QueryAPITest(unittest.TestCase):
         with self.assertRaises(ValueError):
             query.defines(pyre_connection, ["a", "b"], batch_size=-1)
 
+    def test_defines_concurrently(self) -> None:
+        def query_server(request: str) -> query.PyreQueryResult:
+            modules = request[len("defines(") : -1].split(",")
+            return {
+                "response": [
+                    {
+                        "name": f"{module}.foo",
+                        "parameters": [],
+                        "return_annotation": "None",
+                    }
+                    for module in modules
+                ]
+            }
+
+        pyre_connection = MagicMock()
+        pyre_connection.query_server.side_effect = query_server
+        modules = [f"module{index}" for index in range(10)]
+        self.assertEqual(
+            [
+                define.name
+                for define in query.defines(
+                    pyre_connection, modules, batch_size=3, number_of_workers=4
+                )
+            ],
+            [f"{module}.foo" for module in modules],
+        )
+        self.assertEqual(pyre_connection.query_server.call_count, 4)
+
     def test_get_class_hierarchy(self) -> None:
         pyre_connection = MagicMock()
         pyre_connection.query_server.return_value = {
@@ -0,0 +1,204 @@
+# Copyright (c) 2016-present, Facebook, Inc.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import gzip
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+from .. import query, snapshot_cache
+from ..snapshot_cache import SnapshotCache, source_fingerprint
+
+
+def _build(result: Dict[str, Any]) -> List[str]:
+    return sorted(result["response"])
+
+
+def _encode(value: List[str]) -> List[str]:
+    return value
+
+
+def _decode(value: Any) -> List[str]:
+    if not isinstance(value, list):
+        raise ValueError("Not a list")
+    return value
+
+
+class SnapshotCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._root = tempfile.TemporaryDirectory()
+        self._cache_directory = tempfile.TemporaryDirectory()
+        self.root = Path(self._root.name)
+        self.cache_directory: str = self._cache_directory.name
+        self.pyre_connection = MagicMock()
+        self.pyre_connection.pyre_directory = self.root
+        self.write(".pyre_configuration", '{"source_directories": ["."]}')
+        self.write("a.py", "class A: pass\n")
+
+    def tearDown(self) -> None:
+        query.set_snapshot_cache(None)
+        self._root.cleanup()
+        self._cache_directory.cleanup()
+
+    def write(self, name: str, content: str) -> None:
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+    def get(self, cache: SnapshotCache, name: str = "name") -> Any:
+        return cache.get(
+            self.pyre_connection, name, "query()", _build, _encode, _decode
+        )
+
+    def test_source_fingerprint(self) -> None:
+        fingerprint = source_fingerprint(self.root)
+        # Pyre log directories and other files are ignored.
+        self.write(".pyre/b.py", "")
+        self.write("README.md", "")
+        self.assertEqual(source_fingerprint(self.root), fingerprint)
+        os.makedirs(str(self.root / "local"))
+        self.assertEqual(source_fingerprint(self.root / "local"), fingerprint)
+
+        self.write("local/.pyre_configuration.local", "{}")
+        self.assertNotEqual(source_fingerprint(self.root / "local"), fingerprint)
+
+        self.write("b.py", "")
+        self.assertNotEqual(source_fingerprint(self.root), fingerprint)
+        fingerprint = source_fingerprint(self.root)
+        self.write("a.py", "class A:\n    pass\n")
+        self.assertNotEqual(source_fingerprint(self.root), fingerprint)
+
+        # Sources of the search path are part of the state.
+        with tempfile.TemporaryDirectory() as search_path:
+            self.write(
+                ".pyre_configuration",
+                f'{{"search_path": [{{"root": "{search_path}"}}]}}',
+            )
+            fingerprint = source_fingerprint(self.root)
+            (Path(search_path) / "c.pyi").write_text("")
+            self.assertNotEqual(source_fingerprint(self.root), fingerprint)
+
+    def test_get(self) -> None:
+        self.pyre_connection.query_server.return_value = {"response": ["b", "a"]}
+        cache = SnapshotCache(self.cache_directory, key="revision")
+        value = self.get(cache)
+        self.assertEqual(value, ["a", "b"])
+        # Built objects are shared.
+        self.assertIs(self.get(cache), value)
+        self.pyre_connection.query_server.assert_called_once_with("query()")
+
+        # Snapshots are shared across caches, as compressed JSON.
+        cache = SnapshotCache(self.cache_directory, key="revision")
+        self.assertEqual(self.get(cache), ["a", "b"])
+        self.pyre_connection.query_server.assert_called_once_with("query()")
+        [snapshot] = os.listdir(self.cache_directory)
+        self.assertTrue(snapshot.endswith(".json.gz"))
+
+        # Sources are only fingerprinted once per cache.
+        self.write("b.py", "class B: pass\n")
+        self.pyre_connection.query_server.return_value = {"response": ["c"]}
+        with patch(f"{snapshot_cache.__name__}.source_fingerprint") as fingerprint:
+            self.assertEqual(self.get(cache), ["a", "b"])
+            fingerprint.assert_not_called()
+
+        # Snapshots are recomputed when the sources change, and replaced.
+        cache = SnapshotCache(self.cache_directory, key="revision")
+        self.assertEqual(self.get(cache), ["c"])
+        self.assertEqual(self.pyre_connection.query_server.call_count, 2)
+        self.assertEqual(len(os.listdir(self.cache_directory)), 1)
+
+        # And for other keys.
+        cache = SnapshotCache(self.cache_directory, key="other_revision")
+        self.assertEqual(self.get(cache), ["c"])
+        self.assertEqual(self.pyre_connection.query_server.call_count, 3)
+
+        # Failures are not stored.
+        self.pyre_connection.query_server.return_value = {"error": "error"}
+        self.assertIsNone(self.get(cache, "other"))
+        self.assertEqual(len(os.listdir(self.cache_directory)), 1)
+
+        # Invalid snapshots are recomputed.
+        [snapshot] = os.listdir(self.cache_directory)
+        for content in [b"{", gzip.compress(b"{"), gzip.compress(b'{"value": {}}')]:
+            with open(os.path.join(self.cache_directory, snapshot), "wb") as file:
+                file.write(content)
+            self.pyre_connection.query_server.return_value = {"response": ["a"]}
+            cache = SnapshotCache(self.cache_directory, key="other_revision")
+            self.assertEqual(self.get(cache), ["a"])
+        self.assertEqual(self.pyre_connection.query_server.call_count, 7)
+
+    def test_get_shared_directory(self) -> None:
+        other_root = tempfile.TemporaryDirectory()
+        self.addCleanup(other_root.cleanup)
+        (Path(other_root.name) / ".pyre_configuration").write_text("{}")
+        other_connection = MagicMock()
+        other_connection.pyre_directory = Path(other_root.name)
+        other_connection.query_server.return_value = {"response": ["b"]}
+        SnapshotCache(self.cache_directory).get(
+            other_connection, "name", "query()", _build, _encode, _decode
+        )
+
+        # Snapshots of other projects are kept when a new state is stored.
+        self.pyre_connection.query_server.return_value = {"response": ["a"]}
+        for key in ["revision", "other_revision"]:
+            self.get(SnapshotCache(self.cache_directory, key=key))
+        self.assertEqual(len(os.listdir(self.cache_directory)), 2)
+        self.assertEqual(
+            SnapshotCache(self.cache_directory).get(
+                other_connection, "name", "query()", _build, _encode, _decode
+            ),
+            ["b"],
+        )
+        other_connection.query_server.assert_called_once_with("query()")
+
+    def test_get_class_hierarchy(self) -> None:
+        query.set_snapshot_cache(SnapshotCache(self.cache_directory))
+        self.pyre_connection.query_server.return_value = {
+            "response": [{"Foo": ["object"]}, {"object": []}]
+        }
+        hierarchy = query.get_class_hierarchy(self.pyre_connection)
+        assert hierarchy is not None
+        self.assertEqual(hierarchy.subclasses("object"), ["Foo"])
+        # The hierarchy and its reverse are built once.
+        self.assertIs(query.get_class_hierarchy(self.pyre_connection), hierarchy)
+
+        query.set_snapshot_cache(SnapshotCache(self.cache_directory))
+        hierarchy = query.get_class_hierarchy(self.pyre_connection)
+        assert hierarchy is not None
+        self.pyre_connection.query_server.assert_called_once()
+        # Snapshots hold the reverse hierarchy.
+        self.assertEqual(hierarchy._reverse_hierarchy, {"object": ["Foo"], "Foo": []})
+        self.assertEqual(hierarchy.hierarchy, {"Foo": ["object"], "object": []})
+        self.assertEqual(hierarchy.superclasses("Foo"), ["object"])
+
+    def test_get_call_graph(self) -> None:
+        query.set_snapshot_cache(SnapshotCache(self.cache_directory))
+        location = {
+            "path": "a.py",
+            "start": {"line": 6, "column": 4},
+            "stop": {"line": 6, "column": 7},
+        }
+        self.pyre_connection.query_server.return_value = {
+            "response": {
+                "a.foo": [],
+                "a.bar": [
+                    {"locations": [location], "kind": "function", "target": "a.foo"},
+                    {
+                        "locations": [location, location],
+                        "kind": "method",
+                        "direct_target": "a.C.method",
+                    },
+                ],
+            }
+        }
+        call_graph = query.get_call_graph(self.pyre_connection)
+        self.assertIs(query.get_call_graph(self.pyre_connection), call_graph)
+
+        query.set_snapshot_cache(SnapshotCache(self.cache_directory))
+        self.assertEqual(query.get_call_graph(self.pyre_connection), call_graph)
+        self.pyre_connection.query_server.assert_called_once()
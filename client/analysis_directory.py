@@ -39,17 +39,15 @@ from .socket_connection import SocketConnection, SocketException
 LOG: logging.Logger = logging.getLogger(__name__)
 
 
-# If there are a lot of tracked files that are updated at the same time, it is
-# probably a rebase. So, rebuild just to be safe.
-REBUILD_THRESHOLD_FOR_UPDATED_PATHS: int = 50
+# New paths are passed to `buck query` on the command line, so we query buck in
+# batches to bound the length of the command when a lot of files are added at
+# once, e.g. during a rebase.
+BUCK_QUERY_BATCH_SIZE: int = 500
 
-
-# If there are a lot of new or deleted files, it is probably a rebase.
-# This is a separate threshold from the number of updated tracked files because
-# we don't know for sure if these new files should actually be tracked. So, we
-# might want a higher threshold in order to avoid rebuilding for spurious new
-# files.
-REBUILD_THRESHOLD_FOR_NEW_OR_DELETED_PATHS: int = 50
+# Changes to build definitions, build configurations or the sources of generated
+# code cannot be handled by updating links and require a rebuild.
+BUILD_FILE_NAMES: Set[str] = {"TARGETS", "BUCK", ".buckconfig", ".buckconfig.local"}
+BUILD_FILE_EXTENSIONS: Set[str] = {".bzl", ".thrift", ".proto"}
 
 
 DONT_CARE_PROGRESS_VALUE = 1
@@ -320,15 +318,13 @@ class SharedAnalysisDirectory(AnalysisDirectory):
     def should_rebuild(
         updated_tracked_paths: List[str], new_paths: List[str], deleted_paths: List[str]
     ) -> bool:
-        if any(
-            Path(path).suffix == ".thrift" or Path(path).name == "TARGETS"
+        """Only changes to build files or to the sources of generated code
+        require a rebuild. Any number of updated, new or deleted sources is
+        handled by updating the affected links."""
+        return any(
+            Path(path).suffix in BUILD_FILE_EXTENSIONS
+            or Path(path).name in BUILD_FILE_NAMES
             for path in chain(updated_tracked_paths, new_paths, deleted_paths)
-        ):
-            return True
-        return (
-            len(updated_tracked_paths) >= REBUILD_THRESHOLD_FOR_UPDATED_PATHS
-            or len(new_paths) + len(deleted_paths)
-            >= REBUILD_THRESHOLD_FOR_NEW_OR_DELETED_PATHS
         )
 
     def _notify_about_rebuild(self, is_start_message: bool = True) -> None:
@@ -341,8 +337,8 @@ class SharedAnalysisDirectory(AnalysisDirectory):
         )
         if is_start_message:
             message = (
-                "Pyre is rebuilding because a significant number of files were "
-                "changed. Your results may be outdated until this is finished."
+                "Pyre is rebuilding because build files were changed. "
+                "Your results may be outdated until this is finished."
             )
             short_message = "Rebuilding..."
             message_type = json_rpc.LanguageServerMessageType.WARNING.value
@@ -469,13 +465,18 @@ class SharedAnalysisDirectory(AnalysisDirectory):
         )
         if absolute_link_map is None:
             relative_link_map = {}
-            try:
-                relative_link_map = buck.query_buck_relative_paths(
-                    new_paths, self._targets
-                )
-            except buck.BuckException as error:
-                LOG.error("Exception occurred when querying buck: %s", error)
-                LOG.error("No new paths will be added to the analysis directory.")
+            for start in range(0, len(new_paths), BUCK_QUERY_BATCH_SIZE):
+                batch = new_paths[start : start + BUCK_QUERY_BATCH_SIZE]
+                try:
+                    relative_link_map.update(
+                        buck.query_buck_relative_paths(batch, self._targets)
+                    )
+                except buck.BuckException as error:
+                    LOG.error("Exception occurred when querying buck: %s", error)
+                    LOG.error(
+                        "%d new paths will not be added to the analysis directory.",
+                        len(batch),
+                    )
 
             absolute_link_map = {
                 path: os.path.join(self.get_root(), relative_link)
@@ -495,40 +496,42 @@ class SharedAnalysisDirectory(AnalysisDirectory):
     ) -> Tuple[List[str], List[str]]:
         # Translate the paths here because we need the old symbolic links
         # mapping to get their old scratch path.
-        deleted_scratch_paths = [self._symbolic_links[path] for path in deleted_paths]
+        linked_deleted_paths = []
+        deleted_scratch_paths = []
         for path in deleted_paths:
             link = self._symbolic_links.pop(path, None)
-            if link:
-                try:
-                    _delete_symbolic_link(link)
-                except OSError:
-                    LOG.warning("Failed to delete link at `%s`.", link)
-        return deleted_paths, deleted_scratch_paths
+            if not link:
+                # The path was never linked into the analysis directory, so the
+                # server has no scratch path to delete.
+                LOG.debug("Ignoring deleted path without a link: `%s`.", path)
+                continue
+            linked_deleted_paths.append(path)
+            deleted_scratch_paths.append(link)
+            try:
+                _delete_symbolic_link(link)
+            except OSError:
+                LOG.warning("Failed to delete link at `%s`.", link)
+        return linked_deleted_paths, deleted_scratch_paths
 
     def _get_new_deleted_and_tracked_paths(
         self, paths: List[str]
     ) -> Tuple[List[str], List[str], List[str]]:
-        deleted_paths = [
-            path
-            for path in paths
-            if not os.path.isfile(path)
-            and (path in self._symbolic_links or self._is_tracked(path))
-        ]
-        new_paths = [
-            path
-            for path in paths
-            if path not in self._symbolic_links
-            and not self._is_in_search_path(path)
-            and os.path.isfile(path)
-            and is_parent(self._project_root, path)
-        ]
-        tracked_paths = [
-            path
-            for path in paths
-            if path not in new_paths
-            and path not in deleted_paths
-            and (path in self._symbolic_links or self._is_tracked(path))
-        ]
+        new_paths = []
+        deleted_paths = []
+        tracked_paths = []
+        for path in paths:
+            is_tracked = path in self._symbolic_links or self._is_tracked(path)
+            if not os.path.isfile(path):
+                if is_tracked:
+                    deleted_paths.append(path)
+            elif (
+                path not in self._symbolic_links
+                and not self._is_in_search_path(path)
+                and is_parent(self._project_root, path)
+            ):
+                new_paths.append(path)
+            elif is_tracked:
+                tracked_paths.append(path)
         return new_paths, deleted_paths, tracked_paths
 
     def _process_updated_files(self, paths: List[str]) -> UpdatedPaths:
@@ -73,6 +73,8 @@ class ProfileOutput(enum.Enum):
     TRACE_EVENT: str = "trace_event"
     COLD_START_PHASES: str = "cold_start_phases"
     INCREMENTAL_UPDATES: str = "incremental_updates"
+    INCREMENTAL_UPDATE_STATISTICS: str = "incremental_update_statistics"
+    MEMORY_GROWTH: str = "memory_growth"
     INDIVIDUAL_TABLE_SIZES: str = "individual_table_sizes"
     TOTAL_SHARED_MEMORY_SIZE_OVER_TIME: str = "total_shared_memory_size_over_time"
     TOTAL_SHARED_MEMORY_SIZE_OVER_TIME_GRAPH: str = "total_shared_memory_size_over_time_graph"  # noqa B950
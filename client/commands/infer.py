@@ -8,15 +8,17 @@
 import argparse
 import functools
 import logging
+import multiprocessing
 import os
 import re
-import shutil
+import shlex
 import subprocess
 import sys
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
 from pathlib import Path
-from typing import IO, Any, List, Optional, Sequence, Set, Union
+from typing import Any, List, Optional, Sequence, Set, Tuple, Union
 
 import libcst
 from libcst._version import LIBCST_VERSION
@@ -34,6 +36,10 @@ from .reporting import Reporting
 
 LOG: Logger = logging.getLogger(__name__)
 
+# Maximum number of files passed to a single formatter invocation with
+# `--format-changed-files`.
+FORMATTER_BATCH_SIZE = 100
+
 
 def dequalify(annotation):
     return annotation.replace("typing.", "")
@@ -225,8 +231,8 @@ def join_stubs(stubs):
 
 class StubFile:
     def __init__(self, errors, full_only: bool = False) -> None:
-        stubs = [Stub(error) for error in errors if Stub(error).stub]
-        stubs = join_stubs(stubs)
+        stubs = [Stub(error) for error in errors]
+        stubs = join_stubs([stub for stub in stubs if stub.stub])
         if full_only:
             stubs = [stub for stub in stubs if stub.is_complete()]
         self._stubs = stubs
@@ -290,41 +296,68 @@ class StubFile:
     def path(self, directory):
         return directory / Path("{}i".format(self._path))
 
-    def output_to_file(self, path) -> None:
+    def output_to_file(self, path) -> bool:
+        """Writes the stub to `path` unless it already contains it. Returns
+        whether the file was written."""
         contents = self.to_string()
+        try:
+            if path.read_text() == contents:
+                return False
+        except OSError:
+            pass
         path.parent.mkdir(parents=True, exist_ok=True)
         path.write_text(contents)
+        return True
 
 
 def generate_stub_files(full_only: bool, errors: Sequence[Error]) -> List[StubFile]:
-    errors = [
-        error
-        for error in errors
-        if error.inference and not (error.is_external_to_global_root())
-    ]
-    files = defaultdict(list)
-    errors.sort(key=lambda error: error.line)
-
+    errors_by_path = defaultdict(list)
     for error in errors:
-        files[error.path].append(error)
+        if error.inference and not (error.is_external_to_global_root()):
+            errors_by_path[error.path].append(error)
 
     stubs = []
-    for _path, errors in files.items():
-        stub = StubFile(errors, full_only=full_only)
+    for path_errors in errors_by_path.values():
+        path_errors.sort(key=lambda error: error.line)
+        stub = StubFile(path_errors, full_only=full_only)
         if not stub.is_empty():
             stubs.append(stub)
     return stubs
 
 
+def _remove_stale_files(type_directory: Path, paths: Set[Path]) -> int:
+    removed = 0
+    for directory, _, files in os.walk(str(type_directory), topdown=False):
+        for file in files:
+            path = Path(directory, file)
+            if path not in paths:
+                path.unlink()
+                removed += 1
+        if directory != str(type_directory) and not os.listdir(directory):
+            os.rmdir(directory)
+    return removed
+
+
 def write_stubs_to_disk(stubs, type_directory) -> None:
-    if type_directory.exists():
-        LOG.log(log.SUCCESS, "Deleting {}".format(type_directory))
-        shutil.rmtree(type_directory)
+    """Writes stubs to `type_directory`, only rewriting the stubs that differ
+    from the ones on disk so unchanged stubs keep their modification time.
+    Files that do not belong to any of the stubs are removed."""
     type_directory.mkdir(parents=True, exist_ok=True)
 
     LOG.log(log.SUCCESS, "Outputting inferred stubs to {}".format(type_directory))
+    paths = set()
+    written = 0
     for stub in stubs:
-        stub.output_to_file(stub.path(type_directory))
+        path = stub.path(type_directory)
+        paths.add(path)
+        if stub.output_to_file(path):
+            written += 1
+    removed = _remove_stale_files(type_directory, paths)
+    LOG.info(
+        "Wrote {} of {} stubs, removed {} stale files".format(
+            written, len(stubs), removed
+        )
+    )
 
 
 def filter_paths(
@@ -345,31 +378,111 @@ def filter_paths(
     ]
 
 
-def _parse(file: IO[str]) -> libcst.Module:
-    contents = file.read()
-    return libcst.parse_module(contents)
+def _apply_stub_annotations(stub: str, source: str) -> str:
+    context = CodemodContext()
+    ApplyTypeAnnotationsVisitor.store_stub_in_context(
+        context, libcst.parse_module(stub)
+    )
+    modified_tree = ApplyTypeAnnotationsVisitor(context).transform_module(
+        libcst.parse_module(source)
+    )
+    return modified_tree.code
 
 
 def apply_stub_annotations(stub_path: str, file_path: str) -> str:
     with open(stub_path) as stub_file, open(file_path) as source_file:
-        stub = _parse(stub_file)
-        source = _parse(source_file)
-        context = CodemodContext()
-        ApplyTypeAnnotationsVisitor.store_stub_in_context(context, stub)
-        modified_tree = ApplyTypeAnnotationsVisitor(context).transform_module(source)
-        return modified_tree.code
+        return _apply_stub_annotations(stub_file.read(), source_file.read())
 
 
-def annotate_path(stub_path: str, file_path: str, debug_infer: bool) -> None:
+def _annotate_file(paths: Tuple[str, str]) -> Tuple[str, Optional[bool], Optional[str]]:
+    """Annotates the file with its stub. Returns the file, whether it changed
+    or None if it could not be annotated, and the error in that case."""
+    stub_path, file_path = paths
     try:
-        annotated_content = apply_stub_annotations(stub_path, file_path)
+        with open(stub_path) as stub_file, open(file_path) as source_file:
+            source = source_file.read()
+            annotated_content = _apply_stub_annotations(stub_file.read(), source)
+        if annotated_content == source:
+            return file_path, False, None
         with open(file_path, "w") as source_file:
             source_file.write(annotated_content)
-        LOG.info("Annotated {}".format(file_path))
+        return file_path, True, None
     except Exception as error:
+        return file_path, None, str(error)
+
+
+def _log_annotation(
+    file_path: str, changed: Optional[bool], error: Optional[str], debug_infer: bool
+) -> None:
+    if changed is None:
         LOG.warning("Failed to annotate {}".format(file_path))
         if debug_infer:
             LOG.warning("\tError: {}".format(error))
+    elif changed:
+        LOG.info("Annotated {}".format(file_path))
+    else:
+        LOG.info("No new annotations for {}".format(file_path))
+
+
+def annotate_path(stub_path: str, file_path: str, debug_infer: bool) -> bool:
+    file_path, changed, error = _annotate_file((stub_path, file_path))
+    _log_annotation(file_path, changed, error, debug_infer)
+    return bool(changed)
+
+
+def _annotate_files(
+    paths: Sequence[Tuple[str, str]], debug_infer: bool, number_of_workers: int
+) -> List[str]:
+    """Annotates each file with its stub and returns the files that changed.
+    Files are annotated by a pool of `number_of_workers` processes and their
+    outcome is logged as soon as they are done."""
+    if number_of_workers <= 1 or len(paths) <= 1:
+        return [
+            file_path
+            for stub_path, file_path in paths
+            if annotate_path(stub_path, file_path, debug_infer)
+        ]
+
+    changed_paths = []
+    # The client can have threads running, which must not be forked.
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(min(number_of_workers, len(paths))) as pool:
+        for file_path, changed, error in pool.imap_unordered(_annotate_file, paths):
+            _log_annotation(file_path, changed, error, debug_infer)
+            if changed:
+                changed_paths.append(file_path)
+    return changed_paths
+
+
+def _format_files(
+    formatter: Optional[str],
+    paths: Sequence[str],
+    number_of_workers: int,
+    format_changed_files: bool = False,
+) -> None:
+    """Runs the formatter once, without arguments. With `format_changed_files`,
+    the formatter is instead given the changed files as arguments, in batches
+    that are formatted concurrently."""
+    if not formatter:
+        return
+    if not format_changed_files:
+        subprocess.call(formatter, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+    if not paths:
+        return
+    command = shlex.split(formatter)
+    batches = [
+        paths[index : index + FORMATTER_BATCH_SIZE]
+        for index in range(0, len(paths), FORMATTER_BATCH_SIZE)
+    ]
+
+    def format_batch(batch: Sequence[str]) -> int:
+        return subprocess.call(
+            [*command, *batch], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    with ThreadPoolExecutor(max(1, min(number_of_workers, len(batches)))) as executor:
+        list(executor.map(format_batch, batches))
 
 
 def annotate_paths(
@@ -379,19 +492,22 @@ def annotate_paths(
     type_directory,
     in_place: Sequence[str],
     debug_infer: bool,
+    number_of_workers: int = 1,
+    format_changed_files: bool = False,
 ) -> None:
     if in_place != []:
         stubs = filter_paths(stubs, type_directory, in_place)
 
+    paths = []
     for stub in stubs:
         stub_path = stub.path(type_directory)
         if not stub._path.resolve().exists():
             file_path = (root / stub._path).resolve()
         else:
             file_path = stub._path.resolve()
-        annotate_path(stub_path, file_path, debug_infer)
-    if formatter:
-        subprocess.call(formatter, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        paths.append((str(stub_path), str(file_path)))
+    changed_paths = _annotate_files(paths, debug_infer, number_of_workers)
+    _format_files(formatter, changed_paths, number_of_workers, format_changed_files)
 
 
 def annotate_from_existing_stubs(
@@ -400,8 +516,11 @@ def annotate_from_existing_stubs(
     type_directory: Path,
     in_place: Sequence[str],
     debug_infer: bool,
+    number_of_workers: int = 1,
+    format_changed_files: bool = False,
 ) -> None:
     in_place_paths = [Path(path) for path in in_place]
+    paths = []
     for stub_path in type_directory.rglob("*.pyi"):
         relative_source_path_for_stub = stub_path.relative_to(
             type_directory
@@ -412,11 +531,9 @@ def annotate_from_existing_stubs(
             in (relative_source_path_for_stub, *relative_source_path_for_stub.parents)
             for path in in_place_paths
         ):
-            annotate_path(
-                str(stub_path), str(root / relative_source_path_for_stub), debug_infer
-            )
-    if formatter:
-        subprocess.call(formatter, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            paths.append((str(stub_path), str(root / relative_source_path_for_stub)))
+    changed_paths = _annotate_files(paths, debug_infer, number_of_workers)
+    _format_files(formatter, changed_paths, number_of_workers, format_changed_files)
 
 
 def file_exists(path):
@@ -442,6 +559,7 @@ class Infer(Reporting):
         errors_from_stdin: bool,
         annotate_from_existing_stubs: bool,
         debug_infer: bool,
+        format_changed_files: bool = False,
     ) -> None:
         super(Infer, self).__init__(
             command_arguments, original_directory, configuration, analysis_directory
@@ -453,6 +571,7 @@ class Infer(Reporting):
         self._errors_from_stdin = errors_from_stdin
         self._annotate_from_existing_stubs = annotate_from_existing_stubs
         self._debug_infer = debug_infer
+        self._format_changed_files = format_changed_files
         self._ignore_infer: List[str] = self._configuration.ignore_infer
 
         self._show_error_traces = True
@@ -477,6 +596,7 @@ class Infer(Reporting):
             errors_from_stdin=arguments.errors_from_stdin,
             annotate_from_existing_stubs=arguments.annotate_from_existing_stubs,
             debug_infer=arguments.debug_infer,
+            format_changed_files=arguments.format_changed_files,
         )
 
     @classmethod
@@ -530,6 +650,13 @@ class Infer(Reporting):
             action="store_true",
             help="Print error message when file fails to annotate.",
         )
+        infer.add_argument(
+            "--format-changed-files",
+            action="store_true",
+            help="Pass the annotated files to the configured formatter, in "
+            + "concurrent batches, instead of running it once without arguments."
+            + " The formatter must accept file paths as arguments.",
+        )
 
     def run(self) -> Command:
         self._analysis_directory.prepare()
@@ -547,6 +674,8 @@ class Infer(Reporting):
                 type_directory,
                 self._in_place,
                 self._debug_infer,
+                self._number_of_workers,
+                self._format_changed_files,
             )
             return self
         if self._errors_from_stdin:
@@ -569,6 +698,8 @@ class Infer(Reporting):
                     type_directory,
                     self._in_place,
                     self._debug_infer,
+                    self._number_of_workers,
+                    self._format_changed_files,
                 )
 
         return self
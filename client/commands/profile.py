@@ -6,23 +6,41 @@
 import argparse
 import json
 import logging
+import math
 import os
+import random
 import subprocess
+import sys
+import time
 from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from typing_extensions import Final
 
 from ..analysis_directory import AnalysisDirectory
 from ..configuration import Configuration
-from .command import Command, CommandArguments, ProfileOutput
+from .command import Command, CommandArguments, ProfileOutput, State
 
 
 LOG: logging.Logger = logging.getLogger(__name__)
 
 PHASE_NAME: str = "phase_name"
+# Seconds between two reads of the profiling log while waiting for updates.
+WAIT_INTERVAL: float = 0.05
+# Seconds to wait for incremental updates before giving up.
+WAIT_TIMEOUT: float = 600.0
 TRIGGERED_DEPENDENCIES: str = "number_of_triggered_dependencies"
 
 
@@ -93,22 +111,27 @@ def parse_event(input_string: str) -> Event:
         raise ValueError("Unrecognized event type: {}".format(input))
 
 
-def parse_events(input_string: str) -> List[Event]:
-    output: List[Event] = []
-    for index, line in enumerate(input_string.splitlines()):
+def iterate_events(lines: Iterable[str], first_line: int = 1) -> Iterator[Event]:
+    """Parses events one line at a time, so that profiling logs can be read
+    without holding them in memory."""
+    for line_number, line in enumerate(lines, start=first_line):
         try:
             line = line.strip()
             if len(line) == 0:
                 continue
-            output.append(parse_event(line))
+            event = parse_event(line)
         except Exception:
             raise RuntimeError(
-                "Malformed log entry detected on line {}".format(index + 1)
+                "Malformed log entry detected on line {}".format(line_number)
             )
-    return output
+        yield event
+
+
+def parse_events(input_string: str) -> List[Event]:
+    return list(iterate_events(input_string.splitlines()))
 
 
-def to_traceevents(events: Sequence[Event]) -> List[Dict[str, Any]]:
+def iterate_traceevents(events: Iterable[Event]) -> Iterator[Dict[str, Any]]:
     def to_traceevent(event: Event) -> Optional[Dict[str, Any]]:
         if isinstance(event, DurationEvent):
             duration_us = event.duration
@@ -138,75 +161,159 @@ def to_traceevents(events: Sequence[Event]) -> List[Dict[str, Any]]:
         else:
             return None
 
-    return [
-        trace_event
-        for trace_event in map(to_traceevent, events)
-        if trace_event is not None
-    ]
-
-
-def split_pre_and_post_initialization(
-    events: Sequence[Event],
-) -> Tuple[Sequence[Event], Sequence[Event]]:
-    initialization_point = next(
-        (
-            index + 1
-            for index, event in enumerate(events)
-            if event.metadata.name == "initialization"
-        ),
-        len(events),
-    )
-    return events[:initialization_point], events[initialization_point:]
+    for trace_event in map(to_traceevent, events):
+        if trace_event is not None:
+            yield trace_event
+
 
+def to_traceevents(events: Iterable[Event]) -> List[Dict[str, Any]]:
+    return list(iterate_traceevents(events))
 
-def to_cold_start_phases(events: Sequence[Event]) -> Dict[str, int]:
+
+def to_cold_start_phases(events: Iterable[Event]) -> Dict[str, int]:
     result: Dict[str, int] = {}
-    pre_initialization_events, _ = split_pre_and_post_initialization(events)
-    for event in pre_initialization_events:
+    # Events after the initialization are never read.
+    for event in events:
         if not isinstance(event, DurationEvent):
             continue
         event.add_phase_duration_to_result(result)
         if event.metadata.name == "initialization":
             result["total"] = event.duration
+            break
 
     return result
 
 
-def to_incremental_updates(events: Sequence[Event]) -> List[Dict[str, int]]:
-    results: List[Dict[str, int]] = []
-    current: Dict[str, int] = {}
-    _, post_initialization_events = split_pre_and_post_initialization(events)
-    for event in post_initialization_events:
+class IncrementalUpdateCollector:
+    """Groups events after the initialization into incremental updates, one
+    event at a time."""
+
+    def __init__(self) -> None:
+        self._initialized = False
+        self._current: Dict[str, int] = {}
+
+    def add(self, event: Event) -> Optional[Dict[str, int]]:
+        """Returns the update completed by `event`, if any."""
+        if not self._initialized:
+            self._initialized = event.metadata.name == "initialization"
+            return None
         if not isinstance(event, DurationEvent):
-            continue
+            return None
 
-        event.add_phase_duration_to_result(current)
+        event.add_phase_duration_to_result(self._current)
 
         if event.metadata.name == "incremental check":
-            current["total"] = event.duration
-            results.append(current)
-            current = {}
-    return results
+            self._current["total"] = event.duration
+            update = self._current
+            self._current = {}
+            return update
+        return None
+
+
+def iterate_incremental_updates(events: Iterable[Event]) -> Iterator[Dict[str, int]]:
+    collector = IncrementalUpdateCollector()
+    for event in events:
+        update = collector.add(event)
+        if update is not None:
+            yield update
+
+
+def to_incremental_updates(events: Iterable[Event]) -> List[Dict[str, int]]:
+    return list(iterate_incremental_updates(events))
+
+
+class PhaseStatistics:
+    """Aggregates the values of a phase over incremental updates in bounded
+    memory. Percentiles are exact as long as at most `SAMPLE_SIZE` values were
+    added, and estimated from a uniform sample of the values otherwise."""
+
+    SAMPLE_SIZE: int = 10000
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.sum: int = 0
+        self.maximum: int = 0
+        self._sample: List[int] = []
+        self._random = random.Random(0)
+
+    def add(self, value: int) -> None:
+        self.count += 1
+        self.sum += value
+        self.maximum = max(self.maximum, value)
+        if len(self._sample) < self.SAMPLE_SIZE:
+            self._sample.append(value)
+        else:
+            # Reservoir sampling: every value is kept with the same probability.
+            index = self._random.randrange(self.count)
+            if index < self.SAMPLE_SIZE:
+                self._sample[index] = value
+
+    def percentile(self, percentile: float) -> int:
+        if not self._sample:
+            return 0
+        sample = sorted(self._sample)
+        rank = math.ceil(percentile / 100 * len(sample))
+        return sample[max(rank - 1, 0)]
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count > 0 else 0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.maximum,
+        }
+
+
+class IncrementalUpdateStatistics:
+    def __init__(self) -> None:
+        self._phases: Dict[str, PhaseStatistics] = defaultdict(PhaseStatistics)
+
+    def add(self, update: Dict[str, int]) -> None:
+        for phase, value in update.items():
+            self._phases[phase].add(value)
+
+    def to_json(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            phase: statistics.to_json()
+            for phase, statistics in sorted(self._phases.items())
+        }
+
+
+def to_incremental_update_statistics(
+    events: Iterable[Event],
+) -> Dict[str, Dict[str, Any]]:
+    statistics = IncrementalUpdateStatistics()
+    for update in iterate_incremental_updates(events):
+        statistics.add(update)
+    return statistics.to_json()
 
 
 class TableStatistics:
-    # category -> aggregation -> table name -> value
-    # pyre-ignore: T62493941
-    _data: Dict[str, Dict[str, Dict[str, str]]] = defaultdict(lambda: defaultdict(dict))
     _shared_heap_category: Final = "bytes serialized into shared heap"
 
+    def __init__(self) -> None:
+        # category -> aggregation -> table name -> value
+        # pyre-ignore: T62493941
+        self._data: Dict[str, Dict[str, Dict[str, str]]] = defaultdict(
+            lambda: defaultdict(dict)
+        )
+
     @staticmethod
-    def sort_by_value(items: List[Tuple[str, str]]) -> None:
-        def parse(number: str) -> float:
-            if number[-1] == "G":
-                return float(number[:-1]) * (10 ** 9)
-            if number[-1] == "M":
-                return float(number[:-1]) * (10 ** 6)
-            if number[-1] == "K":
-                return float(number[:-1]) * (10 ** 3)
-            return float(number)
+    def parse(number: str) -> float:
+        if number[-1] == "G":
+            return float(number[:-1]) * (10 ** 9)
+        if number[-1] == "M":
+            return float(number[:-1]) * (10 ** 6)
+        if number[-1] == "K":
+            return float(number[:-1]) * (10 ** 3)
+        return float(number)
 
-        items.sort(key=lambda x: parse(x[1]), reverse=True)
+    @staticmethod
+    def sort_by_value(items: List[Tuple[str, str]]) -> None:
+        items.sort(key=lambda x: TableStatistics.parse(x[1]), reverse=True)
 
     def add(self, line: str) -> None:
         divider = "stats -- "
@@ -242,9 +349,14 @@ class TableStatistics:
         TableStatistics.sort_by_value(counts)
         return counts
 
+    def get_sizes(self) -> Dict[str, float]:
+        totals = self._data.get(self._shared_heap_category, {}).get("total", {})
+        return {table: TableStatistics.parse(total) for table, total in totals.items()}
+
 
 class StatisticsOverTime:
-    _data: List[Tuple[str, int]] = []
+    def __init__(self) -> None:
+        self._data: List[Tuple[str, int]] = []
 
     def add(self, line: str) -> None:
         dividers = [
@@ -273,10 +385,282 @@ class StatisticsOverTime:
         except FileNotFoundError:
             LOG.error("gnuplot is not installed")
 
+    def latest(self) -> Optional[Tuple[str, int]]:
+        return self._data[-1] if self._data else None
+
     def to_json(self) -> str:
         return json.dumps(self._data)
 
 
+@dataclass(frozen=True)
+class MemorySnapshot:
+    time: str
+    shared_memory_size: int
+    # table name -> bytes serialized into the shared heap
+    table_sizes: Dict[str, float]
+
+
+class MemorySnapshots:
+    """Splits the server output into a snapshot per `shared memory size` sample,
+    which the server reports after its initialization when running with
+    `--debug`, and after every incremental update. The `post-typecheck` samples
+    reported while type checking are ignored, so there is at most one sample per
+    update. Each snapshot holds the latest table sizes reported up to its
+    sample."""
+
+    _divider: Final = " MEMORY Shared memory size (size: "
+
+    def __init__(self) -> None:
+        self.snapshots: List[MemorySnapshot] = []
+        self._table_statistics = TableStatistics()
+
+    def add(self, line: str) -> None:
+        self._table_statistics.add(line)
+        if MemorySnapshots._divider in line:
+            time, size_component = line.split(MemorySnapshots._divider)
+            self.snapshots.append(
+                MemorySnapshot(
+                    time=time,
+                    shared_memory_size=int(size_component[:-2]) * (10 ** 6),
+                    table_sizes=self._table_statistics.get_sizes(),
+                )
+            )
+
+
+def _grows_monotonically(sizes: Sequence[float]) -> bool:
+    return (
+        len(sizes) > 2
+        and sizes[-1] > sizes[0]
+        and all(previous <= size for previous, size in zip(sizes, sizes[1:]))
+    )
+
+
+def to_memory_growth(
+    updates: Sequence[Dict[str, int]], snapshots: Sequence[MemorySnapshot]
+) -> Dict[str, Any]:
+    """Attributes the growth of shared memory to incremental updates and
+    tables. The last snapshots are taken after each update, and matched with
+    them in order. The growth of the first update is only known if there is a
+    snapshot of the initialization before them.
+
+    The server only reports table sizes after its initialization, with
+    `--debug`, so the growth of tables can only be attributed to updates if
+    the server reports table statistics after every update as well."""
+    offset = len(snapshots) - len(updates)
+    if offset < 0:
+        LOG.warning(
+            "Found {} memory samples for {} incremental updates, only matching "
+            "the last updates.".format(len(snapshots), len(updates))
+        )
+
+    update_growth = []
+    for index, update in enumerate(updates):
+        if index + offset < 0:
+            continue
+        snapshot = snapshots[index + offset]
+        shared_memory_growth = None
+        table_growth = None
+        if index + offset > 0:
+            previous = snapshots[index + offset - 1]
+            shared_memory_growth = (
+                snapshot.shared_memory_size - previous.shared_memory_size
+            )
+            table_growth = {
+                table: size - previous.table_sizes.get(table, 0)
+                for table, size in snapshot.table_sizes.items()
+                if size != previous.table_sizes.get(table, 0)
+            }
+        update_growth.append(
+            {
+                "update": index,
+                "time": snapshot.time,
+                "total": update.get("total"),
+                "shared_memory_size": snapshot.shared_memory_size,
+                "shared_memory_growth": shared_memory_growth,
+                "table_growth": table_growth,
+            }
+        )
+
+    table_growth = []
+    tables = {table for snapshot in snapshots for table in snapshot.table_sizes}
+    for table in tables:
+        sizes = [
+            snapshot.table_sizes[table]
+            for snapshot in snapshots
+            if table in snapshot.table_sizes
+        ]
+        table_growth.append(
+            {
+                "table": table,
+                "growth": sizes[-1] - sizes[0],
+                "grows_monotonically": _grows_monotonically(sizes),
+            }
+        )
+    table_growth.sort(key=lambda growth: (-growth["growth"], growth["table"]))
+    return {"updates": update_growth, "tables": table_growth}
+
+
+class FileTail:
+    """Reads the lines appended to a file since the previous read, starting
+    from its beginning. Incomplete last lines are held back until they are
+    terminated. A file that shrank is assumed to be new and is read again,
+    which is counted in `restarts`."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.offset: int = 0
+        self.lines_read: int = 0
+        self.restarts: int = 0
+        self._partial_line: bytes = b""
+
+    def read_lines(self) -> List[str]:
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return []
+        if size < self.offset:
+            self.offset = 0
+            self.lines_read = 0
+            self.restarts += 1
+            self._partial_line = b""
+        if size == self.offset:
+            return []
+
+        with open(self.path, "rb") as file:
+            file.seek(self.offset)
+            data = file.read(size - self.offset)
+        self.offset += len(data)
+        *lines, self._partial_line = (self._partial_line + data).split(b"\n")
+        self.lines_read += len(lines)
+        return [line.decode(errors="replace") + "\n" for line in lines]
+
+
+class LiveProfile:
+    """Aggregates the profiling log and the server output while they grow.
+    Every refresh only reads what was appended since the previous one. When a
+    file is replaced, the statistics it contributed to start over."""
+
+    CLEAR_SCREEN: str = "\033[2J\033[H"
+
+    def __init__(self, profiling_log: Path, server_stdout: Path) -> None:
+        self._profiling_log = FileTail(profiling_log)
+        self._server_stdout = FileTail(server_stdout)
+        self._updates = IncrementalUpdateCollector()
+        self.update_statistics = IncrementalUpdateStatistics()
+        self.table_statistics = TableStatistics()
+        self.memory_statistics = StatisticsOverTime()
+
+    def refresh(self) -> None:
+        restarts = self._profiling_log.restarts
+        lines = self._profiling_log.read_lines()
+        if self._profiling_log.restarts != restarts:
+            self._updates = IncrementalUpdateCollector()
+            self.update_statistics = IncrementalUpdateStatistics()
+        first_line = self._profiling_log.lines_read - len(lines) + 1
+        for event in iterate_events(lines, first_line):
+            update = self._updates.add(event)
+            if update is not None:
+                self.update_statistics.add(update)
+
+        restarts = self._server_stdout.restarts
+        lines = self._server_stdout.read_lines()
+        if self._server_stdout.restarts != restarts:
+            self.table_statistics = TableStatistics()
+            self.memory_statistics = StatisticsOverTime()
+        for line in lines:
+            self.table_statistics.add(line)
+            self.memory_statistics.add(line)
+
+    def render(self) -> str:
+        lines = ["Incremental updates"]
+        lines.append(
+            "  {:<40} {:>8} {:>10} {:>10} {:>10} {:>10}".format(
+                "phase", "count", "p50", "p95", "p99", "max"
+            )
+        )
+        for phase, statistics in self.update_statistics.to_json().items():
+            lines.append(
+                "  {:<40} {:>8} {:>10} {:>10} {:>10} {:>10}".format(
+                    phase[:40],
+                    statistics["count"],
+                    statistics["p50"],
+                    statistics["p95"],
+                    statistics["p99"],
+                    statistics["max"],
+                )
+            )
+
+        lines.append("")
+        latest = self.memory_statistics.latest()
+        if latest is None:
+            lines.append("Shared memory size: unknown")
+        else:
+            sample_time, size = latest
+            lines.append(
+                "Shared memory size: {} MB at {}".format(size // (10 ** 6), sample_time)
+            )
+
+        if not self.table_statistics.is_empty():
+            lines.append("")
+            lines.append("Largest tables")
+            for table, total in self.table_statistics.get_totals()[:10]:
+                lines.append("  {:<40} {:>10}".format(table[:40], total))
+        return "\n".join(lines) + "\n"
+
+
+def wait_for_incremental_updates(
+    profiling_log: Path,
+    count: int,
+    is_server_running: Callable[[], bool],
+    timeout: float = WAIT_TIMEOUT,
+) -> List[Dict[str, int]]:
+    """Blocks until the profiling log holds at least `count` incremental
+    updates, and returns all of them. The log is only read once, as it grows.
+    Raises if the server stops or `timeout` seconds pass before that."""
+    deadline = time.monotonic() + timeout
+    tail = FileTail(profiling_log)
+    collector = IncrementalUpdateCollector()
+    updates: List[Dict[str, int]] = []
+    while True:
+        # Check the server first, so updates logged before it stopped are read.
+        server_running = is_server_running()
+        restarts = tail.restarts
+        lines = tail.read_lines()
+        if tail.restarts != restarts:
+            collector = IncrementalUpdateCollector()
+            updates = []
+        for event in iterate_events(lines, tail.lines_read - len(lines) + 1):
+            update = collector.add(event)
+            if update is not None:
+                updates.append(update)
+        if len(updates) >= count:
+            return updates
+        if not server_running:
+            raise RuntimeError(
+                "The server stopped after {} of {} incremental updates.".format(
+                    len(updates), count
+                )
+            )
+        if time.monotonic() > deadline:
+            raise RuntimeError(
+                "Timed out after {} of {} incremental updates.".format(
+                    len(updates), count
+                )
+            )
+        time.sleep(WAIT_INTERVAL)
+
+
+def _print_json_list(items: Iterable[Any]) -> None:
+    """Prints the same output as `print(json.dumps(list(items)))` without
+    building the list."""
+    sys.stdout.write("[")
+    for index, item in enumerate(items):
+        if index > 0:
+            sys.stdout.write(", ")
+        sys.stdout.write(json.dumps(item))
+    sys.stdout.write("]\n")
+
+
 class Profile(Command):
     NAME = "profile"
     HIDDEN = True
@@ -289,11 +673,19 @@ class Profile(Command):
         configuration: Optional[Configuration] = None,
         analysis_directory: Optional[AnalysisDirectory] = None,
         profile_output: ProfileOutput,
+        follow: bool = False,
+        refresh_interval: float = 2.0,
+        wait_for_incremental_updates: Optional[int] = None,
     ) -> None:
         super(Profile, self).__init__(
             command_arguments, original_directory, configuration, analysis_directory
         )
         self._profile_output: ProfileOutput = profile_output
+        self._follow: bool = follow
+        self._refresh_interval: float = refresh_interval
+        self._wait_for_incremental_updates: Optional[int] = (
+            wait_for_incremental_updates
+        )
 
     @staticmethod
     def from_arguments(
@@ -308,6 +700,9 @@ class Profile(Command):
             configuration=configuration,
             analysis_directory=analysis_directory,
             profile_output=arguments.profile_output,
+            follow=arguments.follow,
+            refresh_interval=arguments.refresh_interval,
+            wait_for_incremental_updates=arguments.wait_for_incremental_updates,
         )
 
     @classmethod
@@ -321,6 +716,25 @@ class Profile(Command):
             help="Specify what to output.",
             default=ProfileOutput.COLD_START_PHASES,
         )
+        profile.add_argument(
+            "--follow",
+            action="store_true",
+            help="Continuously show statistics of the running server as its logs "
+            "grow, instead of printing the selected output once.",
+        )
+        profile.add_argument(
+            "--refresh-interval",
+            type=float,
+            default=2.0,
+            help="Seconds between two refreshes in `--follow` mode.",
+        )
+        profile.add_argument(
+            "--wait-for-incremental-updates",
+            type=int,
+            metavar="COUNT",
+            help="With `--profile-output=incremental_updates`, wait until the "
+            "server finished at least COUNT incremental updates before printing.",
+        )
 
     def get_stdout(self) -> Path:
         server_stdout_path = os.path.join(self._log_directory, "server/server.stdout")
@@ -335,17 +749,51 @@ class Profile(Command):
         server_stdout = self.get_stdout()
         extracted = StatisticsOverTime()
         with open(server_stdout) as server_stdout_file:
-            for line in server_stdout_file.readlines():
+            for line in server_stdout_file:
                 extracted.add(line)
         return extracted
 
+    def follow(self) -> None:
+        live_profile = LiveProfile(
+            Path(self.profiling_log_path()),
+            Path(self._log_directory, "server/server.stdout"),
+        )
+        try:
+            while True:
+                live_profile.refresh()
+                sys.stdout.write(LiveProfile.CLEAR_SCREEN + live_profile.render())
+                sys.stdout.flush()
+                time.sleep(self._refresh_interval)
+        except KeyboardInterrupt:
+            pass
+
+    def collect_memory_snapshots(self) -> List[MemorySnapshot]:
+        server_stdout = self.get_stdout()
+        extracted = MemorySnapshots()
+        with open(server_stdout) as server_stdout_file:
+            for line in server_stdout_file:
+                extracted.add(line)
+        return extracted.snapshots
+
     def _run(self) -> None:
+        if self._follow:
+            self.follow()
+            return
+
         output = self._profile_output
-        if output == ProfileOutput.INDIVIDUAL_TABLE_SIZES:
+        update_count = self._wait_for_incremental_updates
+        if output == ProfileOutput.INCREMENTAL_UPDATES and update_count is not None:
+            updates = wait_for_incremental_updates(
+                Path(self.profiling_log_path()),
+                update_count,
+                is_server_running=lambda: self._state() == State.RUNNING,
+            )
+            print(json.dumps(updates, indent=2))
+        elif output == ProfileOutput.INDIVIDUAL_TABLE_SIZES:
             server_stdout = self.get_stdout()
             extracted = TableStatistics()
             with open(server_stdout) as server_stdout_file:
-                for line in server_stdout_file.readlines():
+                for line in server_stdout_file:
                     extracted.add(line)
             if extracted.is_empty():
                 raise RuntimeError(
@@ -382,15 +830,30 @@ class Profile(Command):
                             profiling_output
                         )
                     )
-                events = parse_events(profiling_output.read_text())
-                if output == ProfileOutput.TRACE_EVENT:
-                    print(json.dumps(to_traceevents(events)))
-                elif output == ProfileOutput.COLD_START_PHASES:
-                    print(json.dumps(to_cold_start_phases(events), indent=2))
-                elif output == ProfileOutput.INCREMENTAL_UPDATES:
-                    print(json.dumps(to_incremental_updates(events), indent=2))
-                else:
-                    raise RuntimeError("Unrecognized output format: {}".format(output))
+                with open(profiling_output) as profiling_output_file:
+                    events = iterate_events(profiling_output_file)
+                    if output == ProfileOutput.TRACE_EVENT:
+                        _print_json_list(iterate_traceevents(events))
+                    elif output == ProfileOutput.COLD_START_PHASES:
+                        print(json.dumps(to_cold_start_phases(events), indent=2))
+                    elif output == ProfileOutput.INCREMENTAL_UPDATES:
+                        print(json.dumps(to_incremental_updates(events), indent=2))
+                    elif output == ProfileOutput.MEMORY_GROWTH:
+                        growth = to_memory_growth(
+                            to_incremental_updates(events),
+                            self.collect_memory_snapshots(),
+                        )
+                        print(json.dumps(growth, indent=2))
+                    elif output == ProfileOutput.INCREMENTAL_UPDATE_STATISTICS:
+                        print(
+                            json.dumps(
+                                to_incremental_update_statistics(events), indent=2
+                            )
+                        )
+                    else:
+                        raise RuntimeError(
+                            "Unrecognized output format: {}".format(output)
+                        )
 
             except Exception as e:
                 LOG.error("Failed to inspect profiling log: {}".format(e))
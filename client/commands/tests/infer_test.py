@@ -6,6 +6,9 @@
 # pyre-unsafe
 
 import json
+import os
+import subprocess
+import tempfile
 import textwrap
 import unittest
 from pathlib import Path
@@ -22,6 +25,8 @@ from ...commands.infer import (
     StubFile,
     _relativize_access,
     dequalify,
+    generate_stub_files,
+    write_stubs_to_disk,
 )
 from ...error import Error
 from ..command import CommandArguments, __name__ as client_name
@@ -881,3 +886,110 @@ class InferTest(unittest.TestCase):
             "/root/local-root/foo/bar/baz.py",
             False,
         )
+
+    @patch("subprocess.call")
+    def test_annotate_from_existing_stubs_in_parallel(
+        self, subprocess_call: MagicMock
+    ) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            type_directory = Path(root) / "types"
+            sources = {
+                "a.py": ("def foo(x): ...\n", "def foo(x: int) -> str: ...\n"),
+                "b.py": ("def bar(): ...\n", "def bar() -> None: ...\n"),
+                "c.py": ("def baz() -> int: ...\n", "def baz() -> int: ...\n"),
+                "d.py": ("def broken(\n", "def broken() -> int: ...\n"),
+            }
+            for name, (source, stub) in sources.items():
+                Path(root, name).write_text(source)
+                stub_path = type_directory / (name + "i")
+                stub_path.parent.mkdir(parents=True, exist_ok=True)
+                stub_path.write_text(stub)
+
+            infer.annotate_from_existing_stubs(
+                Path(root),
+                "formatter --quiet",
+                type_directory=type_directory,
+                in_place=[],
+                debug_infer=False,
+                number_of_workers=2,
+                format_changed_files=True,
+            )
+            self.assertEqual(
+                Path(root, "a.py").read_text(), "def foo(x: int) -> str: ...\n"
+            )
+            self.assertEqual(Path(root, "b.py").read_text(), "def bar() -> None: ...\n")
+            self.assertEqual(Path(root, "d.py").read_text(), "def broken(\n")
+
+            # Only files that changed are formatted.
+            subprocess_call.assert_called_once()
+            command = subprocess_call.call_args[0][0]
+            self.assertEqual(command[:2], ["formatter", "--quiet"])
+            self.assertEqual(
+                sorted(command[2:]),
+                [os.path.join(root, "a.py"), os.path.join(root, "b.py")],
+            )
+
+    @patch("subprocess.call")
+    def test_annotate_from_existing_stubs_formatter_without_arguments(
+        self, subprocess_call: MagicMock
+    ) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            type_directory = Path(root) / "types"
+            type_directory.mkdir()
+            for name in ["a.py", "b.py"]:
+                Path(root, name).write_text("def foo(): ...\n")
+                (type_directory / (name + "i")).write_text("def foo() -> None: ...\n")
+
+            infer.annotate_from_existing_stubs(
+                Path(root),
+                "formatter --all",
+                type_directory=type_directory,
+                in_place=[],
+                debug_infer=False,
+                number_of_workers=2,
+            )
+            # The formatter runs once, as configured, without file arguments.
+            subprocess_call.assert_called_once_with(
+                "formatter --all",
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+
+    def test_write_stubs_to_disk(self) -> None:
+        def field(path: str, name: str, annotation: str) -> Error:
+            error_json = build_json(
+                {"annotation": annotation, "attribute_name": name, "parent": None}
+            )
+            error_json["path"] = path
+            return Error(error_json)
+
+        with tempfile.TemporaryDirectory() as root:
+            type_directory = Path(root) / "types"
+            stale_path = type_directory / "old" / "stale.pyi"
+            stale_path.parent.mkdir(parents=True)
+            stale_path.write_text("x: int = ...\n")
+
+            write_stubs_to_disk(
+                generate_stub_files(
+                    False, [field("a.py", "a.x", "int"), field("b/c.py", "c.y", "str")]
+                ),
+                type_directory,
+            )
+            a_path = type_directory / "a.pyi"
+            c_path = type_directory / "b" / "c.pyi"
+            self.assertEqual(a_path.read_text(), "x: int = ...\n")
+            self.assertEqual(c_path.read_text(), "y: str = ...\n")
+            self.assertFalse((type_directory / "old").exists())
+
+            # Only stubs whose contents changed are written again.
+            os.utime(str(a_path), (0, 0))
+            os.utime(str(c_path), (0, 0))
+            write_stubs_to_disk(
+                generate_stub_files(
+                    False, [field("a.py", "a.x", "int"), field("b/c.py", "c.y", "int")]
+                ),
+                type_directory,
+            )
+            self.assertEqual(a_path.stat().st_mtime, 0)
+            self.assertNotEqual(c_path.stat().st_mtime, 0)
+            self.assertEqual(c_path.read_text(), "y: int = ...\n")
@@ -4,18 +4,36 @@
 # LICENSE file in the root directory of this source tree.
 
 
+import io
+import json
+import tempfile
+import threading
 import unittest
+from pathlib import Path
+from unittest.mock import patch
 
+from ...analysis_directory import AnalysisDirectory
+from ..command import ProfileOutput, State
 from ..profile import (
     CounterEvent,
     DurationEvent,
     EventMetadata,
+    FileTail,
+    LiveProfile,
+    MemorySnapshots,
+    PhaseStatistics,
+    Profile,
     StatisticsOverTime,
     TableStatistics,
     parse_event,
+    parse_events,
     to_cold_start_phases,
+    to_incremental_update_statistics,
     to_incremental_updates,
+    to_memory_growth,
+    wait_for_incremental_updates,
 )
+from .command_test import mock_arguments, mock_configuration
 
 
 class ProfileTest(unittest.TestCase):
@@ -402,3 +420,290 @@ class ProfileTest(unittest.TestCase):
                 ("2020-02-19 10:36:09", 2106000000),
             ],
         )
+
+    def test_incremental_update_statistics(self) -> None:
+        def event(name: str, duration: int, phase: str = "") -> str:
+            tags = [["phase_name", phase]] if phase else []
+            return json.dumps(
+                {
+                    "name": name,
+                    "pid": 400,
+                    "timestamp": 42,
+                    "event_type": ["Duration", duration],
+                    "tags": tags,
+                }
+            )
+
+        lines = [event("SomeUpdate", 100, "phase1"), event("initialization", 100)]
+        for duration in range(1, 101):
+            lines.append(event("SomeUpdate", duration * 2, "phase1"))
+            lines.append(event("incremental check", duration))
+        events = parse_events("\n".join(lines))
+
+        statistics = to_incremental_update_statistics(iter(events))
+        self.assertEqual(sorted(statistics), ["phase1", "total"])
+        self.assertEqual(
+            statistics["total"],
+            {
+                "count": 100,
+                "sum": 5050,
+                "mean": 50.5,
+                "p50": 50,
+                "p95": 95,
+                "p99": 99,
+                "max": 100,
+            },
+        )
+        self.assertEqual(statistics["phase1"]["p95"], 190)
+        self.assertEqual(
+            to_cold_start_phases(iter(events)), {"phase1": 100, "total": 100}
+        )
+
+    def test_phase_statistics_sample(self) -> None:
+        statistics = PhaseStatistics()
+        for value in range(3 * PhaseStatistics.SAMPLE_SIZE):
+            statistics.add(value)
+        self.assertEqual(statistics.count, 3 * PhaseStatistics.SAMPLE_SIZE)
+        self.assertEqual(statistics.maximum, 3 * PhaseStatistics.SAMPLE_SIZE - 1)
+        self.assertEqual(len(statistics._sample), PhaseStatistics.SAMPLE_SIZE)
+        self.assertAlmostEqual(
+            statistics.percentile(50) / statistics.count, 0.5, delta=0.05
+        )
+
+    def test_file_tail(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "log")
+            tail = FileTail(path)
+            self.assertEqual(tail.read_lines(), [])
+
+            path.write_text("a\nb")
+            self.assertEqual(tail.read_lines(), ["a\n"])
+            with open(path, "a") as file:
+                file.write("c\nd\n")
+            self.assertEqual(tail.read_lines(), ["bc\n", "d\n"])
+            self.assertEqual(tail.read_lines(), [])
+            self.assertEqual(tail.lines_read, 3)
+
+            # A file that shrank is read from the start.
+            path.write_text("e\n")
+            self.assertEqual(tail.read_lines(), ["e\n"])
+            self.assertEqual(tail.restarts, 1)
+
+    def test_live_profile(self) -> None:
+        def event(name: str, duration: int) -> str:
+            return (
+                json.dumps(
+                    {
+                        "name": name,
+                        "pid": 400,
+                        "timestamp": 42,
+                        "event_type": ["Duration", duration],
+                    }
+                )
+                + "\n"
+            )
+
+        with tempfile.TemporaryDirectory() as directory:
+            profiling_log = Path(directory, "profiling.log")
+            server_stdout = Path(directory, "server.stdout")
+            live_profile = LiveProfile(profiling_log, server_stdout)
+            live_profile.refresh()
+            self.assertIn("Shared memory size: unknown", live_profile.render())
+
+            profiling_log.write_text(
+                event("initialization", 10) + event("incremental check", 1)
+            )
+            server_stdout.write_text(
+                "2020-02-19 10:35:57 MEMORY Shared memory size (size: 2105)\n"
+            )
+            live_profile.refresh()
+            with open(profiling_log, "a") as file:
+                file.write(event("incremental check", 3))
+            with open(server_stdout, "a") as file:
+                file.write(
+                    "2020-02-19 10:36:09 MEMORY Shared memory size (size: 2106)\n"
+                )
+            live_profile.refresh()
+
+            self.assertEqual(
+                live_profile.update_statistics.to_json()["total"]["count"], 2
+            )
+            self.assertEqual(
+                live_profile.update_statistics.to_json()["total"]["max"], 3
+            )
+            self.assertEqual(
+                live_profile.memory_statistics._data,
+                [
+                    ("2020-02-19 10:35:57", 2105000000),
+                    ("2020-02-19 10:36:09", 2106000000),
+                ],
+            )
+            self.assertIn(
+                "Shared memory size: 2106 MB at 2020-02-19 10:36:09",
+                live_profile.render(),
+            )
+
+            # Replaced files are aggregated from scratch.
+            profiling_log.write_text(event("initialization", 10))
+            server_stdout.write_text("")
+            live_profile.refresh()
+            with open(profiling_log, "a") as file:
+                file.write(event("incremental check", 5))
+            live_profile.refresh()
+            self.assertEqual(
+                live_profile.update_statistics.to_json()["total"]["count"], 1
+            )
+            self.assertEqual(
+                live_profile.update_statistics.to_json()["total"]["max"], 5
+            )
+            self.assertIn("Shared memory size: unknown", live_profile.render())
+
+    def test_memory_growth(self) -> None:
+        def table_line(table: str, total: str) -> str:
+            return (
+                f"{table} (bytes serialized into shared heap) stats -- samples: 1, "
+                f"total: {total}, avg: 1, stddev: 0, max: 1, min: 1)\n"
+            )
+
+        def memory_line(time: str, size: int) -> str:
+            return f"{time} MEMORY Shared memory size (size: {size})\n"
+
+        def post_typecheck_line(time: str, size: int) -> str:
+            return f"{time} MEMORY Shared memory size post-typecheck (size: {size})\n"
+
+        lines = [
+            post_typecheck_line("09:59:59", 99),
+            table_line("AST", "1M"),
+            table_line("Class", "2M"),
+            memory_line("10:00:00", 100),
+            "10:00:01 INFO Parsing 9 updated modules...\n",
+            post_typecheck_line("10:00:01", 101),
+            table_line("AST", "1.5M"),
+            memory_line("10:00:02", 101),
+            post_typecheck_line("10:00:03", 102),
+            table_line("AST", "2M"),
+            table_line("Class", "1M"),
+            memory_line("10:00:03", 103),
+        ]
+        snapshots = MemorySnapshots()
+        for line in lines:
+            snapshots.add(line)
+        self.assertEqual(len(snapshots.snapshots), 3)
+
+        growth = to_memory_growth([{"total": 5}, {"total": 7}], snapshots.snapshots)
+        self.assertEqual(
+            growth["updates"],
+            [
+                {
+                    "update": 0,
+                    "time": "10:00:02",
+                    "total": 5,
+                    "shared_memory_size": 101000000,
+                    "shared_memory_growth": 1000000,
+                    "table_growth": {"AST": 500000.0},
+                },
+                {
+                    "update": 1,
+                    "time": "10:00:03",
+                    "total": 7,
+                    "shared_memory_size": 103000000,
+                    "shared_memory_growth": 2000000,
+                    "table_growth": {"AST": 500000.0, "Class": -1000000.0},
+                },
+            ],
+        )
+        self.assertEqual(
+            growth["tables"],
+            [
+                {"table": "AST", "growth": 1000000.0, "grows_monotonically": True},
+                {"table": "Class", "growth": -1000000.0, "grows_monotonically": False},
+            ],
+        )
+
+        # Without a sample of the initialization, the growth of the first update
+        # is unknown.
+        growth = to_memory_growth([{"total": 5}, {"total": 7}], snapshots.snapshots[1:])
+        self.assertEqual(
+            [
+                (update["update"], update["time"], update["shared_memory_growth"])
+                for update in growth["updates"]
+            ],
+            [(0, "10:00:02", None), (1, "10:00:03", 2000000)],
+        )
+
+    def test_wait_for_incremental_updates(self) -> None:
+        def event(name: str, duration: int) -> str:
+            return (
+                json.dumps(
+                    {
+                        "name": name,
+                        "pid": 400,
+                        "timestamp": 42,
+                        "event_type": ["Duration", duration],
+                    }
+                )
+                + "\n"
+            )
+
+        with tempfile.TemporaryDirectory() as directory:
+            profiling_log = Path(directory, "profiling.log")
+            profiling_log.write_text(
+                event("initialization", 10) + event("incremental check", 1)
+            )
+            self.assertEqual(
+                wait_for_incremental_updates(profiling_log, 1, lambda: True),
+                [{"total": 1}],
+            )
+
+            def finish_update() -> None:
+                with open(profiling_log, "a") as file:
+                    file.write(event("incremental check", 2))
+
+            timer = threading.Timer(0.1, finish_update)
+            timer.start()
+            self.assertEqual(
+                wait_for_incremental_updates(profiling_log, 2, lambda: True),
+                [{"total": 1}, {"total": 2}],
+            )
+            timer.join()
+
+            # Updates the server did not get to are not waited for.
+            with self.assertRaisesRegex(RuntimeError, "stopped after 2 of 3"):
+                wait_for_incremental_updates(profiling_log, 3, lambda: False)
+            with self.assertRaisesRegex(RuntimeError, "Timed out after 2 of 3"):
+                wait_for_incremental_updates(
+                    profiling_log, 3, lambda: True, timeout=0.1
+                )
+
+    def test_run_waiting_for_incremental_updates(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            profile = Profile(
+                mock_arguments(dot_pyre_directory=Path(directory, ".pyre")),
+                directory,
+                configuration=mock_configuration(),
+                analysis_directory=AnalysisDirectory(directory),
+                profile_output=ProfileOutput.INCREMENTAL_UPDATES,
+                wait_for_incremental_updates=1,
+            )
+            Path(profile.profiling_log_path()).write_text(
+                "\n".join(
+                    json.dumps(
+                        {
+                            "name": name,
+                            "pid": 400,
+                            "timestamp": 42,
+                            "event_type": ["Duration", duration],
+                        }
+                    )
+                    for name, duration in [
+                        ("initialization", 10),
+                        ("incremental check", 3),
+                    ]
+                )
+                + "\n"
+            )
+            with patch.object(Profile, "_state", return_value=State.RUNNING), patch(
+                "sys.stdout", new_callable=io.StringIO
+            ) as stdout:
+                profile._run()
+            self.assertEqual(json.loads(stdout.getvalue()), [{"total": 3}])
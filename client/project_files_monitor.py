@@ -10,7 +10,11 @@ from pathlib import Path
 from typing import Any, Dict, List, Sequence, Set
 
 from . import json_rpc, watchman
-from .analysis_directory import AnalysisDirectory
+from .analysis_directory import (
+    BUILD_FILE_EXTENSIONS,
+    BUILD_FILE_NAMES,
+    AnalysisDirectory,
+)
 from .buck import BuckException
 from .configuration import Configuration
 from .filesystem import find_root
@@ -56,7 +60,9 @@ class ProjectFilesMonitor(Subscriber):
         self._analysis_directory = analysis_directory
 
         self._extensions: Set[str] = set(
-            ["py", "pyi", "thrift"] + configuration.extensions
+            ["py", "pyi"]
+            + [extension.lstrip(".") for extension in BUILD_FILE_EXTENSIONS]
+            + configuration.extensions
         )
 
         self._watchman_path: str = self._find_watchman_path(project_root)
@@ -80,7 +86,7 @@ class ProjectFilesMonitor(Subscriber):
                 [
                     "anyof",
                     *[["suffix", extension] for extension in self._extensions],
-                    ["match", "TARGETS"],
+                    *[["match", name] for name in sorted(BUILD_FILE_NAMES)],
                 ],
             ],
             "fields": ["name"],
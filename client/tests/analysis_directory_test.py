@@ -14,8 +14,7 @@ from unittest.mock import MagicMock, call, patch
 
 from .. import analysis_directory, buck, filesystem
 from ..analysis_directory import (
-    REBUILD_THRESHOLD_FOR_NEW_OR_DELETED_PATHS,
-    REBUILD_THRESHOLD_FOR_UPDATED_PATHS,
+    BUCK_QUERY_BATCH_SIZE,
     AnalysisDirectory,
     SharedAnalysisDirectory,
     UpdatedPaths,
@@ -284,30 +283,13 @@ class SharedAnalysisDirectoryTest(unittest.TestCase):
         )
 
     def test_should_rebuild(self) -> None:
-        self.assertTrue(
-            SharedAnalysisDirectory.should_rebuild(
-                updated_tracked_paths=[
-                    f"a{index}.py"
-                    for index in range(REBUILD_THRESHOLD_FOR_UPDATED_PATHS)
-                ],
-                new_paths=[],
-                deleted_paths=[],
-            )
-        )
-        self.assertTrue(
+        # Large sets of changed sources, e.g. from a rebase, are handled
+        # incrementally.
+        self.assertFalse(
             SharedAnalysisDirectory.should_rebuild(
-                updated_tracked_paths=[],
-                new_paths=[
-                    f"a{index}.py"
-                    for index in range(REBUILD_THRESHOLD_FOR_NEW_OR_DELETED_PATHS // 2)
-                ],
-                deleted_paths=[
-                    f"b{index}.py"
-                    for index in range(
-                        REBUILD_THRESHOLD_FOR_NEW_OR_DELETED_PATHS
-                        - REBUILD_THRESHOLD_FOR_NEW_OR_DELETED_PATHS // 2
-                    )
-                ],
+                updated_tracked_paths=[f"a{index}.py" for index in range(1000)],
+                new_paths=[f"b{index}.py" for index in range(1000)],
+                deleted_paths=[f"c{index}.py" for index in range(1000)],
             )
         )
         self.assertFalse(
@@ -346,6 +328,27 @@ class SharedAnalysisDirectoryTest(unittest.TestCase):
                 deleted_paths=[],
             )
         )
+        for build_file in [
+            "b/c/BUCK",
+            "b/c/defs.bzl",
+            "b/c/foo.proto",
+            ".buckconfig",
+            "b/.buckconfig.local",
+        ]:
+            self.assertTrue(
+                SharedAnalysisDirectory.should_rebuild(
+                    updated_tracked_paths=[f"a{index}.py" for index in range(1000)],
+                    new_paths=[build_file],
+                    deleted_paths=[],
+                )
+            )
+        self.assertFalse(
+            SharedAnalysisDirectory.should_rebuild(
+                updated_tracked_paths=["b/c/BUCK.py", "b/c/bzl.py"],
+                new_paths=[],
+                deleted_paths=[],
+            )
+        )
 
     @patch.object(analysis_directory, "add_symbolic_link")
     @patch.object(SharedAnalysisDirectory, "rebuild")
@@ -604,6 +607,115 @@ class SharedAnalysisDirectoryTest(unittest.TestCase):
             ("project/deleted.py", "scratch/bar/deleted.py"),
         )
 
+    @patch.object(analysis_directory, "_delete_symbolic_link")
+    @patch.object(SharedAnalysisDirectory, "_is_tracked", return_value=True)
+    @patch.object(SharedAnalysisDirectory, "get_root", return_value="scratch")
+    @patch.object(SharedAnalysisDirectory, "rebuild")
+    @patch.object(SharedAnalysisDirectory, "should_rebuild", return_value=False)
+    @patch.object(os, "getcwd", return_value="project")
+    @patch.object(os.path, "isfile", return_value=False)
+    # pyre-fixme[56]: Argument `os.path` to decorator factory
+    #  `unittest.mock.patch.object` could not be resolved in a global scope.
+    @patch.object(os.path, "abspath", side_effect=lambda path: path)
+    def test_process_updated_files_deleted_file_without_link(
+        self,
+        abspath: MagicMock,
+        isfile: MagicMock,
+        getcwd: MagicMock,
+        should_rebuild: MagicMock,
+        rebuild: MagicMock,
+        get_root: MagicMock,
+        is_tracked: MagicMock,
+        delete_symbolic_link: MagicMock,
+    ) -> None:
+        shared_analysis_directory = SharedAnalysisDirectory(
+            project_root="project",
+            source_directories=[],
+            targets=["target1"],
+            search_path=["baz$hello"],
+        )
+        shared_analysis_directory._symbolic_links = {}
+        actual = shared_analysis_directory._process_updated_files(
+            ["project/deleted.py"]
+        )
+        # Project paths are not reported as scratch paths.
+        self.assertEqual(actual, UpdatedPaths(updated_paths=[], deleted_paths=[]))
+        delete_symbolic_link.assert_not_called()
+        self.assertIsNone(shared_analysis_directory._last_singly_deleted_path_and_link)
+
+    @patch.object(analysis_directory, "_delete_symbolic_link")
+    @patch.object(analysis_directory, "add_symbolic_link")
+    @patch.object(SharedAnalysisDirectory, "get_root", return_value="scratch")
+    @patch.object(buck, "query_buck_relative_paths")
+    @patch.object(SharedAnalysisDirectory, "rebuild")
+    @patch.object(os, "getcwd", return_value="project")
+    @patch.object(os.path, "isfile")
+    # pyre-fixme[56]: Argument `os.path` to decorator factory
+    #  `unittest.mock.patch.object` could not be resolved in a global scope.
+    @patch.object(os.path, "abspath", side_effect=lambda path: path)
+    def test_process_updated_files__many_paths(
+        self,
+        abspath: MagicMock,
+        isfile: MagicMock,
+        getcwd: MagicMock,
+        rebuild: MagicMock,
+        query_buck_relative_paths: MagicMock,
+        get_root: MagicMock,
+        add_symbolic_link: MagicMock,
+        delete_symbolic_link: MagicMock,
+    ) -> None:
+        shared_analysis_directory = SharedAnalysisDirectory(
+            project_root="project",
+            source_directories=[],
+            targets=["target1"],
+            search_path=["baz$hello"],
+        )
+        number_of_paths = BUCK_QUERY_BATCH_SIZE + 1
+        updated_paths = [f"project/updated{index}.py" for index in range(100)]
+        new_paths = [f"project/new{index}.py" for index in range(number_of_paths)]
+        deleted_paths = [
+            f"project/deleted{index}.py" for index in range(number_of_paths)
+        ]
+        shared_analysis_directory._symbolic_links = {
+            path: path.replace("project/", "scratch/")
+            for path in updated_paths + deleted_paths
+        }
+        isfile.side_effect = lambda path: "deleted" not in path
+        query_buck_relative_paths.side_effect = lambda paths, targets: {
+            path: path.replace("project/", "") for path in paths
+        }
+
+        actual = shared_analysis_directory._process_updated_files(
+            updated_paths + new_paths + deleted_paths
+        )
+
+        rebuild.assert_not_called()
+        # New paths are queried in batches.
+        self.assertEqual(query_buck_relative_paths.call_count, 2)
+        self.assertEqual(add_symbolic_link.call_count, number_of_paths)
+        self.assertEqual(delete_symbolic_link.call_count, number_of_paths)
+        deleted_scratch_paths = [
+            path.replace("project/", "scratch/") for path in deleted_paths
+        ]
+        self.assertEqual(
+            actual,
+            UpdatedPaths(
+                updated_paths=[
+                    path.replace("project/", "scratch/")
+                    for path in updated_paths + new_paths
+                ]
+                + deleted_scratch_paths,
+                deleted_paths=deleted_scratch_paths,
+            ),
+        )
+        self.assertEqual(
+            shared_analysis_directory._symbolic_links,
+            {
+                path: path.replace("project/", "scratch/")
+                for path in updated_paths + new_paths
+            },
+        )
+
     @patch.object(SharedAnalysisDirectory, "should_rebuild", return_value=True)
     @patch.object(SharedAnalysisDirectory, "_get_new_deleted_and_tracked_paths")
     @patch.object(SharedAnalysisDirectory, "_process_rebuilt_files")
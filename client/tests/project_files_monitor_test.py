@@ -54,7 +54,12 @@ class MonitorTest(unittest.TestCase):
                 ["suffix", "py"],
                 ["suffix", "pyi"],
                 ["suffix", "thrift"],
+                ["suffix", "bzl"],
+                ["suffix", "proto"],
                 ["match", "TARGETS"],
+                ["match", "BUCK"],
+                ["match", ".buckconfig"],
+                ["match", ".buckconfig.local"],
             ],
         )
 
@@ -77,7 +82,12 @@ class MonitorTest(unittest.TestCase):
                 ["suffix", "pyi"],
                 ["suffix", "thrift"],
                 ["suffix", "whl"],
+                ["suffix", "bzl"],
+                ["suffix", "proto"],
                 ["match", "TARGETS"],
+                ["match", "BUCK"],
+                ["match", ".buckconfig"],
+                ["match", ".buckconfig.local"],
             ],
         )
 
@@ -2,8 +2,9 @@ import json
 import logging
 import traceback
 from abc import ABC, ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from .environment import Environment
 from .runner import (
@@ -166,10 +167,54 @@ def run_single_test(environment: Environment, input: Specification) -> RunnerRes
     return result
 
 
+def _run_batch(
+    run_single: Callable[[Environment, Specification], RunnerResult],
+    environment: Environment,
+    inputs: Iterable[Specification],
+    max_concurrency: int,
+    time_budget: Optional[float],
+) -> List[RunnerResult]:
+    """Runs up to `max_concurrency` specifications at a time. Specifications
+    activated in the same shared repository run one after the other, as their
+    sandboxes would check out different states of the same files. Every
+    specification gets `time_budget` seconds, if given."""
+    inputs = list(inputs)
+    results: List[Optional[RunnerResult]] = [None] * len(inputs)
+
+    lanes: Dict[object, List[int]] = {}
+    for index, input in enumerate(inputs):
+        repository = input.old_state.shared_repository()
+        lanes.setdefault(
+            index if repository is None else repository.resolve(), []
+        ).append(index)
+
+    def run_lane(indices: List[int]) -> None:
+        for index in indices:
+            job_environment = (
+                environment
+                if time_budget is None
+                else environment.with_time_budget(time_budget)
+            )
+            results[index] = run_single(job_environment, inputs[index])
+
+    if max_concurrency <= 1 or len(lanes) <= 1:
+        for indices in lanes.values():
+            run_lane(indices)
+    else:
+        with ThreadPoolExecutor(min(max_concurrency, len(lanes))) as executor:
+            list(executor.map(run_lane, lanes.values()))
+    return [result for result in results if result is not None]
+
+
 def run_batch_test(
-    environment: Environment, inputs: Iterable[Specification]
+    environment: Environment,
+    inputs: Iterable[Specification],
+    max_concurrency: int = 1,
+    time_budget: Optional[float] = None,
 ) -> List[RunnerResult]:
-    return [run_single_test(environment, input) for input in inputs]
+    return _run_batch(
+        run_single_test, environment, inputs, max_concurrency, time_budget
+    )
 
 
 def run_single_benchmark(
@@ -189,6 +234,11 @@ def run_single_benchmark(
 
 
 def run_batch_benchmark(
-    environment: Environment, inputs: Iterable[Specification]
+    environment: Environment,
+    inputs: Iterable[Specification],
+    max_concurrency: int = 1,
+    time_budget: Optional[float] = None,
 ) -> List[RunnerResult]:
-    return [run_single_benchmark(environment, input) for input in inputs]
+    return _run_batch(
+        run_single_benchmark, environment, inputs, max_concurrency, time_budget
+    )
@@ -1,5 +1,6 @@
 import logging
 import subprocess
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
@@ -31,6 +32,16 @@ class Environment(ABC):
     ) -> CommandOutput:
         ...
 
+    def with_time_budget(self, seconds: float) -> "Environment":
+        """Returns an environment that interrupts commands once `seconds` have
+        passed. Environments that cannot interrupt commands return themselves."""
+        return self
+
+    def for_cleanup(self) -> "Environment":
+        """Returns an environment to clean up with, which still runs commands once
+        the time budget ran out."""
+        return self
+
     def checked_run(
         self,
         working_directory: Path,
@@ -52,6 +63,27 @@ class Environment(ABC):
 
 
 class SubprocessEnvironment(Environment):
+    # Clean up commands started after the time budget ran out still get this many
+    # seconds to finish.
+    MINIMUM_CLEANUP_TIMEOUT: float = 60.0
+
+    def __init__(self, deadline: Optional[float] = None, cleanup: bool = False) -> None:
+        self._deadline = deadline
+        self._cleanup = cleanup
+
+    def _copy(self, deadline: Optional[float], cleanup: bool) -> "Environment":
+        environment = SubprocessEnvironment(deadline=deadline, cleanup=cleanup)
+        environment.pyre_binary_override = self.pyre_binary_override
+        environment.typeshed_override = self.typeshed_override
+        environment.pyre_client_override = self.pyre_client_override
+        return environment
+
+    def with_time_budget(self, seconds: float) -> "Environment":
+        return self._copy(deadline=time.monotonic() + seconds, cleanup=self._cleanup)
+
+    def for_cleanup(self) -> "Environment":
+        return self._copy(deadline=self._deadline, cleanup=True)
+
     def run(
         self, working_directory: Path, command: str, stdin: Optional[str]
     ) -> CommandOutput:
@@ -59,14 +91,32 @@ class SubprocessEnvironment(Environment):
             f"Invoking subprocess `{command}` at `{working_directory}`"
             f"{' with stdin' if stdin is not None else ''}"
         )
-        result = subprocess.run(
-            command.split(),
-            cwd=working_directory,
-            universal_newlines=True,
-            input=stdin,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
+        timeout = None
+        deadline = self._deadline
+        if deadline is not None:
+            timeout = deadline - time.monotonic()
+            if self._cleanup:
+                timeout = max(timeout, self.MINIMUM_CLEANUP_TIMEOUT)
+            elif timeout <= 0:
+                raise EnvironmentException(
+                    f'Not running command "{command}" under {working_directory}: '
+                    "the time budget ran out."
+                )
+        try:
+            result = subprocess.run(
+                command.split(),
+                cwd=working_directory,
+                universal_newlines=True,
+                input=stdin,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            raise EnvironmentException(
+                f'Running command "{command}" under {working_directory} '
+                "exceeded the time budget."
+            )
         return CommandOutput(
             return_code=result.returncode, stdout=result.stdout, stderr=result.stderr
         )
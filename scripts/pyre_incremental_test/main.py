@@ -76,12 +76,22 @@ def main(arguments: argparse.Namespace) -> int:
 
         if arguments.benchmark:
             LOG.info(f"Start benchmarking {len(specifications)} specifications...")
-            results = run_batch_benchmark(SubprocessEnvironment(), specifications)
+            results = run_batch_benchmark(
+                SubprocessEnvironment(),
+                specifications,
+                arguments.max_concurrency,
+                arguments.time_budget,
+            )
             _log_benchmark_statistics(results)
             LOG.info("Done benchmarking.")
         else:
             LOG.info(f"Start testing {len(specifications)} specifications...")
-            results = run_batch_test(SubprocessEnvironment(), specifications)
+            results = run_batch_test(
+                SubprocessEnvironment(),
+                specifications,
+                arguments.max_concurrency,
+                arguments.time_budget,
+            )
             _log_test_statistics(results)
             LOG.info("Done testing.")
 
@@ -133,6 +143,24 @@ if __name__ == "__main__":
         action="store_true",
         help="Do not include error discrepancy in the result when the test fails",
     )
+    parser.add_argument(
+        "-j",
+        "--max-concurrency",
+        type=int,
+        default=1,
+        help=(
+            "Maximum number of specifications to run at the same time. "
+            "Specifications on the same hg repository always run one at a time"
+        ),
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        help=(
+            "Number of seconds after which a specification is interrupted. Only "
+            "wall-clock time is limited, not memory or other resources"
+        ),
+    )
     parser.add_argument("-l", "--logger", type=str, help=argparse.SUPPRESS)
     parser.add_argument(
         "-i",
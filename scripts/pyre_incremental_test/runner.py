@@ -10,7 +10,7 @@ from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, overload
 
 from typing_extensions import Final, Literal
 
-from .environment import Environment
+from .environment import Environment, EnvironmentException
 from .specification import Specification
 
 
@@ -61,6 +61,10 @@ class PyreRunner:
         if typeshed_override:
             invocation += f" --typeshed {typeshed_override}"
         self._pyre_invocation: str = invocation
+        self._server_running: bool = False
+        # Clients older than `pyre profile --wait-for-incremental-updates`, e.g.
+        # given as `pyre_client_override`, poll the profiling log instead.
+        self._can_wait_for_incremental_updates: bool = True
 
     def update(self) -> List[Mapping[str, int]]:
         incremental_update_logs: List[Mapping[str, int]] = []
@@ -68,14 +72,41 @@ class PyreRunner:
         updates = new_state.update_steps()
         for expected, update in enumerate(updates):
             update.update(self._environment, self._working_directory)
-            while True:
-                incremental_update_logs = self.run_profile("incremental_updates")
-                if len(incremental_update_logs) > expected:
-                    break
-                else:
-                    sleep(1)
+            incremental_update_logs = self.wait_for_incremental_updates(expected + 1)
         return incremental_update_logs
 
+    def wait_for_incremental_updates(self, count: int) -> List[Mapping[str, int]]:
+        if self._can_wait_for_incremental_updates:
+            # The profile command follows the profiling log and returns as soon
+            # as the server logged the end of the update.
+            pyre_profile_command = (
+                f"{self._pyre_invocation} profile "
+                "--profile-output=incremental_updates "
+                f"--wait-for-incremental-updates {count}"
+            )
+            try:
+                output = self._environment.checked_run(
+                    working_directory=self._working_directory,
+                    command=pyre_profile_command,
+                )
+                return json.loads(output.stdout)
+            except EnvironmentException as exception:
+                if "unrecognized arguments: --wait-for-incremental-updates" not in str(
+                    exception
+                ):
+                    raise
+                LOG.warning(
+                    "The pyre client cannot wait for incremental updates. "
+                    "Polling the profiling log instead."
+                )
+                self._can_wait_for_incremental_updates = False
+
+        while True:
+            incremental_update_logs = self.run_profile("incremental_updates")
+            if len(incremental_update_logs) >= count:
+                return incremental_update_logs
+            sleep(1)
+
     def run_check(self) -> List[PyreError]:
         pyre_check_command = (
             f"{self._pyre_invocation} {self._specification.pyre_check_pyre_options} "
@@ -102,6 +133,8 @@ class PyreRunner:
             "--no-saved-state --enable-profiling "
             f"restart {self._specification.pyre_start_options}"
         ).rstrip()
+        # Set before restarting, since the server can outlive a failed command.
+        self._server_running = True
         self._environment.checked_run(
             working_directory=self._working_directory,
             command=pyre_start_command,
@@ -125,14 +158,30 @@ class PyreRunner:
             "saved_state_size": saved_state_size,
         }
 
+    def _stop_command(self) -> str:
+        return (
+            f"{self._pyre_invocation} {self._specification.pyre_stop_pyre_options} "
+            f"stop {self._specification.pyre_stop_options}"
+        )
+
     def run_stop(self) -> None:
         self._environment.checked_run(
-            working_directory=self._working_directory,
-            command=(
-                f"{self._pyre_invocation} {self._specification.pyre_stop_pyre_options} "
-                f"stop {self._specification.pyre_stop_options}"
-            ),
+            working_directory=self._working_directory, command=self._stop_command()
         )
+        self._server_running = False
+
+    def stop_server_if_running(self) -> None:
+        """Stops the server if a failed run left it running, even once the time
+        budget ran out. Killing the client does not stop the server."""
+        if not self._server_running:
+            return
+        try:
+            self._environment.for_cleanup().checked_run(
+                working_directory=self._working_directory, command=self._stop_command(),
+            )
+        except EnvironmentException as error:
+            LOG.warning(f"Could not stop the pyre server: {error}")
+        self._server_running = False
 
     def run_incremental(self) -> List[PyreError]:
         pyre_incremental_command = (
@@ -185,7 +234,12 @@ def _create_pyre_runner(
     environment: Environment, specification: Specification
 ) -> Iterator["PyreRunner"]:
     with specification.old_state.activate_sandbox(environment) as sandbox_root:
-        yield PyreRunner(environment, specification, sandbox_root)
+        pyre_runner = PyreRunner(environment, specification, sandbox_root)
+        try:
+            yield pyre_runner
+        finally:
+            # The server has to be stopped before the sandbox is cleaned up.
+            pyre_runner.stop_server_if_running()
 
 
 @dataclass
@@ -1,12 +1,14 @@
 import json
 import logging
+import shlex
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, ContextManager, Dict, Iterator, List
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
 
 from .environment import Environment
+from .synthetic import SyntheticProject
 
 
 LOG: logging.Logger = logging.getLogger(__name__)
@@ -25,6 +27,12 @@ class RepositoryState(ABC):
     def to_json(self) -> Dict[str, Any]:
         raise NotImplementedError
 
+    def shared_repository(self) -> Optional[Path]:
+        """Returns the repository the sandbox is activated in, if it is not a
+        private copy. Sandboxes of the same repository cannot be active at the
+        same time."""
+        return None
+
     @staticmethod
     def from_json(input_json: Dict[str, Any]) -> "RepositoryState":
         try:
@@ -41,6 +49,8 @@ class RepositoryState(ABC):
                         "File repository must be specified as dicts"
                     )
                 return FileRepositoryState(files)
+            elif kind == "synthetic":
+                return SyntheticRepositoryState(SyntheticProject.from_json(input_json))
             elif kind == "updated":
                 base = input_json["base"]
                 updates = input_json["updates"]
@@ -64,6 +74,10 @@ class RepositoryState(ABC):
             raise InvalidSpecificationException(
                 f"Cannot create RespositoryState due to invalid path: {error}"
             )
+        except ValueError as error:
+            raise InvalidSpecificationException(
+                f"Cannot create RespositoryState due to invalid value: {error}"
+            )
 
 
 class RepositoryUpdate(ABC):
@@ -100,6 +114,12 @@ class RepositoryUpdate(ABC):
                 if len(changes) == 0 and len(removals) == 0:
                     raise InvalidSpecificationException("No file change is given")
                 return FileRepositoryUpdate(changes=changes, removals=removals)
+            elif kind == "synthetic":
+                return SyntheticRepositoryUpdate(
+                    project=SyntheticProject.from_json(input_json["project"]),
+                    number_of_edits=int(input_json["number_of_edits"]),
+                    seed=int(input_json.get("seed", 0)),
+                )
             elif kind == "batch":
                 updates = input_json["updates"]
                 if not isinstance(updates, list):
@@ -119,6 +139,10 @@ class RepositoryUpdate(ABC):
             raise InvalidSpecificationException(
                 f"Cannot create RepositoryUpdate due to missing field '{key}'"
             )
+        except (TypeError, ValueError) as error:
+            raise InvalidSpecificationException(
+                f"Cannot create RepositoryUpdate due to invalid value: {error}"
+            )
 
 
 class SingleUpdate(RepositoryUpdate):
@@ -145,6 +169,9 @@ class HgRepositoryState(RepositoryState):
     def get_working_directory(self) -> Path:
         return self.repository
 
+    def shared_repository(self) -> Optional[Path]:
+        return self.repository
+
     @contextmanager
     def _do_prepare(self, environment: Environment) -> Iterator[Path]:
         # Save the original commit hash.
@@ -158,19 +185,81 @@ class HgRepositoryState(RepositoryState):
             working_directory=self.repository,
             command=f"hg update --clean {self.commit_hash}",
         )
-        yield self.repository
-
-        # Discard all changes and revert to the original commit hash.
-        if original_commit_hash is not None:
-            environment.checked_run(
-                working_directory=self.repository,
-                command=f"hg update --clean {original_commit_hash}",
-            )
+        try:
+            yield self.repository
+        finally:
+            # Discard all changes and revert to the original commit hash.
+            if original_commit_hash is not None:
+                environment.for_cleanup().checked_run(
+                    working_directory=self.repository,
+                    command=f"hg update --clean {original_commit_hash}",
+                )
 
     def activate_sandbox(self, environment: Environment) -> ContextManager[Path]:
         return self._do_prepare(environment)
 
 
+@contextmanager
+def _temporary_sandbox(
+    environment: Environment,
+    files: Dict[str, str],
+    write_files: Callable[[Dict[str, str], Path], None],
+) -> Iterator[Path]:
+    # Grab a temporary directory as the local root
+    temporary_directory = environment.checked_run(
+        working_directory=Path("."), command="mktemp -d"
+    ).stdout.strip()
+    root = Path(temporary_directory)
+    LOG.debug(f"Using temporary directory {temporary_directory} as local root")
+
+    watched = False
+    try:
+        # Write all files under the local root.
+        all_files = {
+            ".watchmanconfig": "{}",
+            # Note that --binary and --typeshed still needs to be set in pyre flags.
+            ".pyre_configuration": '{ "source_directories": [ "." ] }',
+            **files,
+        }
+        write_files(all_files, root)
+
+        # Watchman uses the "error" field instead of return code to signal errors
+        watchman_output = environment.checked_run(
+            working_directory=root, command="watchman watch ."
+        ).stdout
+        if "error" in json.loads(watchman_output):
+            raise RuntimeError(
+                f"`watchman watch` invocation failed with output:\n{watchman_output}"
+            )
+        watched = True
+        yield root
+    finally:
+        # Clean up the files we've written.
+        cleanup_environment = environment.for_cleanup()
+        if watched:
+            cleanup_environment.checked_run(
+                working_directory=root, command="watchman watch-del ."
+            )
+        cleanup_environment.checked_run(
+            working_directory=Path("."), command=f"rm -rf {temporary_directory}"
+        )
+
+
+def _write_tree(environment: Environment, root: Path, files: Dict[str, str]) -> None:
+    """Writes all files under `root` with a single shell invocation."""
+    directories = sorted({str(Path(path).parent) for path in files} - {"."})
+    script = []
+    if directories:
+        script.append(
+            "mkdir -p " + " ".join(shlex.quote(directory) for directory in directories)
+        )
+    for path, content in files.items():
+        script.append(f"printf '%s' {shlex.quote(content)} > {shlex.quote(path)}")
+    environment.checked_run(
+        working_directory=root, command="sh", stdin="\n".join(script) + "\n"
+    )
+
+
 @dataclass
 class FileRepositoryState(RepositoryState):
     files: Dict[str, str]
@@ -178,50 +267,30 @@ class FileRepositoryState(RepositoryState):
     def to_json(self) -> Dict[str, Any]:
         return {"kind": "file", "files": self.files}
 
-    @contextmanager
-    def _do_prepare(self, environment: Environment) -> Iterator[Path]:
-        # Grab a temporary directory as the local root
-        temporary_directory = environment.checked_run(
-            working_directory=Path("."), command="mktemp -d"
-        ).stdout.strip()
-        root = Path(temporary_directory)
-        LOG.debug(f"Using temporary directory {temporary_directory} as local root")
-
-        watched = False
-        try:
-            # Write all files under the local root.
-            all_files = {
-                ".watchmanconfig": "{}",
-                # Note that --binary and --typeshed still needs to be set in pyre flags.
-                ".pyre_configuration": '{ "source_directories": [ "." ] }',
-                **self.files,
-            }
-            FileRepositoryUpdate(changes=all_files, removals=[]).update(
+    def activate_sandbox(self, environment: Environment) -> ContextManager[Path]:
+        return _temporary_sandbox(
+            environment,
+            self.files,
+            lambda files, root: FileRepositoryUpdate(changes=files, removals=[]).update(
                 environment, root
-            )
+            ),
+        )
 
-            # Watchman uses the "error" field instead of return code to signal errors
-            watchman_output = environment.checked_run(
-                working_directory=root, command="watchman watch ."
-            ).stdout
-            if "error" in json.loads(watchman_output):
-                raise RuntimeError(
-                    f"`watchman watch` invocation failed with output:\n{watchman_output}"
-                )
-            watched = True
-            yield root
-        finally:
-            # Clean up the files we've written.
-            if watched:
-                environment.checked_run(
-                    working_directory=root, command="watchman watch-del ."
-                )
-            environment.checked_run(
-                working_directory=Path("."), command=f"rm -rf {temporary_directory}"
-            )
+
+@dataclass(frozen=True)
+class SyntheticRepositoryState(RepositoryState):
+    project: SyntheticProject
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"kind": "synthetic", **self.project.to_json()}
 
     def activate_sandbox(self, environment: Environment) -> ContextManager[Path]:
-        return self._do_prepare(environment)
+        # Synthetic projects have many files, so they are written all at once.
+        return _temporary_sandbox(
+            environment,
+            self.project.files(),
+            lambda files, root: _write_tree(environment, root, files),
+        )
 
 
 @dataclass
@@ -229,6 +298,10 @@ class UpdatedRepositoryState(RepositoryState):
     base: RepositoryState
     updates: List[RepositoryUpdate]
 
+    def __post_init__(self) -> None:
+        for update in self.updates:
+            _check_synthetic_update(self.base, update)
+
     def to_json(self) -> Dict[str, Any]:
         return {
             "kind": "updated",
@@ -236,6 +309,9 @@ class UpdatedRepositoryState(RepositoryState):
             "updates": [update.to_json() for update in self.updates],
         }
 
+    def shared_repository(self) -> Optional[Path]:
+        return self.base.shared_repository()
+
     @contextmanager
     def _do_prepare(self, environment: Environment) -> Iterator[Path]:
         with self.base.activate_sandbox(environment) as sandbox_root:
@@ -307,6 +383,47 @@ class FileRepositoryUpdate(SingleUpdate):
         return {"kind": "file", "changes": self.changes, "removals": self.removals}
 
 
+@dataclass(frozen=True)
+class SyntheticRepositoryUpdate(RepositoryUpdate):
+    project: SyntheticProject
+    number_of_edits: int
+    seed: int = 0
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "kind": "synthetic",
+            "project": self.project.to_json(),
+            "number_of_edits": self.number_of_edits,
+            "seed": self.seed,
+        }
+
+    def update_steps(self) -> List[SingleUpdate]:
+        return [
+            FileRepositoryUpdate(changes={path: contents}, removals=[])
+            for path, contents in self.project.edits(self.number_of_edits, self.seed)
+        ]
+
+
+def _synthetic_project(state: RepositoryState) -> Optional[SyntheticProject]:
+    if isinstance(state, SyntheticRepositoryState):
+        return state.project
+    elif isinstance(state, UpdatedRepositoryState):
+        return _synthetic_project(state.base)
+    else:
+        return None
+
+
+def _check_synthetic_update(state: RepositoryState, update: RepositoryUpdate) -> None:
+    # Synthetic edits rewrite whole modules of their own project, so applying them
+    # to any other project would silently produce a different repository.
+    if isinstance(update, SyntheticRepositoryUpdate) and update.project != (
+        _synthetic_project(state)
+    ):
+        raise InvalidSpecificationException(
+            "Synthetic updates can only be applied to a state of the same project"
+        )
+
+
 @dataclass(frozen=True)
 class BatchRepositoryUpdate(RepositoryUpdate):
     _updates: List[SingleUpdate]
@@ -335,6 +452,9 @@ class Specification:
     pyre_incremental_pyre_options: str = ""
     pyre_incremental_options: str = ""
 
+    def __post_init__(self) -> None:
+        _check_synthetic_update(self.old_state, self.new_state)
+
     def to_json(self) -> Dict[str, Any]:
         result: Dict[str, Any] = {
             "old_state": self.old_state.to_json(),
@@ -0,0 +1,181 @@
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Number of modules per package of a synthetic project.
+MODULES_PER_PACKAGE: int = 100
+
+
+@dataclass(frozen=True)
+class SyntheticProject:
+    """Parameters of a procedurally generated Python project.
+
+    Module `i` imports up to `fan_out` modules with a lower index, so the import
+    graph has no cycles, and no module is imported by more than `fan_in`
+    modules. Every module defines a class, which inherits from the class of one
+    of its dependencies as long as the hierarchy stays within `class_depth`
+    classes, and `functions_per_module` functions calling into dependencies.
+    Each parameter and return type is annotated with probability
+    `annotation_density`. The same parameters always generate the same project.
+    """
+
+    number_of_modules: int
+    fan_out: int = 2
+    fan_in: int = 10
+    class_depth: int = 3
+    functions_per_module: int = 5
+    annotation_density: float = 0.5
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.number_of_modules < 1:
+            raise ValueError("A synthetic project needs at least one module")
+        if self.fan_out < 0 or self.fan_in < 0 or self.class_depth < 1:
+            raise ValueError(
+                "Fan-in and fan-out must not be negative and class depth must be "
+                "positive"
+            )
+        if self.functions_per_module < 1:
+            raise ValueError("Synthetic modules need at least one function")
+        if not 0 <= self.annotation_density <= 1:
+            raise ValueError("Annotation density must be between 0 and 1")
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "number_of_modules": self.number_of_modules,
+            "fan_out": self.fan_out,
+            "fan_in": self.fan_in,
+            "class_depth": self.class_depth,
+            "functions_per_module": self.functions_per_module,
+            "annotation_density": self.annotation_density,
+            "seed": self.seed,
+        }
+
+    @staticmethod
+    def from_json(input_json: Dict[str, Any]) -> "SyntheticProject":
+        return SyntheticProject(
+            number_of_modules=int(input_json["number_of_modules"]),
+            fan_out=int(input_json.get("fan_out", 2)),
+            fan_in=int(input_json.get("fan_in", 10)),
+            class_depth=int(input_json.get("class_depth", 3)),
+            functions_per_module=int(input_json.get("functions_per_module", 5)),
+            annotation_density=float(input_json.get("annotation_density", 0.5)),
+            seed=int(input_json.get("seed", 0)),
+        )
+
+    @staticmethod
+    def module_name(index: int) -> str:
+        return f"package_{index // MODULES_PER_PACKAGE}.module_{index}"
+
+    @staticmethod
+    def module_path(index: int) -> str:
+        return f"package_{index // MODULES_PER_PACKAGE}/module_{index}.py"
+
+    def _dependencies(self) -> List[List[int]]:
+        generator = random.Random(self.seed)
+        importers = [0] * self.number_of_modules
+        # Modules that can still be imported without exceeding the fan-in.
+        available: List[int] = []
+        dependencies = []
+        for index in range(self.number_of_modules):
+            chosen = sorted(
+                generator.sample(available, min(self.fan_out, len(available)))
+            )
+            for module in chosen:
+                importers[module] += 1
+                if importers[module] >= self.fan_in:
+                    available.remove(module)
+            dependencies.append(chosen)
+            if self.fan_in > 0:
+                available.append(index)
+        return dependencies
+
+    def _bases(self, dependencies: List[List[int]]) -> List[Optional[int]]:
+        # The module whose class each class inherits from, if any.
+        bases: List[Optional[int]] = []
+        depths: List[int] = []
+        for modules in dependencies:
+            base = next(
+                (module for module in modules if depths[module] < self.class_depth),
+                None,
+            )
+            bases.append(base)
+            depths.append(1 if base is None else depths[base] + 1)
+        return bases
+
+    def _module(
+        self, index: int, dependencies: List[int], base: Optional[int], revision: int
+    ) -> str:
+        generator = random.Random(f"{self.seed}:{index}:{revision}")
+
+        def annotation(prefix: str) -> str:
+            return (
+                prefix + "int" if generator.random() < self.annotation_density else ""
+            )
+
+        lines = [f"import {self.module_name(module)}" for module in dependencies]
+        if lines:
+            lines.append("")
+            lines.append("")
+        if base is None:
+            lines.append(f"class Class{index}:")
+        else:
+            lines.append(f"class Class{index}({self.module_name(base)}.Class{base}):")
+        lines.append(
+            f"    def method{index}(self, x{annotation(': ')}){annotation(' -> ')}:"
+        )
+        lines.append(f"        return x + {revision}")
+
+        for function in range(self.functions_per_module):
+            lines.append("")
+            lines.append("")
+            lines.append(
+                f"def function{index}_{function}(x{annotation(': ')})"
+                f"{annotation(' -> ')}:"
+            )
+            if dependencies:
+                module = generator.choice(dependencies)
+                callee = generator.randrange(self.functions_per_module)
+                callee_name = f"{self.module_name(module)}.function{module}_{callee}"
+                lines.append(f"    return {callee_name}(x)")
+            else:
+                lines.append(f"    return x + {revision}")
+        return "\n".join(lines) + "\n"
+
+    def files(self) -> Dict[str, str]:
+        dependencies = self._dependencies()
+        bases = self._bases(dependencies)
+        files = {
+            f"package_{package}/__init__.py": ""
+            for package in range(
+                (self.number_of_modules - 1) // MODULES_PER_PACKAGE + 1
+            )
+        }
+        for index in range(self.number_of_modules):
+            files[self.module_path(index)] = self._module(
+                index, dependencies[index], bases[index], revision=0
+            )
+        return files
+
+    def edits(self, number_of_edits: int, seed: int) -> List[Tuple[str, str]]:
+        """Returns a reproducible stream of edits, as the path and new contents
+        of a module. Edits change annotations and call targets, but keep the
+        imports and classes of the module."""
+        dependencies = self._dependencies()
+        bases = self._bases(dependencies)
+        generator = random.Random(seed)
+        revisions = [0] * self.number_of_modules
+        edits = []
+        for _ in range(number_of_edits):
+            index = generator.randrange(self.number_of_modules)
+            revisions[index] += 1
+            edits.append(
+                (
+                    self.module_path(index),
+                    self._module(
+                        index, dependencies[index], bases[index], revisions[index]
+                    ),
+                )
+            )
+        return edits
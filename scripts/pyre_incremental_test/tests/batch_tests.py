@@ -1,9 +1,12 @@
 import json
+import threading
 import unittest
 from dataclasses import asdict
-from typing import ClassVar, Dict, List
+from pathlib import Path
+from typing import ClassVar, Dict, List, Set
 
 from ..batch import run_batch_test
+from ..environment import EnvironmentException, SubprocessEnvironment
 from ..runner import PyreError
 from ..specification import Specification
 from .test_environment import (
@@ -114,3 +117,62 @@ class RunnerTest(unittest.TestCase):
             [specification0, specification1, specification2],
             ["fail", "pass", "exception"],
         )
+
+    def test_concurrent(self) -> None:
+        def create_specification(repository: str, commit_hash: str) -> Specification:
+            return Specification.from_json(
+                {
+                    "old_state": {
+                        "kind": "hg",
+                        "repository": repository,
+                        "commit_hash": commit_hash,
+                    },
+                    "new_state": {"kind": "hg", "commit_hash": commit_hash},
+                }
+            )
+
+        # Both repositories must be checked out at the same time to pass the
+        # barrier, but each repository only runs one specification at a time.
+        barrier = threading.Barrier(2)
+        lock = threading.Lock()
+        active: Set[Path] = set()
+
+        def execute(input: CommandInput) -> CommandOutput:
+            command = input.command
+            repository = input.working_directory.resolve()
+            if command == "hg whereami":
+                with lock:
+                    self.assertNotIn(repository, active)
+                    active.add(repository)
+                barrier.wait(timeout=5)
+            elif command.endswith("check"):
+                with lock:
+                    active.remove(repository)
+            elif "total_shared_memory_size_over_time" in command:
+                return CommandOutput(return_code=0, stdout='[["time", 42]]', stderr="")
+            elif "cold_start_phases" in command:
+                return CommandOutput(return_code=0, stdout="{}", stderr="")
+            elif " profile" in command:
+                return CommandOutput(return_code=0, stdout="[{}]", stderr="")
+            return CommandOutput(return_code=0, stdout="", stderr="")
+
+        specifications = [
+            create_specification("repo1", "hash0"),
+            create_specification("repo2", "hash1"),
+            # Paths to the same repository share its lane.
+            create_specification("repo1/../repo1", "hash2"),
+            create_specification("repo2", "hash3"),
+        ]
+        results = run_batch_test(
+            TestEnvironment(execute), specifications, max_concurrency=4
+        )
+        self.assertEqual([result.input for result in results], specifications)
+        self.assertEqual([result.get_status() for result in results], ["pass"] * 4)
+
+    def test_time_budget(self) -> None:
+        environment = SubprocessEnvironment().with_time_budget(0)
+        with self.assertRaises(EnvironmentException):
+            environment.run(Path("."), "true", None)
+        # Clean up commands still run once the time budget ran out.
+        output = environment.for_cleanup().run(Path("."), "true", None)
+        self.assertEqual(output.return_code, 0)
@@ -5,6 +5,8 @@ from pathlib import Path
 from typing import List, Optional
 from unittest.mock import MagicMock, patch
 
+from .. import runner
+from ..environment import EnvironmentException
 from ..runner import (
     InconsistentOutput,
     PyreError,
@@ -90,7 +92,9 @@ class RunnerTest(unittest.TestCase):
             CommandInput(Path("old_root"), "pyre query save_server_state('tempfile')"),
             CommandInput(Path("old_root"), "hg update --clean new_hash"),
             CommandInput(
-                Path("old_root"), "pyre profile --profile-output=incremental_updates"
+                Path("old_root"),
+                "pyre profile --profile-output=incremental_updates "
+                "--wait-for-incremental-updates 1",
             ),
             CommandInput(
                 Path("old_root"),
@@ -276,7 +280,8 @@ class RunnerTest(unittest.TestCase):
             CommandInput(
                 Path("old_root"),
                 "client --binary bin --typeshed bikeshed profile "
-                "--profile-output=incremental_updates",
+                "--profile-output=incremental_updates "
+                "--wait-for-incremental-updates 1",
             ),
             CommandInput(
                 Path("old_root"),
@@ -305,6 +310,110 @@ class RunnerTest(unittest.TestCase):
             pyre_client_override="client",
         )
 
+    def test_stop_after_failure(self) -> None:
+        specification = Specification.from_json(
+            {
+                "old_state": {
+                    "kind": "hg",
+                    "repository": "old_root",
+                    "commit_hash": "old_hash",
+                },
+                "new_state": {"kind": "hg", "commit_hash": "new_hash"},
+            }
+        )
+
+        def failing_incremental_execute(command_input: CommandInput) -> CommandOutput:
+            if command_input.command.startswith("hg whereami"):
+                return CommandOutput(return_code=0, stdout="initial_hash", stderr="")
+            elif "total_shared_memory_size_over_time" in command_input.command:
+                return CommandOutput(return_code=0, stdout='[["time", 42]]', stderr="")
+            elif "cold_start_phases" in command_input.command:
+                return CommandOutput(return_code=0, stdout="{}", stderr="")
+            elif " profile" in command_input.command:
+                return CommandOutput(return_code=0, stdout="[{}]", stderr="")
+            elif " incremental" in command_input.command:
+                return CommandOutput(return_code=2, stdout="", stderr="timed out")
+            else:
+                return CommandOutput(return_code=0, stdout="", stderr="")
+
+        environment = TestEnvironment(failing_incremental_execute)
+        with patch("os.stat", new=mock_stat), patch(
+            "tempfile.NamedTemporaryFile", new=mock_temp_file_class
+        ), self.assertRaises(EnvironmentException):
+            compare_server_to_full(environment, specification)
+        # The server is stopped before the repository is restored.
+        self.assertEqual(
+            environment.command_history[-3:],
+            [
+                CommandInput(
+                    Path("old_root"), "pyre  --output=json --noninteractive incremental"
+                ),
+                CommandInput(Path("old_root"), "pyre  stop "),
+                CommandInput(Path("old_root"), "hg update --clean initial_hash"),
+            ],
+        )
+
+    def test_wait_for_incremental_updates_with_older_client(self) -> None:
+        specification = Specification.from_json(
+            {
+                "old_state": {
+                    "kind": "hg",
+                    "repository": "old_root",
+                    "commit_hash": "old_hash",
+                },
+                "new_state": {"kind": "hg", "commit_hash": "new_hash"},
+            }
+        )
+        incremental_update_logs = ["[]", "[{}]"]
+
+        def older_client_execute(command_input: CommandInput) -> CommandOutput:
+            if command_input.command.startswith("hg whereami"):
+                return CommandOutput(return_code=0, stdout="initial_hash", stderr="")
+            elif "total_shared_memory_size_over_time" in command_input.command:
+                return CommandOutput(return_code=0, stdout='[["time", 42]]', stderr="")
+            elif "cold_start_phases" in command_input.command:
+                return CommandOutput(return_code=0, stdout="{}", stderr="")
+            elif "--wait-for-incremental-updates" in command_input.command:
+                return CommandOutput(
+                    return_code=2,
+                    stdout="",
+                    stderr="pyre: error: unrecognized arguments: "
+                    "--wait-for-incremental-updates 1",
+                )
+            elif " profile" in command_input.command:
+                return CommandOutput(
+                    return_code=0, stdout=incremental_update_logs.pop(0), stderr=""
+                )
+            else:
+                return CommandOutput(return_code=0, stdout="", stderr="")
+
+        environment = TestEnvironment(older_client_execute)
+        environment.pyre_client_override = "client"
+        with patch("os.stat", new=mock_stat), patch(
+            "tempfile.NamedTemporaryFile", new=mock_temp_file_class
+        ), patch(f"{runner.__name__}.sleep") as sleep:
+            compare_server_to_full(environment, specification)
+        # The profiling log is polled until the update was logged.
+        sleep.assert_called_once_with(1)
+        self.assertEqual(
+            environment.command_history[7:10],
+            [
+                CommandInput(
+                    Path("old_root"),
+                    "client profile --profile-output=incremental_updates "
+                    "--wait-for-incremental-updates 1",
+                ),
+                CommandInput(
+                    Path("old_root"),
+                    "client profile --profile-output=incremental_updates",
+                ),
+                CommandInput(
+                    Path("old_root"),
+                    "client profile --profile-output=incremental_updates",
+                ),
+            ],
+        )
+
     def test_patch(self) -> None:
         patch_content = (
             "diff --git a/client/pyre.py b/client/pyre.py\n"
@@ -350,7 +459,9 @@ class RunnerTest(unittest.TestCase):
             CommandInput(Path("old_root"), "pyre query save_server_state('tempfile')"),
             CommandInput(Path("old_root"), "patch -p1", patch_content),
             CommandInput(
-                Path("old_root"), "pyre profile --profile-output=incremental_updates"
+                Path("old_root"),
+                "pyre profile --profile-output=incremental_updates "
+                "--wait-for-incremental-updates 1",
             ),
             CommandInput(
                 Path("old_root"), "pyre  --output=json --noninteractive incremental"
@@ -423,7 +534,9 @@ class RunnerTest(unittest.TestCase):
             CommandInput(Path("old_root"), f"rm -f {handle_c}"),
             CommandInput(Path("old_root"), f"rm -f {handle_d}"),
             CommandInput(
-                Path("old_root"), "pyre profile --profile-output=incremental_updates"
+                Path("old_root"),
+                "pyre profile --profile-output=incremental_updates "
+                "--wait-for-incremental-updates 1",
             ),
             CommandInput(
                 Path("old_root"), "pyre  --output=json --noninteractive incremental"
@@ -490,11 +603,15 @@ class RunnerTest(unittest.TestCase):
             CommandInput(Path("old_root"), "pyre query save_server_state('tempfile')"),
             CommandInput(Path("old_root"), "hg update --clean new_hashA"),
             CommandInput(
-                Path("old_root"), "pyre profile --profile-output=incremental_updates"
+                Path("old_root"),
+                "pyre profile --profile-output=incremental_updates "
+                "--wait-for-incremental-updates 1",
             ),
             CommandInput(Path("old_root"), "hg update --clean new_hashB"),
             CommandInput(
-                Path("old_root"), "pyre profile --profile-output=incremental_updates"
+                Path("old_root"),
+                "pyre profile --profile-output=incremental_updates "
+                "--wait-for-incremental-updates 2",
             ),
             CommandInput(
                 Path("old_root"), "pyre  --output=json --noninteractive incremental"
@@ -566,7 +683,9 @@ class RunnerTest(unittest.TestCase):
             CommandInput(Path("/mock/tmp"), "pyre query save_server_state('tempfile')"),
             CommandInput(Path("/mock/tmp"), f"rm -f {handle_a}"),
             CommandInput(
-                Path("/mock/tmp"), "pyre profile --profile-output=incremental_updates"
+                Path("/mock/tmp"),
+                "pyre profile --profile-output=incremental_updates "
+                "--wait-for-incremental-updates 1",
             ),
             CommandInput(
                 Path("/mock/tmp"), "pyre  --output=json --noninteractive incremental"
@@ -638,7 +757,9 @@ class RunnerTest(unittest.TestCase):
             CommandInput(Path("old_root"), "pyre query save_server_state('tempfile')"),
             CommandInput(Path("old_root"), "hg update --clean new_hashC"),
             CommandInput(
-                Path("old_root"), "pyre profile --profile-output=incremental_updates"
+                Path("old_root"),
+                "pyre profile --profile-output=incremental_updates "
+                "--wait-for-incremental-updates 1",
             ),
             CommandInput(
                 Path("old_root"), "pyre  --output=json --noninteractive incremental"
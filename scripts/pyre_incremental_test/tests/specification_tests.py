@@ -1,6 +1,9 @@
+import subprocess
+import tempfile
 import unittest
 from pathlib import Path
 
+from ..environment import CommandOutput
 from ..specification import (
     BatchRepositoryUpdate,
     FileRepositoryState,
@@ -12,7 +15,12 @@ from ..specification import (
     RepositoryState,
     RepositoryUpdate,
     Specification,
+    SyntheticRepositoryState,
+    SyntheticRepositoryUpdate,
+    UpdatedRepositoryState,
 )
+from ..synthetic import SyntheticProject
+from .test_environment import CommandInput, TestEnvironment
 
 
 class SpecificationTest(unittest.TestCase):
@@ -187,3 +195,93 @@ class SpecificationTest(unittest.TestCase):
                     }
                 }
             )
+
+    def test_synthetic(self) -> None:
+        project = SyntheticProject(number_of_modules=3, fan_out=1, seed=4)
+        self.assertEqual(
+            RepositoryState.from_json(
+                {"kind": "synthetic", "number_of_modules": 3, "fan_out": 1, "seed": 4}
+            ),
+            SyntheticRepositoryState(project),
+        )
+        self.assertEqual(
+            RepositoryState.from_json(SyntheticRepositoryState(project).to_json()),
+            SyntheticRepositoryState(project),
+        )
+        update = RepositoryUpdate.from_json(
+            {
+                "kind": "synthetic",
+                "project": {"number_of_modules": 3, "fan_out": 1, "seed": 4},
+                "number_of_edits": 2,
+            }
+        )
+        self.assertEqual(update, SyntheticRepositoryUpdate(project, number_of_edits=2))
+        self.assertEqual(RepositoryUpdate.from_json(update.to_json()), update)
+        self.assertEqual(len(update.update_steps()), 2)
+
+        with self.assertRaises(InvalidSpecificationException):
+            RepositoryState.from_json({"kind": "synthetic"})
+        with self.assertRaises(InvalidSpecificationException):
+            RepositoryState.from_json({"kind": "synthetic", "number_of_modules": 0})
+        with self.assertRaises(InvalidSpecificationException):
+            RepositoryUpdate.from_json(
+                {"kind": "synthetic", "project": {"number_of_modules": 3}}
+            )
+
+        other_project = SyntheticProject(number_of_modules=3, fan_out=1, seed=5)
+        Specification(SyntheticRepositoryState(project), update)
+        UpdatedRepositoryState(SyntheticRepositoryState(project), [update])
+        with self.assertRaises(InvalidSpecificationException):
+            Specification(SyntheticRepositoryState(other_project), update)
+        with self.assertRaises(InvalidSpecificationException):
+            Specification(FileRepositoryState(project.files()), update)
+        with self.assertRaises(InvalidSpecificationException):
+            Specification(
+                UpdatedRepositoryState(SyntheticRepositoryState(other_project), []),
+                update,
+            )
+
+    def test_synthetic_sandbox(self) -> None:
+        project = SyntheticProject(number_of_modules=4, fan_out=2, seed=1)
+
+        with tempfile.TemporaryDirectory() as root:
+
+            def mock_execute(command_input: CommandInput) -> CommandOutput:
+                if command_input.command == "mktemp -d":
+                    return CommandOutput(return_code=0, stdout=root, stderr="")
+                elif command_input.command == "sh":
+                    subprocess.run(
+                        ["sh"],
+                        input=command_input.stdin,
+                        cwd=command_input.working_directory,
+                        check=True,
+                        universal_newlines=True,
+                    )
+                return CommandOutput(return_code=0, stdout="{}", stderr="")
+
+            environment = TestEnvironment(mock_execute)
+            with SyntheticRepositoryState(project).activate_sandbox(environment):
+                files = {
+                    str(path.relative_to(root)): path.read_text()
+                    for path in Path(root).rglob("*")
+                    if path.is_file()
+                }
+
+        self.assertEqual(
+            files,
+            {
+                ".watchmanconfig": "{}",
+                ".pyre_configuration": '{ "source_directories": [ "." ] }',
+                **project.files(),
+            },
+        )
+        self.assertEqual(
+            [command_input.command for command_input in environment.command_history],
+            [
+                "mktemp -d",
+                "sh",
+                "watchman watch .",
+                "watchman watch-del .",
+                f"rm -rf {root}",
+            ],
+        )
@@ -0,0 +1,85 @@
+import ast
+import unittest
+from typing import Counter, Dict
+
+from ..synthetic import SyntheticProject
+
+
+class SyntheticProjectTest(unittest.TestCase):
+    def test_files(self) -> None:
+        project = SyntheticProject(
+            number_of_modules=150, fan_out=3, fan_in=4, class_depth=2, seed=7
+        )
+        files = project.files()
+        self.assertEqual(files, project.files())
+        self.assertEqual(
+            sorted(path for path in files if path.endswith("__init__.py")),
+            ["package_0/__init__.py", "package_1/__init__.py"],
+        )
+        self.assertEqual(len(files), 152)
+
+        imports: Counter[str] = Counter()
+        depths: Dict[int, int] = {}
+        for index in range(project.number_of_modules):
+            module = ast.parse(files[project.module_path(index)])
+            imported = [
+                alias.name
+                for statement in module.body
+                if isinstance(statement, ast.Import)
+                for alias in statement.names
+            ]
+            self.assertLessEqual(len(imported), 3)
+            imports.update(imported)
+
+            [class_definition] = [
+                statement
+                for statement in module.body
+                if isinstance(statement, ast.ClassDef)
+            ]
+            if class_definition.bases:
+                [base] = class_definition.bases
+                assert isinstance(base, ast.Attribute)
+                base_index = int(base.attr[len("Class") :])
+                self.assertLess(base_index, index)
+                depths[index] = depths[base_index] + 1
+            else:
+                depths[index] = 1
+        self.assertLessEqual(max(imports.values()), 4)
+        self.assertEqual(max(depths.values()), 2)
+
+    def test_annotation_density(self) -> None:
+        def annotations(density: float) -> int:
+            files = SyntheticProject(
+                number_of_modules=20, annotation_density=density
+            ).files()
+            return sum(contents.count(": int") for contents in files.values())
+
+        self.assertEqual(annotations(0.0), 0)
+        self.assertEqual(annotations(1.0), 20 * 6)
+
+    def test_edits(self) -> None:
+        project = SyntheticProject(number_of_modules=10, seed=1)
+        files = project.files()
+        edits = project.edits(number_of_edits=5, seed=2)
+        self.assertEqual(edits, project.edits(number_of_edits=5, seed=2))
+        self.assertEqual(len(edits), 5)
+        for path, contents in edits:
+            self.assertNotEqual(files[path], contents)
+            ast.parse(contents)
+            # Edits keep the imports of the module.
+            self.assertEqual(
+                [line for line in contents.splitlines() if line.startswith("import")],
+                [
+                    line
+                    for line in files[path].splitlines()
+                    if line.startswith("import")
+                ],
+            )
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            SyntheticProject(number_of_modules=0)
+        with self.assertRaises(ValueError):
+            SyntheticProject(number_of_modules=1, annotation_density=2)
+        with self.assertRaises(ValueError):
+            SyntheticProject(number_of_modules=1, class_depth=0)
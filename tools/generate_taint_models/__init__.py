@@ -6,16 +6,24 @@
 # pyre-strict
 
 import argparse
+import contextlib
+import itertools
 import json
 import logging
 import os
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Set, Type
+from typing import Any, Dict, Iterable, List, Optional, Set, Type
 
 from typing_extensions import Final
 
+from ...api import query
+from ...api.connection import PyreConnection
+from ...api.snapshot_cache import SnapshotCache
 from ...client import statistics
+from . import module_loader
 from .generator_specifications import DecoratorAnnotationSpecification  # noqa
 from .get_annotated_free_functions_with_decorator import (  # noqa
     AnnotatedFreeFunctionWithDecoratorGenerator,
@@ -35,8 +43,10 @@ from .get_models_filtered_by_callable import ModelsFilteredByCallableGenerator
 from .get_request_specific_data import RequestSpecificDataGenerator  # noqa
 from .get_REST_api_sources import RESTApiSourceGenerator  # noqa
 from .get_undecorated_sources import UndecoratedSourceGenerator  # noqa
+from .incremental import generate_models_incrementally
 from .model import Model
-from .model_generator import ModelGenerator
+from .model_generator import FileLocalModelGenerator, ModelGenerator
+from .model_writer import ModelBuffer, ModelWriter, open_atomically
 
 
 LOG: logging.Logger = logging.getLogger(__name__)
@@ -53,6 +63,12 @@ class GenerationArguments:
     mode: Final[Optional[List[str]]]
     verbose: bool
     output_directory: Final[Optional[str]]
+    number_of_workers: Optional[int] = None
+    number_of_processes: Optional[int] = None
+    incremental: bool = False
+    query_cache_directory: Optional[str] = None
+    query_cache_key: Optional[str] = None
+    stream_output: bool = False
 
 
 def _file_exists(path: str) -> str:
@@ -70,37 +86,81 @@ def _parse_arguments(
     parser.add_argument(
         "--output-directory", type=_file_exists, help="Directory to write models to"
     )
+    parser.add_argument(
+        "--number-of-workers",
+        type=int,
+        help="Maximum number of modes to generate models for concurrently "
+        "(default: 1)",
+    )
+    parser.add_argument(
+        "--number-of-processes",
+        type=int,
+        help="Number of processes file-local generators compute models in",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only regenerate models of file-local generators for files that "
+        "changed since the last run into the output directory",
+    )
+    parser.add_argument(
+        "--query-cache-directory",
+        help="Directory to share class hierarchy and call graph snapshots in. "
+        "Snapshots are recomputed when the sources of the project change",
+    )
+    parser.add_argument(
+        "--query-cache-key",
+        help="Additionally separates snapshots by this key, such as the "
+        "revision of the repository",
+    )
+    parser.add_argument(
+        "--stream-output",
+        action="store_true",
+        help="Write models as they are generated instead of sorting them first",
+    )
     arguments: argparse.Namespace = parser.parse_args()
     return GenerationArguments(
         mode=arguments.mode,
         verbose=arguments.verbose,
         output_directory=arguments.output_directory,
+        number_of_workers=arguments.number_of_workers,
+        number_of_processes=arguments.number_of_processes,
+        incremental=arguments.incremental,
+        query_cache_directory=arguments.query_cache_directory,
+        query_cache_key=arguments.query_cache_key,
+        stream_output=arguments.stream_output,
     )
 
 
+def _output_filename(name: str) -> str:
+    # Try to be slightly intelligent in how we name files.
+    if name.startswith("get_"):
+        return f"generated_{name[4:]}"
+    else:
+        return f"generated_{name}"
+
+
+def _manifest_path(output_directory: str, name: str) -> str:
+    return os.path.join(output_directory, f".{_output_filename(name)}.manifest.json")
+
+
+def _report_number_of_models(number_of_models: int) -> None:
+    print(json.dumps({"number of generated models": number_of_models}))
+
+
 def _report_results(
     models: Dict[str, Set[Model]], output_directory: Optional[str]
 ) -> None:
     if output_directory is not None:
         for name in models:
-            # Try to be slightly intelligent in how we name files.
-            if name.startswith("get_"):
-                filename = f"generated_{name[4:]}"
-            else:
-                filename = f"generated_{name}"
+            filename = _output_filename(name)
             with open(f"{output_directory}/{filename}.pysa", "w") as output_file:
                 output_file.write(
                     "\n".join([str(model) for model in sorted(models[name])])
                 )
                 output_file.write("\n")
-        print(
-            json.dumps(
-                {
-                    "number of generated models": sum(
-                        (len(generated_models) for generated_models in models.values())
-                    )
-                }
-            )
+        _report_number_of_models(
+            sum((len(generated_models) for generated_models in models.values()))
         )
     else:
         all_models = set()
@@ -109,6 +169,64 @@ def _report_results(
         print("\n".join([str(model) for model in sorted(all_models)]))
 
 
+def _iterate_models(generator: ModelGenerator[Model]) -> Iterable[Model]:
+    if isinstance(generator, FileLocalModelGenerator):
+        # Yield the models of every file as soon as it has been processed.
+        return itertools.chain.from_iterable(
+            models
+            for _path, models in generator.compute_models_by_path(
+                generator.paths_to_model()
+            )
+        )
+    return generator.generate_models()
+
+
+def _generate_models_for_mode(
+    generator_options: Dict[str, ModelGenerator[Model]],
+    mode: str,
+    logger_executable: Optional[str],
+    manifest_path: Optional[str] = None,
+    writer: Optional[ModelWriter] = None,
+) -> Set[Model]:
+    """Returns the models of `mode`. If a `writer` is given, models are written
+    to it as they are generated and nothing is returned."""
+    LOG.info("Computing models for `%s`", mode)
+    start = time.time()
+    generator = generator_options[mode]
+    if writer is not None:
+        writer.write_all(_iterate_models(generator))
+        models = set()
+    elif manifest_path is not None and isinstance(generator, FileLocalModelGenerator):
+        models = generate_models_incrementally(generator, manifest_path)
+    else:
+        models = set(generator.generate_models())
+    elapsed_time_seconds = time.time() - start
+    LOG.info(f"Computed models for `{mode}` in {elapsed_time_seconds:.3f} seconds.")
+
+    if logger_executable is not None:
+        elapsed_time_milliseconds = int(elapsed_time_seconds * 1000)
+        statistics.log(
+            statistics.LoggerCategory.PERFORMANCE,
+            integers={"time": elapsed_time_milliseconds},
+            normals={"name": "model generation", "model kind": mode},
+            logger=logger_executable,
+        )
+    return models
+
+
+def _start_servers(generators: Iterable[ModelGenerator[Model]]) -> None:
+    """Starts the Pyre servers generators query before they run concurrently.
+    Connections otherwise start their server lazily, from every thread that
+    queries it first."""
+    for generator in generators:
+        pyre_connection = getattr(generator, "pyre_connection", None)
+        if (
+            isinstance(pyre_connection, PyreConnection)
+            and not pyre_connection.server_initialized
+        ):
+            pyre_connection.start_server()
+
+
 def run_from_parsed_arguments(
     generator_options: Dict[str, ModelGenerator[Model]],
     arguments: GenerationArguments,
@@ -116,23 +234,92 @@ def run_from_parsed_arguments(
     logger_executable: Optional[str] = None,
 ) -> None:
     modes = arguments.mode or default_modes
+    number_of_processes = arguments.number_of_processes
+    if number_of_processes is not None:
+        for mode in modes:
+            generator = generator_options[mode]
+            if isinstance(generator, FileLocalModelGenerator):
+                generator.number_of_processes = number_of_processes
+    query_cache_directory = arguments.query_cache_directory
+    query_cache_key = arguments.query_cache_key
+    if query_cache_directory is not None:
+        query.set_snapshot_cache(
+            SnapshotCache(query_cache_directory, key=query_cache_key)
+        )
+    output_directory = arguments.output_directory
+    manifest_paths: Dict[str, Optional[str]] = {
+        mode: _manifest_path(output_directory, mode)
+        if arguments.incremental and output_directory is not None
+        else None
+        for mode in modes
+    }
+    number_of_workers = arguments.number_of_workers or 1
     generated_models: Dict[str, Set[Model]] = {}
-    for mode in modes:
-        LOG.info("Computing models for `%s`", mode)
-        start = time.time()
-        generated_models[mode] = set(generator_options[mode].generate_models())
-        elapsed_time_seconds = time.time() - start
-        LOG.info(f"Computed models for `{mode}` in {elapsed_time_seconds:.3f} seconds.")
-
-        if logger_executable is not None:
-            elapsed_time_milliseconds = int(elapsed_time_seconds * 1000)
-            statistics.log(
-                statistics.LoggerCategory.PERFORMANCE,
-                integers={"time": elapsed_time_milliseconds},
-                normals={"name": "model generation", "model kind": mode},
-                logger=logger_executable,
-            )
-    _report_results(generated_models, arguments.output_directory)
+    # Incremental generation needs all models of a mode to update its manifest.
+    stream_output = arguments.stream_output and not arguments.incremental
+    with contextlib.ExitStack() as contexts:
+        # Generators of different modes mostly load the same modules.
+        if len(modes) > 1:
+            contexts.enter_context(module_loader.shared_modules())
+        writers: Dict[str, Optional[ModelWriter]] = {mode: None for mode in modes}
+        buffers: Dict[str, ModelBuffer] = {}
+        if stream_output and output_directory is not None:
+            for mode in modes:
+                path = f"{output_directory}/{_output_filename(mode)}.pysa"
+                writers[mode] = ModelWriter(
+                    contexts.enter_context(open_atomically(path))
+                )
+        elif stream_output and (number_of_workers <= 1 or len(modes) <= 1):
+            shared_writer = ModelWriter(sys.stdout)
+            writers = {mode: shared_writer for mode in modes}
+        elif stream_output:
+            # Models of concurrent modes would interleave on the standard
+            # output. They are buffered and written in the order of `modes`.
+            buffers = {mode: ModelBuffer() for mode in modes}
+            writers.update(buffers)
+
+        if number_of_workers <= 1 or len(modes) <= 1:
+            for mode in modes:
+                generated_models[mode] = _generate_models_for_mode(
+                    generator_options,
+                    mode,
+                    logger_executable,
+                    manifest_paths[mode],
+                    writers[mode],
+                )
+        else:
+            _start_servers(generator_options[mode] for mode in modes)
+            # Generators mostly wait on Pyre queries, so threads are enough to
+            # overlap them. Results are collected in the order of `modes` so the
+            # output does not depend on which generator finishes first.
+            with ThreadPoolExecutor(max_workers=number_of_workers) as executor:
+                futures = [
+                    (
+                        mode,
+                        executor.submit(
+                            _generate_models_for_mode,
+                            generator_options,
+                            mode,
+                            logger_executable,
+                            manifest_paths[mode],
+                            writers[mode],
+                        ),
+                    )
+                    for mode in modes
+                ]
+                for mode, future in futures:
+                    generated_models[mode] = future.result()
+            if buffers:
+                shared_writer = ModelWriter(sys.stdout)
+                for mode in modes:
+                    shared_writer.write_all(buffers[mode].models)
+
+    if not stream_output:
+        _report_results(generated_models, output_directory)
+    elif output_directory is not None:
+        _report_number_of_models(
+            sum(writer.count for writer in writers.values() if writer is not None)
+        )
 
 
 def run_generators(
@@ -10,8 +10,8 @@ from typing import Callable, Dict, Iterable, List, Optional, Set, Union
 
 from .decorator_parser import DecoratorParser
 from .generator_specifications import DecoratorAnnotationSpecification
-from .model import FunctionDefinitionModel
-from .model_generator import ModelGenerator, qualifier
+from .model import FunctionDefinitionModel, SerializedModel
+from .model_generator import FileLocalModelGenerator, qualifier
 from .module_loader import find_all_paths, load_module
 
 
@@ -20,15 +20,17 @@ FunctionDefinition = Union[ast.FunctionDef, ast.AsyncFunctionDef]
 
 
 class AnnotatedFreeFunctionWithDecoratorGenerator(
-    ModelGenerator[FunctionDefinitionModel]
+    FileLocalModelGenerator[FunctionDefinitionModel]
 ):
     def __init__(
         self,
         root: str,
         annotation_specifications: List[DecoratorAnnotationSpecification],
         paths: Optional[List[str]] = None,
+        number_of_processes: int = 1,
     ) -> None:
         self._paths: Optional[List[str]] = paths
+        self.number_of_processes = number_of_processes
         self.root = root
         self.annotation_specifications: List[
             DecoratorAnnotationSpecification
@@ -100,15 +102,19 @@ class AnnotatedFreeFunctionWithDecoratorGenerator(
 
         return models
 
-    def gather_functions_to_model(self) -> Iterable[Callable[..., object]]:
-        return []
+    def paths_to_model(self) -> Iterable[str]:
+        return self.paths
 
-    def compute_models(
-        self, functions_to_model: Iterable[Callable[..., object]]
-    ) -> Iterable[FunctionDefinitionModel]:
-        annotated_functions = set()
+    def compute_models_for_path(self, path: str) -> Iterable[FunctionDefinitionModel]:
+        return self._annotate_functions(path)
 
-        for path in self.paths:
-            annotated_functions.update(self._annotate_functions(path))
+    def configuration(self) -> Dict[str, object]:
+        return {
+            "root": self.root,
+            "annotation_specifications": self.annotation_specifications,
+        }
 
-        return sorted(annotated_functions)
+    def compute_models(
+        self, functions_to_model: Iterable[Callable[..., object]]
+    ) -> Iterable[Union[FunctionDefinitionModel, SerializedModel]]:
+        return sorted(super().compute_models(functions_to_model))
@@ -10,12 +10,12 @@ import ast
 import glob
 import logging
 import os
-from typing import Callable, Iterable, Optional, Set, Tuple, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 from typing_extensions import Final
 
 from .model import AssignmentModel, FunctionDefinitionModel, Model
-from .model_generator import ModelGenerator, qualifier
+from .model_generator import FileLocalModelGenerator, qualifier
 from .module_loader import find_all_paths, load_module
 
 
@@ -23,20 +23,25 @@ LOG: logging.Logger = logging.getLogger(__name__)
 FunctionDefinition = Union[ast.FunctionDef, ast.AsyncFunctionDef]
 
 
-class GlobalModelGenerator(ModelGenerator[Model]):
+class GlobalModelGenerator(FileLocalModelGenerator[Model]):
     def __init__(
         self,
         root: str,
         stub_root: Optional[str] = None,
         blacklisted_globals: Optional[Set[str]] = None,
         blacklisted_global_directories: Optional[Set[str]] = None,
+        number_of_processes: int = 1,
     ) -> None:
         self.root: str = root
+        self.number_of_processes = number_of_processes
         self.stub_root: Final[Optional[str]] = stub_root
         self.blacklisted_globals: Set[str] = (blacklisted_globals or set())
         self.blacklisted_global_directories: Set[str] = (
             blacklisted_global_directories or set()
         )
+        # The roots of every path to model, listed by `paths_to_model` for the
+        # current run and sent to worker processes along with the generator.
+        self._roots_by_path: Dict[str, List[str]] = {}
 
     def _globals(self, root: str, path: str) -> Iterable[Model]:
         globals = set()
@@ -227,14 +232,9 @@ class GlobalModelGenerator(ModelGenerator[Model]):
 
         return models
 
-    def gather_functions_to_model(self) -> Iterable[Callable[..., object]]:
-        return []
-
-    def compute_models(
-        self, functions_to_model: Iterable[Callable[..., object]]
-    ) -> Iterable[Model]:
-        sinks: Set[Model] = set()
-
+    def _paths_with_roots(self) -> Iterator[Tuple[str, str]]:
+        """Yields every path to model along with the root it was found in,
+        which its module is qualified against."""
         for path in find_all_paths(self.root):
             relative_path = os.path.relpath(path, self.root)
             should_skip = any(
@@ -246,15 +246,36 @@ class GlobalModelGenerator(ModelGenerator[Model]):
             if should_skip:
                 LOG.info("Skipping %s", os.path.relpath(path, self.root))
             else:
-                sinks = sinks.union(self._globals(self.root, path))
+                yield self.root, path
 
         stub_root = self.stub_root
         if stub_root is not None:
             stub_root = os.path.abspath(stub_root)
-            paths = glob.glob(stub_root + "/**/*.pyi", recursive=True)
-            for path in paths:
-                sinks = sinks.union(self._globals(stub_root, path))
-        return sinks
+            for path in glob.glob(stub_root + "/**/*.pyi", recursive=True):
+                yield stub_root, path
+
+    def paths_to_model(self) -> Iterable[str]:
+        # A stub found under both roots is listed once, and modeled against
+        # each of them.
+        roots_by_path: Dict[str, List[str]] = {}
+        for root, path in self._paths_with_roots():
+            roots_by_path.setdefault(path, []).append(root)
+        self._roots_by_path = roots_by_path
+        return list(roots_by_path)
+
+    def configuration(self) -> Dict[str, object]:
+        return {
+            "root": self.root,
+            "stub_root": self.stub_root,
+            "blacklisted_globals": self.blacklisted_globals,
+            "blacklisted_global_directories": self.blacklisted_global_directories,
+        }
+
+    def compute_models_for_path(self, path: str) -> Iterable[Model]:
+        models = set()
+        for root in self._roots_by_path.get(path, [self.root]):
+            models.update(self._globals(root, path))
+        return models
 
 
 def _get_self_attribute(target: ast.expr) -> Optional[str]:
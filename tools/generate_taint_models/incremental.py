@@ -0,0 +1,152 @@
+# Copyright (c) 2016-present, Facebook, Inc.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, List, Set
+
+from .model import Model, SerializedModel, model_identity
+from .model_generator import FileLocalModelGenerator
+from .model_writer import open_atomically
+
+
+LOG: logging.Logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 2
+
+# Per-file entry of a manifest: the size, modification time and hash of the file
+# the models were generated from, and the identity and serialization of every
+# model.
+FileEntry = Dict[str, Any]
+
+
+def _file_hash(path: str) -> str:
+    with open(path, "rb") as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+def _encode_configuration(value: object) -> object:
+    """Encodes the values of generator configurations that are not JSON values.
+    Objects are compared by their class and attributes."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    value_class = type(value)
+    return [f"{value_class.__module__}.{value_class.__qualname__}", vars(value)]
+
+
+def _generator_fingerprint(generator: FileLocalModelGenerator[Model]) -> str:
+    """Hashes the class and the configuration of the generator, so models
+    generated with another configuration are not reused."""
+    generator_class = type(generator)
+    return hashlib.sha1(
+        json.dumps(
+            [
+                f"{generator_class.__module__}.{generator_class.__qualname__}",
+                generator.configuration(),
+            ],
+            sort_keys=True,
+            default=_encode_configuration,
+        ).encode()
+    ).hexdigest()
+
+
+def _load_manifest(
+    manifest_path: str, generator: FileLocalModelGenerator[Model]
+) -> Dict[str, FileEntry]:
+    try:
+        with open(manifest_path, "r") as file:
+            manifest = json.load(file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as error:
+        LOG.warning(f"Ignoring invalid manifest `{manifest_path}`: {str(error)}")
+        return {}
+    if (
+        not isinstance(manifest, dict)
+        or manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("generator") != _generator_fingerprint(generator)
+    ):
+        return {}
+    files = manifest.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _write_manifest(
+    manifest_path: str,
+    generator: FileLocalModelGenerator[Model],
+    files: Dict[str, FileEntry],
+) -> None:
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "generator": _generator_fingerprint(generator),
+        "files": files,
+    }
+    with open_atomically(manifest_path) as file:
+        json.dump(manifest, file, sort_keys=True)
+
+
+def generate_models_incrementally(
+    generator: FileLocalModelGenerator[Model], manifest_path: str
+) -> Set[Model]:
+    """Returns the models of `generator`. Only the models of
+    files that were added or changed since the manifest was written are
+    computed again; the models of unchanged files are taken from the manifest.
+    The manifest is updated afterwards, so models of deleted files are dropped.
+    All models are computed again when the configuration of the generator
+    changed."""
+    previous_files = _load_manifest(manifest_path, generator)
+    files: Dict[str, FileEntry] = {}
+    changed_paths: List[str] = []
+    for path in generator.paths_to_model():
+        try:
+            stat = os.stat(path)
+            entry = previous_files.get(path)
+            if (
+                entry is not None
+                and entry.get("size") == stat.st_size
+                and entry.get("mtime_ns") == stat.st_mtime_ns
+            ):
+                files[path] = entry
+                continue
+
+            file_hash = _file_hash(path)
+        except FileNotFoundError:
+            # The file was deleted after the paths were listed.
+            LOG.debug(f"Skipping `{path}`: it no longer exists.")
+            continue
+        files[path] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": file_hash,
+            "models": [],
+        }
+        if entry is not None and entry.get("hash") == file_hash:
+            files[path]["models"] = entry.get("models", [])
+        else:
+            changed_paths.append(path)
+
+    for path, models in generator.compute_models_by_path(changed_paths):
+        files[path]["models"] = [
+            [model_identity(model), str(model)] for model in sorted(set(models))
+        ]
+
+    removed = len(set(previous_files) - set(files))
+    LOG.info(
+        f"Regenerated models for {len(changed_paths)} of {len(files)} files "
+        f"({removed} removed)."
+    )
+    _write_manifest(manifest_path, generator, files)
+    # Like `set(generator.generate_models())`, the first of equal models wins.
+    all_models: Set[Model] = set()
+    for entry in files.values():
+        all_models.update(
+            SerializedModel(identity, serialized)
+            for identity, serialized in entry["models"]
+        )
+    return all_models
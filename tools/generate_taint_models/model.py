@@ -130,24 +130,11 @@ class RawCallableModel(Model):
         )
 
     def __eq__(self, other: object) -> bool:
-        if not isinstance(other, RawCallableModel):
-            return False
-        return (
-            self.callable_name == other.callable_name
-            and self.parameters == other.parameters
-        )
+        return _equal_identities(self, other)
 
     # Need to explicitly define this(despite baseclass) as we are overriding eq
     def __hash__(self) -> int:
-        parameter_names_string = ",".join(
-            map(
-                lambda parameter: f"{parameter.name}:{parameter.annotation}"
-                if parameter.annotation
-                else f"{parameter.name}:_empty",
-                self.parameters,
-            )
-        )
-        return hash((self.callable_name, parameter_names_string))
+        return hash(model_identity(self))
 
 
 class CallableModel(RawCallableModel):
@@ -328,12 +315,10 @@ class AssignmentModel(Model):
         return f"{self.target}: {self.annotation} = ..."
 
     def __eq__(self, other: object) -> bool:
-        if not isinstance(other, AssignmentModel):
-            return False
-        return self.target == other.target
+        return _equal_identities(self, other)
 
     def __hash__(self) -> int:
-        return hash(self.target)
+        return hash(model_identity(self))
 
 
 class ClassModel(Model):
@@ -348,9 +333,49 @@ class ClassModel(Model):
         return f"class {self.class_name}({self.annotation}): ..."
 
     def __eq__(self, other: object) -> bool:
-        if not isinstance(other, ClassModel):
-            return False
-        return self.class_name == other.class_name
+        return _equal_identities(self, other)
+
+    def __hash__(self) -> int:
+        return hash(model_identity(self))
+
+
+class SerializedModel(Model):
+    """A model that only keeps its serialization and identity, e.g. when read
+    back from a manifest. Serialized models compare equal to any model with the
+    same identity, including the model they were serialized from."""
+
+    def __init__(self, identity: str, serialized: str) -> None:
+        self.identity = identity
+        self.serialized = serialized
+
+    def __str__(self) -> str:
+        return self.serialized
+
+    def __eq__(self, other: object) -> bool:
+        return _equal_identities(self, other)
 
     def __hash__(self) -> int:
-        return hash(self.class_name)
+        return hash(self.identity)
+
+
+def model_identity(model: Model) -> str:
+    """Serializes the fields `model` is compared by, so that serialized models
+    are deduplicated like the models they were serialized from."""
+    if isinstance(model, SerializedModel):
+        return model.identity
+    if isinstance(model, RawCallableModel):
+        parameters = ",".join(parameter.name for parameter in model.parameters)
+        return f"callable {model.callable_name}({parameters})"
+    if isinstance(model, AssignmentModel):
+        return f"assignment {model.target}"
+    if isinstance(model, ClassModel):
+        return f"class {model.class_name}"
+    return f"{type(model).__name__} {str(model)}"
+
+
+def _equal_identities(model: Model, other: object) -> bool:
+    # Models and their serializations hash and compare by identity, so that
+    # they deduplicate against each other.
+    if not isinstance(other, Model):
+        return False
+    return model_identity(model) == model_identity(other)
@@ -6,11 +6,24 @@
 # pyre-strict
 
 import logging
+import multiprocessing
 import os
 from abc import ABC, abstractmethod
-from typing import Callable, Generic, Iterable, TypeVar
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-from .model import Model
+from .model import Model, SerializedModel, model_identity
 
 
 LOG: logging.Logger = logging.getLogger(__name__)
@@ -44,3 +57,95 @@ class ModelGenerator(ABC, Generic[T]):
 
     def generate_models(self) -> Iterable[T]:
         return self.compute_models(self.gather_functions_to_model())
+
+
+# Files are handed to worker processes in chunks to amortize communication.
+_CHUNK_SIZE = 16
+
+# The generator used by a worker process, set once when the worker starts.
+_worker_generator: Optional["FileLocalModelGenerator[Model]"] = None
+
+
+def _initialize_worker(generator: "FileLocalModelGenerator[Model]") -> None:
+    global _worker_generator
+    _worker_generator = generator
+
+
+def _compute_models_for_path_in_worker(path: str,) -> Tuple[str, List[Tuple[str, str]]]:
+    generator = _worker_generator
+    assert generator is not None
+    # Models can hold entire syntax trees, so only send back what is needed to
+    # deduplicate and write them.
+    return (
+        path,
+        [
+            (model_identity(model), str(model))
+            for model in generator.compute_models_for_path(path)
+        ],
+    )
+
+
+class FileLocalModelGenerator(ModelGenerator[Union[T, SerializedModel]]):
+    """A generator whose models for a file only depend on the contents of that
+    file. This allows regenerating the models of changed files only, and
+    computing the models of different files in parallel.
+
+    Paths to model are listed by this process before the generator is sent to
+    the worker processes, so state computed for the run while listing them is
+    available to the workers."""
+
+    # Files are processed by a pool of this many processes when it is larger
+    # than one. Models computed by the pool are `SerializedModel`s.
+    number_of_processes: int = 1
+
+    @abstractmethod
+    def paths_to_model(self) -> Iterable[str]:
+        pass
+
+    @abstractmethod
+    def compute_models_for_path(self, path: str) -> Iterable[T]:
+        pass
+
+    @abstractmethod
+    def configuration(self) -> Dict[str, object]:
+        """Everything besides the contents of a file that its models depend on,
+        such as annotation specifications or blacklists. Values are JSON values,
+        sets, or objects, which are compared by their attributes. Models are not
+        reused across configurations."""
+        pass
+
+    def compute_models_by_path(
+        self, paths: Iterable[str]
+    ) -> Iterator[Tuple[str, List[Union[T, SerializedModel]]]]:
+        """Yields the models of each path as soon as they are computed, in no
+        particular order when using multiple processes."""
+        if self.number_of_processes <= 1:
+            for path in paths:
+                yield path, list(self.compute_models_for_path(path))
+            return
+
+        # Generators can run on several threads, which must not be forked.
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(
+            processes=self.number_of_processes,
+            initializer=_initialize_worker,
+            initargs=(self,),
+        ) as pool:
+            for path, models in pool.imap_unordered(
+                _compute_models_for_path_in_worker, paths, chunksize=_CHUNK_SIZE
+            ):
+                yield path, [
+                    SerializedModel(identity, serialized)
+                    for identity, serialized in models
+                ]
+
+    def gather_functions_to_model(self) -> Iterable[Callable[..., object]]:
+        return []
+
+    def compute_models(
+        self, functions_to_model: Iterable[Callable[..., object]]
+    ) -> Iterable[Union[T, SerializedModel]]:
+        models: Set[Union[T, SerializedModel]] = set()
+        for _path, path_models in self.compute_models_by_path(self.paths_to_model()):
+            models.update(path_models)
+        return models
@@ -0,0 +1,91 @@
+# Copyright (c) 2016-present, Facebook, Inc.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import contextlib
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from typing import IO, Iterable, Iterator, List, Set
+
+from .model import Model, model_identity
+
+
+def _default_file_mode() -> int:
+    # The umask can only be read by replacing it, which is not thread-safe, so
+    # it is read once on import.
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# The mode `open` creates files with. Temporary files are only readable by their
+# owner, so files written atomically are given this mode instead.
+DEFAULT_FILE_MODE: int = _default_file_mode()
+
+
+@contextlib.contextmanager
+def open_atomically(path: str) -> Iterator[IO[str]]:
+    """Opens a temporary file next to `path` for writing, and moves it to `path`
+    once the block completes. If the block raises, `path` is left untouched."""
+    directory, filename = os.path.split(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(
+        "w", dir=directory, prefix=f".{filename}.", delete=False
+    ) as output:
+        try:
+            yield output
+        except BaseException:
+            output.close()
+            os.remove(output.name)
+            raise
+    os.chmod(output.name, DEFAULT_FILE_MODE)
+    os.replace(output.name, path)
+
+
+class ModelWriter:
+    """Writes models to `output` as soon as they are generated, skipping models
+    equal to one that was already written.
+
+    Models are written in the order they are generated rather than sorted. Only
+    a digest of the identity of every written model is kept in memory. Writers
+    can be shared between threads."""
+
+    def __init__(self, output: IO[str]) -> None:
+        self.output = output
+        self.count: int = 0
+        self._written: Set[bytes] = set()
+        self._lock = threading.Lock()
+
+    def write(self, model: Model) -> bool:
+        digest = hashlib.sha1(model_identity(model).encode()).digest()
+        with self._lock:
+            if digest in self._written:
+                return False
+            self._written.add(digest)
+            self._write(model)
+            self.count += 1
+        return True
+
+    def _write(self, model: Model) -> None:
+        self.output.write(f"{model}\n")
+
+    def write_all(self, models: Iterable[Model]) -> None:
+        for model in models:
+            self.write(model)
+
+
+class ModelBuffer(ModelWriter):
+    """Keeps the models written to it in memory, in the order they were
+    written, so they can be passed on to another writer later."""
+
+    def __init__(self) -> None:
+        super().__init__(io.StringIO())
+        self.models: List[Model] = []
+
+    def _write(self, model: Model) -> None:
+        self.models.append(model)
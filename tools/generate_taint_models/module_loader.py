@@ -6,25 +6,94 @@
 # pyre-strict
 
 import ast
+import contextlib
 import glob
+import hashlib
 import logging
 import os
-from typing import Iterator, Optional
+import threading
+from typing import Dict, Iterator, Optional, Tuple
 
 
 LOG: logging.Logger = logging.getLogger(__name__)
 
 
+# While `shared_modules` is active, parsed modules are shared by the generators
+# of a run, which mostly load the same files. Trees are keyed by their path and
+# the hash of their source, so edited files are parsed again. The cache belongs
+# to the process: generators computing models in a process pool parse in the
+# workers.
+#
+# Generators walk the files in the same order, so evicting the least recently
+# used tree would evict every tree before it is loaded again. Instead, trees are
+# kept until the sources of cached trees reach `MAXIMUM_CACHED_SOURCE_SIZE`
+# bytes, and further trees are not cached.
+MAXIMUM_CACHED_SOURCE_SIZE: int = 32 * 1024 * 1024
+
+_modules: Dict[str, Tuple[str, int, Optional[ast.Module]]] = {}
+_cached_source_size: int = 0
+_sharing_depth: int = 0
+_lock: threading.Lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def shared_modules() -> Iterator[None]:
+    """Parses every file loaded within the block once, and keeps the trees until
+    the block exits. Generators only read the trees they are given."""
+    global _sharing_depth, _cached_source_size
+    with _lock:
+        _sharing_depth += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _sharing_depth -= 1
+            if _sharing_depth == 0:
+                _modules.clear()
+                _cached_source_size = 0
+
+
+def _parse(module_path: str, source: str) -> Optional[ast.Module]:
+    try:
+        parsed = ast.parse(source)
+    except SyntaxError as error:
+        LOG.warning(f"Could not load `{module_path}`: {str(error)}")
+        return None
+    if not isinstance(parsed, ast.Module):
+        return None
+    return parsed
+
+
 def load_module(module_path: str) -> Optional[ast.Module]:
     try:
         with open(module_path, "r") as file:
-            parsed = ast.parse(file.read())
-            if not isinstance(parsed, ast.Module):
-                return None
-            return parsed
-    except (FileNotFoundError, SyntaxError) as error:
+            source = file.read()
+    except FileNotFoundError as error:
         LOG.warning(f"Could not load `{module_path}`: {str(error)}")
-    return None
+        return None
+    if _sharing_depth == 0:
+        return _parse(module_path, source)
+    return _load_shared_module(module_path, source)
+
+
+def _load_shared_module(module_path: str, source: str) -> Optional[ast.Module]:
+    global _cached_source_size
+    source_hash = hashlib.sha1(source.encode()).hexdigest()
+    with _lock:
+        cached = _modules.get(module_path)
+    if cached is not None and cached[0] == source_hash:
+        return cached[2]
+
+    module = _parse(module_path, source)
+    size = len(source)
+    with _lock:
+        previous = _modules.pop(module_path, None)
+        if previous is not None:
+            _cached_source_size -= previous[1]
+        if _cached_source_size + size <= MAXIMUM_CACHED_SOURCE_SIZE:
+            _modules[module_path] = (source_hash, size, module)
+            _cached_source_size += size
+    return module
 
 
 def find_all_paths(root: str) -> Iterator[str]:
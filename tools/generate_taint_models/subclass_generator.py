@@ -15,13 +15,22 @@ from ...api.query import ClassHierarchy
 
 LOG: logging.Logger = logging.getLogger(__name__)
 
+# Number of `defines` queries that are sent to the server at the same time.
+_DEFINES_NUMBER_OF_WORKERS = 4
+
 
 def _flatten_subclass_tree(target: str, class_hierarchy: ClassHierarchy) -> Set[str]:
-    subclasses = class_hierarchy.subclasses(target) or []
-    flattened_subclasses = set()
-    for subclass in subclasses:
-        subsubclasses = _flatten_subclass_tree(subclass, class_hierarchy)
-        flattened_subclasses = flattened_subclasses | {subclass} | subsubclasses
+    # Walk the reverse hierarchy with an explicit stack: every class is visited
+    # once, even when it is reachable through several bases, and deep
+    # hierarchies cannot exhaust the recursion limit.
+    reverse_hierarchy = class_hierarchy.reverse_hierarchy
+    flattened_subclasses: Set[str] = set()
+    stack = [target]
+    while stack:
+        for subclass in reverse_hierarchy.get(stack.pop()) or []:
+            if subclass not in flattened_subclasses:
+                flattened_subclasses.add(subclass)
+                stack.append(subclass)
     return flattened_subclasses
 
 
@@ -53,7 +62,12 @@ def get_all_subclass_defines_from_pyre(
 
     if subclasses is not None:
         return {
-            target: query.defines(pyre_connection, subclasses[target], batch_size=500)
+            target: query.defines(
+                pyre_connection,
+                subclasses[target],
+                batch_size=500,
+                number_of_workers=_DEFINES_NUMBER_OF_WORKERS,
+            )
             for target in subclasses.keys()
         }
     else:
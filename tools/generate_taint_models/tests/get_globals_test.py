@@ -6,6 +6,8 @@
 # pyre-unsafe
 
 import os  # noqa
+import pickle
+import tempfile
 import textwrap
 import unittest
 from typing import IO, Any, Callable, Dict, Iterable, Optional, Set
@@ -318,3 +320,71 @@ class GetGlobalsTest(unittest.TestCase):
                 "Via[cached_class_property]]: ..."
             },
         )
+
+    def test_compute_models_in_processes(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            for index in range(40):
+                with open(os.path.join(root, f"module{index}.py"), "w") as file:
+                    file.write(f"x = {index}\ny: int = {index}\n")
+            expected = {
+                f"module{index}.{name}: TaintSink[Global] = ..."
+                for index in range(40)
+                for name in ["x", "y"]
+            }
+            models = GlobalModelGenerator(
+                root=root, number_of_processes=2
+            ).compute_models([])
+            self.assertSetEqual({str(model) for model in models}, expected)
+
+    def test_compute_models_with_stub_root_in_root(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            stub_root = os.path.join(root, "stubs")
+            os.mkdir(stub_root)
+            for path, source in [
+                ("a.py", "x = 1\n"),
+                ("stubs/b.pyi", "y = 1\n"),
+                ("stubs/c.py", "z = 1\n"),
+            ]:
+                with open(os.path.join(root, path), "w") as file:
+                    file.write(source)
+            models = GlobalModelGenerator(
+                root=root, stub_root=stub_root
+            ).compute_models([])
+            # Sources under the stub root are qualified against the root they
+            # were found in.
+            self.assertSetEqual(
+                {str(model) for model in models},
+                {
+                    "a.x: TaintSink[Global] = ...",
+                    "b.y: TaintSink[Global] = ...",
+                    "stubs.c.z: TaintSink[Global] = ...",
+                },
+            )
+
+    def test_paths_to_model(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            stub_root = os.path.join(root, "stubs")
+            os.mkdir(stub_root)
+            for path in ["a.py", "stubs/b.pyi"]:
+                with open(os.path.join(root, path), "w") as file:
+                    file.write("x = 1\n")
+            generator = GlobalModelGenerator(root=root, stub_root=stub_root)
+            self.assertEqual(len(generator.paths_to_model()), 2)
+
+            # Roots are listed again on every run, and sent to worker processes
+            # along with the generator.
+            with open(os.path.join(stub_root, "c.pyi"), "w") as file:
+                file.write("y = 1\n")
+            self.assertEqual(len(generator.paths_to_model()), 3)
+            generator = pickle.loads(pickle.dumps(generator))
+            with patch.object(generator, "_paths_with_roots") as paths_with_roots:
+                self.assertSetEqual(
+                    {
+                        str(model)
+                        for model in generator.compute_models_for_path(
+                            os.path.join(stub_root, "c.pyi")
+                        )
+                    },
+                    {"c.y: TaintSink[Global] = ..."},
+                )
+                paths_with_roots.assert_not_called()
@@ -515,3 +515,24 @@ class ModelTest(unittest.TestCase):
         # Checking for 'model_2' despite putting in 'model_1' is deliberate; we
         # are testing the effectiveness of the hash equivalence
         self.assertIn(model_2, test_set)
+
+    def test_serialized_model(self) -> None:
+        assignment = model.AssignmentModel(annotation="TaintSink[A]", target="a.x")
+        class_model = model.ClassModel(class_name="a.C", annotation="TaintSource[A]")
+        serialized = [
+            model.SerializedModel(model.model_identity(original), str(original))
+            for original in [assignment, class_model]
+        ]
+        self.assertEqual(serialized[0], assignment)
+        self.assertEqual(assignment, serialized[0])
+        self.assertNotEqual(serialized[0], class_model)
+        self.assertNotEqual(serialized[0], "a.x: TaintSink[A] = ...")
+
+        # Serialized models deduplicate against the models they were serialized
+        # from, e.g. when models of an incremental run are combined with others.
+        models = {
+            model.AssignmentModel(annotation="TaintSink[B]", target="a.x"),
+            class_model,
+        }
+        models = models.union(serialized)
+        self.assertEqual(len(models), 2)
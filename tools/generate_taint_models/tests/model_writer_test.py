@@ -0,0 +1,51 @@
+# Copyright (c) 2016-present, Facebook, Inc.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-unsafe
+
+import io
+import os
+import stat
+import tempfile
+import unittest
+
+from ..model import AssignmentModel
+from ..model_writer import DEFAULT_FILE_MODE, ModelWriter, open_atomically
+
+
+class ModelWriterTest(unittest.TestCase):
+    def test_write(self) -> None:
+        output = io.StringIO()
+        writer = ModelWriter(output)
+        writer.write_all(
+            [
+                AssignmentModel(annotation="TaintSink[A]", target="a.x"),
+                AssignmentModel(annotation="TaintSink[B]", target="a.x"),
+                AssignmentModel(annotation="TaintSink[A]", target="a.y"),
+            ]
+        )
+        self.assertEqual(
+            output.getvalue(), "a.x: TaintSink[A] = ...\na.y: TaintSink[A] = ...\n",
+        )
+        self.assertEqual(writer.count, 2)
+        # Only digests of written models are kept.
+        self.assertTrue(all(isinstance(digest, bytes) for digest in writer._written))
+
+    def test_open_atomically(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "models.pysa")
+            with open_atomically(path) as output:
+                output.write("a.x: TaintSink[A] = ...\n")
+            with open(path) as file:
+                self.assertEqual(file.read(), "a.x: TaintSink[A] = ...\n")
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), DEFAULT_FILE_MODE)
+
+            with self.assertRaises(RuntimeError):
+                with open_atomically(path) as output:
+                    output.write("a.y: TaintSink[A] = ...\n")
+                    raise RuntimeError("Generation failed")
+            self.assertEqual(os.listdir(directory), ["models.pysa"])
+            with open(path) as file:
+                self.assertEqual(file.read(), "a.x: TaintSink[A] = ...\n")
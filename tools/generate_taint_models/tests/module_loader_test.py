@@ -84,3 +84,44 @@ class ModuleLoaderTest(unittest.TestCase):
                 sorted([str(no_nest), str(one_nest), str(many_nest), str(pyi_file)]),
                 sorted(module_loader.find_all_paths(directory_name)),
             )
+
+    def test_shared_modules(self) -> None:
+        with tempfile.TemporaryDirectory() as directory_name:
+            path = Path(directory_name) / "module.py"
+            path.write_text("def my_function():\n    pass\n")
+            copy = Path(directory_name) / "copy.py"
+            copy.write_text("def my_function():\n    pass\n")
+
+            # Modules are only shared within `shared_modules`.
+            module = module_loader.load_module(str(path))
+            self.assertIsNot(module_loader.load_module(str(path)), module)
+
+            with module_loader.shared_modules():
+                module = module_loader.load_module(str(path))
+                self.assertIsNotNone(module)
+                self.assertIs(module_loader.load_module(str(path)), module)
+                # Files with the same source do not share their tree.
+                self.assertIsNot(module_loader.load_module(str(copy)), module)
+
+                # Changed files are parsed again.
+                path.write_text("def other_function():\n    pass\n")
+                changed = module_loader.load_module(str(path))
+                # pyre-ignore[16]: Optional type has no attribute body.
+                self.assertEqual(changed.body[0].name, "other_function")
+            self.assertEqual(module_loader._modules, {})
+
+    def test_shared_modules_bounded(self) -> None:
+        with tempfile.TemporaryDirectory() as directory_name:
+            first = Path(directory_name) / "first.py"
+            first.write_text("x = 1\n")
+            second = Path(directory_name) / "second.py"
+            second.write_text("y = 2\n")
+
+            with patch.object(module_loader, "MAXIMUM_CACHED_SOURCE_SIZE", 8):
+                with module_loader.shared_modules():
+                    module = module_loader.load_module(str(first))
+                    # Once the cache is full, trees are no longer cached.
+                    other = module_loader.load_module(str(second))
+                    self.assertIsNot(module_loader.load_module(str(second)), other)
+                    self.assertIs(module_loader.load_module(str(first)), module)
+                    self.assertEqual(list(module_loader._modules), [str(first)])
@@ -0,0 +1,464 @@
+# Copyright (c) 2016-present, Facebook, Inc.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-unsafe
+
+import io
+import os
+import stat
+import tempfile
+import threading
+import unittest
+from typing import Callable, Dict, Iterable, List
+from unittest.mock import MagicMock, patch
+
+from ....api import query
+from ....api.connection import PyreConnection
+from .. import GenerationArguments, module_loader, run_from_parsed_arguments
+from ..get_annotated_free_functions_with_decorator import (
+    AnnotatedFreeFunctionWithDecoratorGenerator,
+)
+from ..get_globals import GlobalModelGenerator
+from ..model import AssignmentModel
+from ..model_generator import FileLocalModelGenerator, ModelGenerator
+from ..model_writer import DEFAULT_FILE_MODE
+
+
+class BarrierGenerator(ModelGenerator[AssignmentModel]):
+    """Only finishes once all generators sharing the barrier are running."""
+
+    def __init__(self, barrier: threading.Barrier, targets: List[str]) -> None:
+        self.barrier = barrier
+        self.targets = targets
+
+    def gather_functions_to_model(self) -> Iterable[Callable[..., object]]:
+        return []
+
+    def compute_models(
+        self, functions_to_model: Iterable[Callable[..., object]]
+    ) -> Iterable[AssignmentModel]:
+        self.barrier.wait(timeout=5)
+        return [
+            AssignmentModel(annotation="TaintSink[Test]", target=target)
+            for target in self.targets
+        ]
+
+
+class QueryingGenerator(BarrierGenerator):
+    def __init__(
+        self,
+        barrier: threading.Barrier,
+        targets: List[str],
+        pyre_connection: PyreConnection,
+    ) -> None:
+        super().__init__(barrier, targets)
+        self.pyre_connection = pyre_connection
+
+    def compute_models(
+        self, functions_to_model: Iterable[Callable[..., object]]
+    ) -> Iterable[AssignmentModel]:
+        assert self.pyre_connection.server_initialized
+        return super().compute_models(functions_to_model)
+
+
+class FailingGenerator(BarrierGenerator):
+    def compute_models(
+        self, functions_to_model: Iterable[Callable[..., object]]
+    ) -> Iterable[AssignmentModel]:
+        yield from super().compute_models(functions_to_model)
+        raise RuntimeError("Generation failed")
+
+
+class FileNameGenerator(FileLocalModelGenerator[AssignmentModel]):
+    """Models the lines of every file in a directory as globals. Lines contain a
+    target, optionally followed by its annotation."""
+
+    def __init__(self, root: str, annotation: str = "TaintSink[Test]") -> None:
+        self.root = root
+        self.annotation = annotation
+        self.computed_paths: List[str] = []
+
+    def paths_to_model(self) -> Iterable[str]:
+        return [os.path.join(self.root, path) for path in os.listdir(self.root)]
+
+    def compute_models_for_path(self, path: str) -> Iterable[AssignmentModel]:
+        self.computed_paths.append(os.path.basename(path))
+        with open(path) as file:
+            models = []
+            for line in file:
+                target, _, annotation = line.strip().partition(" ")
+                models.append(
+                    AssignmentModel(
+                        annotation=annotation or self.annotation, target=target
+                    )
+                )
+            return models
+
+    def configuration(self) -> Dict[str, object]:
+        return {"root": self.root, "annotation": self.annotation}
+
+
+class RunFromParsedArgumentsTest(unittest.TestCase):
+    def test_modes_run_concurrently(self) -> None:
+        barrier = threading.Barrier(2)
+        generator_options = {
+            "get_first": BarrierGenerator(barrier, ["a.y", "a.x"]),
+            "second": BarrierGenerator(barrier, ["b.x"]),
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            run_from_parsed_arguments(
+                generator_options,
+                GenerationArguments(
+                    mode=None,
+                    verbose=False,
+                    output_directory=directory,
+                    number_of_workers=2,
+                ),
+                default_modes=["get_first", "second"],
+            )
+            self.assertEqual(
+                sorted(os.listdir(directory)),
+                ["generated_first.pysa", "generated_second.pysa"],
+            )
+            with open(os.path.join(directory, "generated_first.pysa")) as output:
+                self.assertEqual(
+                    output.read(),
+                    "a.x: TaintSink[Test] = ...\na.y: TaintSink[Test] = ...\n",
+                )
+            with open(os.path.join(directory, "generated_second.pysa")) as output:
+                self.assertEqual(output.read(), "b.x: TaintSink[Test] = ...\n")
+
+    def test_server_started_once(self) -> None:
+        pyre_connection = MagicMock(spec=PyreConnection)
+        pyre_connection.server_initialized = False
+
+        def start_server() -> None:
+            pyre_connection.server_initialized = True
+
+        pyre_connection.start_server.side_effect = start_server
+        barrier = threading.Barrier(2)
+        generator_options = {
+            "get_first": QueryingGenerator(barrier, ["a.x"], pyre_connection),
+            "second": QueryingGenerator(barrier, ["b.x"], pyre_connection),
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            run_from_parsed_arguments(
+                generator_options,
+                GenerationArguments(
+                    mode=None,
+                    verbose=False,
+                    output_directory=directory,
+                    number_of_workers=2,
+                ),
+                default_modes=["get_first", "second"],
+            )
+        pyre_connection.start_server.assert_called_once_with()
+
+    def test_incremental(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            with tempfile.TemporaryDirectory() as directory:
+
+                def write(name: str, content: str) -> None:
+                    with open(os.path.join(root, name), "w") as file:
+                        file.write(content)
+
+                def generate() -> List[str]:
+                    generator.computed_paths = []
+                    run_from_parsed_arguments(
+                        {"get_names": generator},
+                        GenerationArguments(
+                            mode=None,
+                            verbose=False,
+                            output_directory=directory,
+                            incremental=True,
+                        ),
+                        default_modes=["get_names"],
+                    )
+                    with open(
+                        os.path.join(directory, "generated_names.pysa")
+                    ) as output:
+                        return output.read().splitlines()
+
+                generator = FileNameGenerator(root)
+                write("a.py", "a.x\na.y\n")
+                write("b.py", "b.x\n")
+                self.assertEqual(
+                    generate(),
+                    [
+                        "a.x: TaintSink[Test] = ...",
+                        "a.y: TaintSink[Test] = ...",
+                        "b.x: TaintSink[Test] = ...",
+                    ],
+                )
+                self.assertEqual(sorted(generator.computed_paths), ["a.py", "b.py"])
+                manifest = os.path.join(directory, ".generated_names.manifest.json")
+                self.assertEqual(
+                    stat.S_IMODE(os.stat(manifest).st_mode), DEFAULT_FILE_MODE
+                )
+
+                # Nothing changed.
+                self.assertEqual(len(generate()), 3)
+                self.assertEqual(generator.computed_paths, [])
+
+                # Only changed and new files are modeled again.
+                write("a.py", "a.z\n")
+                write("c.py", "c.x\n")
+                os.remove(os.path.join(root, "b.py"))
+                self.assertEqual(
+                    generate(),
+                    ["a.z: TaintSink[Test] = ...", "c.x: TaintSink[Test] = ..."],
+                )
+                self.assertEqual(sorted(generator.computed_paths), ["a.py", "c.py"])
+
+                # All files are modeled again once the configuration changes.
+                generator = FileNameGenerator(root, annotation="TaintSink[Other]")
+                self.assertEqual(
+                    generate(),
+                    ["a.z: TaintSink[Other] = ...", "c.x: TaintSink[Other] = ..."],
+                )
+                self.assertEqual(sorted(generator.computed_paths), ["a.py", "c.py"])
+
+    def test_incremental_deduplicates_models(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            with tempfile.TemporaryDirectory() as directory:
+
+                def generate(incremental: bool) -> List[str]:
+                    run_from_parsed_arguments(
+                        {"get_names": FileNameGenerator(root)},
+                        GenerationArguments(
+                            mode=None,
+                            verbose=False,
+                            output_directory=directory,
+                            incremental=incremental,
+                        ),
+                        default_modes=["get_names"],
+                    )
+                    with open(
+                        os.path.join(directory, "generated_names.pysa")
+                    ) as output:
+                        return output.read().splitlines()
+
+                # Models of the same target are equal, whatever their annotation.
+                for name, annotation in [("a.py", "TaintSink[A]"), ("b.py", "")]:
+                    with open(os.path.join(root, name), "w") as file:
+                        file.write(f"a.x {annotation}\na.y\n")
+                expected = generate(incremental=False)
+                self.assertEqual(len(expected), 2)
+                self.assertEqual(generate(incremental=True), expected)
+                # Models read back from the manifest are deduplicated alike.
+                self.assertEqual(generate(incremental=True), expected)
+
+    def test_incremental_skips_deleted_files(self) -> None:
+        class DeletingGenerator(FileNameGenerator):
+            def paths_to_model(self) -> Iterable[str]:
+                paths = super().paths_to_model()
+                # Deleted after the paths were listed.
+                os.remove(os.path.join(self.root, "b.py"))
+                return paths
+
+        with tempfile.TemporaryDirectory() as root:
+            with tempfile.TemporaryDirectory() as directory:
+                for name in ["a.py", "b.py"]:
+                    with open(os.path.join(root, name), "w") as file:
+                        file.write(f"{name[0]}.x\n")
+                generator = DeletingGenerator(root)
+                run_from_parsed_arguments(
+                    {"get_names": generator},
+                    GenerationArguments(
+                        mode=None,
+                        verbose=False,
+                        output_directory=directory,
+                        incremental=True,
+                    ),
+                    default_modes=["get_names"],
+                )
+                self.assertEqual(generator.computed_paths, ["a.py"])
+                with open(os.path.join(directory, "generated_names.pysa")) as output:
+                    self.assertEqual(output.read(), "a.x: TaintSink[Test] = ...\n")
+
+    def test_number_of_processes(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            with tempfile.TemporaryDirectory() as directory:
+                for index in range(3):
+                    with open(os.path.join(root, f"m{index}.py"), "w") as file:
+                        file.write(f"m{index}.x TaintSink[A]\nm{index}.x\n")
+                generator = FileNameGenerator(root)
+                run_from_parsed_arguments(
+                    {"get_names": generator},
+                    GenerationArguments(
+                        mode=None,
+                        verbose=False,
+                        output_directory=directory,
+                        number_of_processes=2,
+                    ),
+                    default_modes=["get_names"],
+                )
+                self.assertEqual(generator.number_of_processes, 2)
+                with open(os.path.join(directory, "generated_names.pysa")) as output:
+                    self.assertEqual(
+                        [line.split(":")[0] for line in output.read().splitlines()],
+                        ["m0.x", "m1.x", "m2.x"],
+                    )
+
+    def test_stream_output(self) -> None:
+        generator_options = {
+            "get_first": BarrierGenerator(threading.Barrier(1), ["a.y", "a.x", "a.y"]),
+            "second": BarrierGenerator(threading.Barrier(1), ["b.x"]),
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            run_from_parsed_arguments(
+                generator_options,
+                GenerationArguments(
+                    mode=None,
+                    verbose=False,
+                    output_directory=directory,
+                    stream_output=True,
+                ),
+                default_modes=["get_first", "second"],
+            )
+            # Models are written in the order they are generated, without
+            # duplicates.
+            with open(os.path.join(directory, "generated_first.pysa")) as output:
+                self.assertEqual(
+                    output.read(),
+                    "a.y: TaintSink[Test] = ...\na.x: TaintSink[Test] = ...\n",
+                )
+            with open(os.path.join(directory, "generated_second.pysa")) as output:
+                self.assertEqual(output.read(), "b.x: TaintSink[Test] = ...\n")
+
+            # Failed runs leave previous outputs untouched.
+            generator_options["get_first"] = FailingGenerator(
+                threading.Barrier(1), ["a.z"]
+            )
+            with self.assertRaises(RuntimeError):
+                run_from_parsed_arguments(
+                    generator_options,
+                    GenerationArguments(
+                        mode=None,
+                        verbose=False,
+                        output_directory=directory,
+                        stream_output=True,
+                    ),
+                    default_modes=["get_first"],
+                )
+            self.assertEqual(
+                sorted(os.listdir(directory)),
+                ["generated_first.pysa", "generated_second.pysa"],
+            )
+            with open(os.path.join(directory, "generated_first.pysa")) as output:
+                self.assertEqual(
+                    output.read(),
+                    "a.y: TaintSink[Test] = ...\na.x: TaintSink[Test] = ...\n",
+                )
+
+    def test_stream_output_to_standard_output(self) -> None:
+        class OrderedGenerator(BarrierGenerator):
+            def __init__(
+                self,
+                targets: List[str],
+                wait: threading.Event,
+                done: threading.Event,
+            ) -> None:
+                super().__init__(threading.Barrier(1), targets)
+                self.wait = wait
+                self.done = done
+
+            def compute_models(
+                self, functions_to_model: Iterable[Callable[..., object]]
+            ) -> Iterable[AssignmentModel]:
+                self.wait.wait(timeout=5)
+                yield from super().compute_models(functions_to_model)
+                self.done.set()
+
+        # The second mode finishes before the first one starts.
+        started = threading.Event()
+        second_done = threading.Event()
+        started.set()
+        generator_options = {
+            "get_first": OrderedGenerator(
+                ["a.y", "b.x"], second_done, threading.Event()
+            ),
+            "second": OrderedGenerator(["b.x", "c.x"], started, second_done),
+        }
+        with patch("sys.stdout", new_callable=io.StringIO) as output:
+            run_from_parsed_arguments(
+                generator_options,
+                GenerationArguments(
+                    mode=None,
+                    verbose=False,
+                    output_directory=None,
+                    number_of_workers=2,
+                    stream_output=True,
+                ),
+                default_modes=["get_first", "second"],
+            )
+        # Models are written in the order of the modes, without duplicates.
+        self.assertEqual(
+            output.getvalue(),
+            "a.y: TaintSink[Test] = ...\n"
+            "b.x: TaintSink[Test] = ...\n"
+            "c.x: TaintSink[Test] = ...\n",
+        )
+
+    @patch.object(query, "set_snapshot_cache")
+    def test_query_cache(self, set_snapshot_cache: MagicMock) -> None:
+        generator_options = {"get_first": BarrierGenerator(threading.Barrier(1), [])}
+        with tempfile.TemporaryDirectory() as directory:
+            run_from_parsed_arguments(
+                generator_options,
+                GenerationArguments(
+                    mode=None,
+                    verbose=False,
+                    output_directory=None,
+                    query_cache_directory=directory,
+                ),
+                default_modes=["get_first"],
+            )
+            [(cache,), _] = set_snapshot_cache.call_args
+            self.assertEqual(cache.directory, directory)
+            self.assertIsNone(cache.key)
+
+            run_from_parsed_arguments(
+                generator_options,
+                GenerationArguments(
+                    mode=None,
+                    verbose=False,
+                    output_directory=None,
+                    query_cache_directory=directory,
+                    query_cache_key="revision",
+                ),
+                default_modes=["get_first"],
+            )
+            [(cache,), _] = set_snapshot_cache.call_args
+            self.assertEqual(cache.directory, directory)
+            self.assertEqual(cache.key, "revision")
+
+    def test_modules_shared_across_generators(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            # More modules than an LRU cache of parsed modules would keep.
+            number_of_modules = 1100
+            for index in range(number_of_modules):
+                with open(os.path.join(root, f"m{index}.py"), "w") as file:
+                    file.write(f"x{index} = {index}\n")
+            with patch.object(
+                module_loader, "_parse", wraps=module_loader._parse
+            ) as parse:
+                run_from_parsed_arguments(
+                    {
+                        "get_globals": GlobalModelGenerator(root),
+                        "get_decorated": AnnotatedFreeFunctionWithDecoratorGenerator(
+                            root, annotation_specifications=[]
+                        ),
+                    },
+                    GenerationArguments(
+                        mode=None,
+                        verbose=False,
+                        output_directory=root,
+                        number_of_workers=1,
+                    ),
+                    default_modes=["get_globals", "get_decorated"],
+                )
+            self.assertEqual(parse.call_count, number_of_modules)
+            self.assertEqual(module_loader._modules, {})
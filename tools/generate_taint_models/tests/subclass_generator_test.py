@@ -50,6 +50,34 @@ class SubclassGeneratorTest(unittest.TestCase):
             {"WantedParent": ["GrandChild", "WantedChild1", "WantedChild2"]},
         )
 
+    def test_flatten_subclass_tree(self) -> None:
+        # A diamond below `Base`, followed by a chain deeper than the recursion
+        # limit.
+        hierarchy = {
+            "Base": ["object"],
+            "Left": ["Base"],
+            "Right": ["Base"],
+            "Bottom": ["Left", "Right"],
+            "Chain0": ["Bottom"],
+            "object": [],
+        }
+        for index in range(1, 5000):
+            hierarchy[f"Chain{index}"] = [f"Chain{index - 1}"]
+        class_hierarchy = query.ClassHierarchy(hierarchy)
+
+        subclasses = subclass_generator._flatten_subclass_tree("Base", class_hierarchy)
+        self.assertEqual(len(subclasses), 5003)
+        self.assertTrue({"Left", "Right", "Bottom", "Chain4999"} <= subclasses)
+        self.assertNotIn("Base", subclasses)
+        self.assertEqual(
+            subclass_generator._flatten_subclass_tree("Chain4998", class_hierarchy),
+            {"Chain4999"},
+        )
+        self.assertEqual(
+            subclass_generator._flatten_subclass_tree("Unknown", class_hierarchy),
+            set(),
+        )
+
     @patch.object(query, "defines")
     # pyre-fixme[56]: Argument
     #  `tools.pyre.tools.generate_taint_models.subclass_generator` to decorator factory
@@ -5,17 +5,24 @@
 
 # pyre-strict
 
+import fnmatch
 import json
 import os
-from glob import glob
 from pathlib import Path
-from typing import IO, Any, Dict, Iterable, NamedTuple, Optional
+from typing import IO, Any, Dict, Iterable, NamedTuple, Optional, Tuple
 
-from .sharded_files import ShardedFile
+from .sharded_files import ShardedFile, list_directory, store_in_cache
 
 
 METADATA_GLOB = "*metadata.json"
 
+# Parsed metadata by absolute directory, along with the (path, mtime, size) of
+# the files it was read from.
+# pyre-fixme[4]: Attribute annotation cannot contain `Any`.
+_metadata_cache: Dict[
+    str, Tuple[Tuple[Tuple[str, int, int], ...], Dict[str, Any]]
+] = {}
+
 
 # pyre-fixme[2]: Parameter annotation cannot contain `Any`.
 class Metadata(NamedTuple):
@@ -97,10 +104,7 @@ class AnalysisOutput(object):
 
     @classmethod
     def from_directory(cls, directory: str) -> "AnalysisOutput":
-        metadata = {}
-        for file in glob(os.path.join(directory, METADATA_GLOB)):
-            with open(file) as f:
-                metadata.update(json.load(f))
+        metadata = _load_metadata(directory)
 
         # Note: filename_spec takes precedence over filename_glob.
         filename_spec = None
@@ -197,3 +201,30 @@ class AnalysisOutput(object):
             return "@" in self.filename_spec
         else:
             return False
+
+
+def _file_stamp(file: str) -> Tuple[str, int, int]:
+    stat = os.stat(file)
+    return (file, stat.st_mtime_ns, stat.st_size)
+
+
+# pyre-fixme[3]: Return annotation cannot contain `Any`.
+def _load_metadata(directory: str) -> Dict[str, Any]:
+    files = sorted(
+        os.path.join(directory, name)
+        for name in fnmatch.filter(list_directory(directory), METADATA_GLOB)
+        # Like glob, ignore hidden files.
+        if not name.startswith(".")
+    )
+    stamp = tuple(_file_stamp(file) for file in files)
+    key = os.path.abspath(directory)
+    cached = _metadata_cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    metadata = {}
+    for file in files:
+        with open(file) as f:
+            metadata.update(json.load(f))
+    store_in_cache(_metadata_cache, key, (stamp, metadata))
+    return metadata
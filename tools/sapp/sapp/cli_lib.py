@@ -3,8 +3,10 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import json
 import logging
 import os
+import sys
 from functools import wraps
 from typing import Optional
 
@@ -16,16 +18,19 @@ from traitlets.config import Config
 
 from .analysis_output import AnalysisOutput
 from .application import start_app
+from .columnar_exporter import ColumnarExporter
 from .context import Context, pass_context
 from .create_database import CreateDatabase
 from .database_saver import DatabaseSaver
 from .db import DB
+from .errors import AIException
 from .extensions import prompt_extension
 from .filesystem import find_root
 from .interactive import Interactive
 from .model_generator import ModelGenerator
 from .models import PrimaryKeyGenerator
 from .pipeline import Pipeline
+from .run_diff import diff_runs
 from .trim_trace_graph import TrimTraceGraph
 
 
@@ -149,6 +154,11 @@ def explore(ctx: Context, ipython_args):
     is_flag=True,
     help="store pre/post conditions unrelated to an issue",
 )
+@option(
+    "--export-directory",
+    type=Path(file_okay=False),
+    help="also export the run as Parquet files to this directory",
+)
 @argument("input_file", type=Path(exists=True))
 def analyze(
     ctx: Context,
@@ -161,6 +171,7 @@ def analyze(
     previous_input,
     linemap,
     store_unused_models,
+    export_directory,
     input_file,
 ):
     # Store all options in the right places
@@ -191,9 +202,14 @@ def analyze(
         CreateDatabase(ctx.database),
         ModelGenerator(),
         TrimTraceGraph(),
-        # pyre-fixme[6]: Expected `bool` for 2nd param but got `PrimaryKeyGenerator`.
-        DatabaseSaver(ctx.database, PrimaryKeyGenerator()),
     ]
+    if export_directory:
+        try:
+            pipeline_steps.append(ColumnarExporter(export_directory))
+        except AIException as error:
+            raise click.BadParameter(str(error), param_hint="--export-directory")
+    # pyre-fixme[6]: Expected `bool` for 2nd param but got `PrimaryKeyGenerator`.
+    pipeline_steps.append(DatabaseSaver(ctx.database, PrimaryKeyGenerator()))
     # pyre-fixme[6]: Expected
     #  `List[tools.sapp.sapp.pipeline.PipelineStep[typing.Any, typing.Any]]` for 1st
     #  param but got `List[typing.Union[DatabaseSaver, ModelGenerator, TrimTraceGraph,
@@ -202,6 +218,28 @@ def analyze(
     pipeline.run(input_files, summary_blob)
 
 
+@click.command(help="compare the issues of two runs")
+@pass_context
+@option("--base-run-id", type=int, required=True, help="run to compare against")
+@option("--run-id", type=int, required=True, help="run to compare")
+@option(
+    "--fail-on-new",
+    is_flag=True,
+    help="exit with a non-zero status if the run introduces new issues",
+)
+def diff(ctx: Context, base_run_id: int, run_id: int, fail_on_new: bool):
+    with ctx.database.make_session() as session:
+        run_diff = diff_runs(session, base_run_id, run_id)
+
+    logger.info(
+        f"{len(run_diff.new)} new, {len(run_diff.fixed)} fixed, "
+        f"{len(run_diff.persisting)} persisting issues"
+    )
+    click.echo(json.dumps(run_diff._asdict()))
+    if fail_on_new and run_diff.new:
+        sys.exit(1)
+
+
 @click.command(
     help="backend flask server for exploration of issues",
     context_settings={"ignore_unknown_options": True},
@@ -211,4 +249,4 @@ def server(ctx: Context):
     start_app(ctx.database)
 
 
-commands = [analyze, explore, server]
+commands = [analyze, diff, explore, server]
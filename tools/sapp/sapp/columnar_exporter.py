@@ -0,0 +1,194 @@
+# Copyright (c) 2016-present, Facebook, Inc.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Export the trace graph of a run to Parquet files for offline analytics"""
+
+import logging
+import os
+from typing import Any, Dict, List, Tuple
+
+from . import errors
+from .pipeline import PipelineStep, Summary
+from .trace_graph import TraceGraph
+
+
+try:
+    import pyarrow
+    import pyarrow.parquet as parquet
+except ImportError:
+    pyarrow = None
+    parquet = None
+
+
+log = logging.getLogger("sapp")
+
+Columns = Dict[str, List[Any]]
+
+
+class ColumnarExporter(PipelineStep[TraceGraph, TraceGraph]):
+    """Writes one compressed Parquet file per table of the trace graph into
+    `output_directory`, and passes the graph through unchanged.
+
+    Rows are denormalized (shared texts are inlined), so aggregate queries do
+    not need to join against the messages table. Identifiers of issue
+    instances and trace frames are local to the run and only meant to join the
+    exported tables with each other. Information about the run is stored in the
+    metadata of every file.
+    """
+
+    def __init__(self, output_directory: str, compression: str = "zstd") -> None:
+        super().__init__()
+        if pyarrow is None:
+            raise errors.AIException(
+                "Exporting runs requires `pyarrow`. Install the `export` extra "
+                "(`pip install sapp[export]`) or run `pip install pyarrow`."
+            )
+        self.output_directory = output_directory
+        self.compression = compression
+
+    def run(self, input: TraceGraph, summary: Summary) -> Tuple[TraceGraph, Summary]:
+        graph = input
+        os.makedirs(self.output_directory, exist_ok=True)
+        metadata = self._run_metadata(summary)
+
+        tables = {
+            "issues": self._issues(graph),
+            "issue_instances": self._issue_instances(graph),
+            "issue_instance_shared_texts": self._issue_instance_shared_texts(graph),
+            "issue_instance_trace_frames": self._issue_instance_trace_frames(graph),
+            "trace_frames": self._trace_frames(graph),
+            "trace_frame_leaves": self._trace_frame_leaves(graph),
+        }
+        for name, columns in tables.items():
+            path = os.path.join(self.output_directory, f"{name}.parquet")
+            log.info("Exporting %s to `%s`", name, path)
+            table = pyarrow.Table.from_pydict(columns)
+            table = table.replace_schema_metadata(metadata)
+            parquet.write_table(table, path, compression=self.compression)
+
+        return input, summary
+
+    def _run_metadata(self, summary: Summary) -> Dict[str, str]:
+        run = summary.get("run")
+        if run is None:
+            return {}
+        fields = {
+            "job_id": run.job_id,
+            "date": run.date,
+            "kind": run.kind,
+            "repository": run.repository,
+            "branch": run.branch,
+            "commit_hash": run.commit_hash,
+        }
+        return {key: str(value) for key, value in fields.items() if value is not None}
+
+    def _issues(self, graph: TraceGraph) -> Columns:
+        columns: Columns = {"handle": [], "code": [], "status": [], "first_seen": []}
+        for issue in graph.get_issues():
+            columns["handle"].append(issue.handle)
+            columns["code"].append(issue.code)
+            columns["status"].append(issue.status.name)
+            columns["first_seen"].append(issue.first_seen)
+        return columns
+
+    def _issue_instances(self, graph: TraceGraph) -> Columns:
+        columns: Columns = {
+            "id": [],
+            "issue_handle": [],
+            "code": [],
+            "callable": [],
+            "filename": [],
+            "line": [],
+            "begin_column": [],
+            "end_column": [],
+            "message": [],
+            "min_trace_length_to_sources": [],
+            "min_trace_length_to_sinks": [],
+            "callable_count": [],
+        }
+        for instance in graph.get_issue_instances():
+            issue = graph.get_issue(instance.issue_id)
+            columns["id"].append(instance.id.local_id)
+            columns["issue_handle"].append(issue.handle)
+            columns["code"].append(issue.code)
+            columns["callable"].append(graph.get_text(instance.callable_id))
+            columns["filename"].append(graph.get_text(instance.filename_id))
+            columns["line"].append(instance.location.line_no)
+            columns["begin_column"].append(instance.location.begin_column)
+            columns["end_column"].append(instance.location.end_column)
+            columns["message"].append(graph.get_text(instance.message_id))
+            columns["min_trace_length_to_sources"].append(
+                instance.min_trace_length_to_sources
+            )
+            columns["min_trace_length_to_sinks"].append(
+                instance.min_trace_length_to_sinks
+            )
+            columns["callable_count"].append(instance.callable_count)
+        return columns
+
+    def _issue_instance_shared_texts(self, graph: TraceGraph) -> Columns:
+        columns: Columns = {"issue_instance_id": [], "kind": [], "contents": []}
+        for instance_id, shared_text in graph.get_issue_instance_shared_text_assocs():
+            columns["issue_instance_id"].append(instance_id)
+            columns["kind"].append(shared_text.kind.name)
+            columns["contents"].append(shared_text.contents)
+        return columns
+
+    def _issue_instance_trace_frames(self, graph: TraceGraph) -> Columns:
+        columns: Columns = {"issue_instance_id": [], "trace_frame_id": []}
+        for instance_id, frame_id in graph.get_issue_instance_trace_frame_assocs():
+            columns["issue_instance_id"].append(instance_id)
+            columns["trace_frame_id"].append(frame_id)
+        return columns
+
+    def _trace_frames(self, graph: TraceGraph) -> Columns:
+        columns: Columns = {
+            "id": [],
+            "kind": [],
+            "caller": [],
+            "caller_port": [],
+            "callee": [],
+            "callee_port": [],
+            "filename": [],
+            "line": [],
+            "begin_column": [],
+            "end_column": [],
+            "type_interval_lower": [],
+            "type_interval_upper": [],
+            "preserves_type_context": [],
+        }
+        for trace_frame in graph.get_trace_frames():
+            columns["id"].append(trace_frame.id.local_id)
+            columns["kind"].append(trace_frame.kind.name)
+            columns["caller"].append(graph.get_text(trace_frame.caller_id))
+            columns["caller_port"].append(trace_frame.caller_port)
+            columns["callee"].append(graph.get_text(trace_frame.callee_id))
+            columns["callee_port"].append(trace_frame.callee_port)
+            columns["filename"].append(graph.get_text(trace_frame.filename_id))
+            columns["line"].append(trace_frame.callee_location.line_no)
+            columns["begin_column"].append(trace_frame.callee_location.begin_column)
+            columns["end_column"].append(trace_frame.callee_location.end_column)
+            columns["type_interval_lower"].append(trace_frame.type_interval_lower)
+            columns["type_interval_upper"].append(trace_frame.type_interval_upper)
+            columns["preserves_type_context"].append(trace_frame.preserves_type_context)
+        return columns
+
+    def _trace_frame_leaves(self, graph: TraceGraph) -> Columns:
+        columns: Columns = {
+            "trace_frame_id": [],
+            "kind": [],
+            "leaf": [],
+            "trace_length": [],
+        }
+        for trace_frame in graph.get_trace_frames():
+            for leaf_id, depth in graph.get_trace_frame_leaf_ids_with_depths(
+                trace_frame
+            ):
+                leaf = graph.get_shared_text_by_local_id(leaf_id)
+                columns["trace_frame_id"].append(trace_frame.id.local_id)
+                columns["kind"].append(leaf.kind.name)
+                columns["leaf"].append(leaf.contents)
+                columns["trace_length"].append(depth)
+        return columns
@@ -7,7 +7,7 @@ import datetime
 import logging
 import os
 from collections import defaultdict
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
 import ujson as json
 
@@ -44,6 +44,10 @@ class ModelGenerator(PipelineStep[DictEntries, TraceGraph]):
         self.summary: Summary
         self.graph: TraceGraph
         self.visited_frames: Dict[int, Set[int]] = {}  # frame id -> leaf ids
+        # (kind, caller id, caller port) -> [(frame, leaf ids)]
+        self.next_frames: Dict[
+            Tuple[TraceKind, int, str], List[Tuple[TraceFrame, FrozenSet[int]]]
+        ] = {}
 
     def run(self, input: DictEntries, summary: Summary) -> Tuple[TraceGraph, Summary]:
         self.summary = summary
@@ -265,35 +269,69 @@ class ModelGenerator(PipelineStep[DictEntries, TraceGraph]):
         self, run: Run, start_frame: TraceFrame, leaf_ids: Set[int]
     ):
         """Generates all trace reachable from start_frame, provided they contain a
-        leaf_id from the initial set of leaf_ids."""
+        leaf_id from the initial set of leaf_ids.
+
+        Leaves already propagated through a frame (by this or an earlier issue)
+        are recorded in visited_frames and never walked again, and the successors
+        of a frame are only computed once per run. Leaves reaching the same frame
+        along several paths are merged before the frame is expanded.
+        """
 
         kind = start_frame.kind
-        queue = [(start_frame, leaf_ids)]
-        while len(queue) > 0:
-            frame, leaves = queue.pop()
-            if len(leaves) == 0:
-                continue
+        frames: Dict[int, TraceFrame] = {}
+        pending: Dict[int, Set[int]] = {}  # frame id -> leaf ids to propagate
+        stack: List[int] = []
 
+        def push(frame: TraceFrame, leaves: Set[int]) -> None:
             frame_id = frame.id.local_id
+            visited = self.visited_frames.get(frame_id)
+            if visited is not None:
+                leaves = leaves - visited
+            if len(leaves) == 0:
+                return
+            if frame_id in pending:
+                pending[frame_id].update(leaves)
+            else:
+                frames[frame_id] = frame
+                pending[frame_id] = set(leaves)
+                stack.append(frame_id)
+
+        push(start_frame, leaf_ids)
+        while len(stack) > 0:
+            frame_id = stack.pop()
+            frame = frames.pop(frame_id)
+            leaves = pending.pop(frame_id)
+
             if frame_id in self.visited_frames:
-                leaves = leaves - self.visited_frames[frame_id]
+                leaves -= self.visited_frames[frame_id]
                 if len(leaves) == 0:
                     continue
-                else:
-                    self.visited_frames[frame_id].update(leaves)
+                self.visited_frames[frame_id].update(leaves)
             else:
-                self.visited_frames[frame_id] = leaves
-
-            next_frames = self._get_or_populate_trace_frames(
-                kind, run, frame.callee_id, caller_port=frame.callee_port
-            )
-            queue.extend(
-                [
-                    # pyre-fixme[16]: `_Alias` has no attribute `intersection`.
-                    (frame, Set.intersection(leaves, frame_leaves))
-                    for (frame, frame_leaves) in next_frames
-                ]
-            )
+                self.visited_frames[frame_id] = set(leaves)
+
+            for (next_frame, next_leaves) in self._get_next_trace_frames(
+                kind, run, frame
+            ):
+                push(next_frame, leaves & next_leaves)
+
+    def _get_next_trace_frames(
+        self, kind: TraceKind, run: Run, frame: TraceFrame
+    ) -> List[Tuple[TraceFrame, FrozenSet[int]]]:
+        key = (kind, frame.callee_id.local_id, frame.callee_port)
+        next_frames = self.next_frames.get(key)
+        if next_frames is None:
+            next_frames = [
+                (next_frame, frozenset(next_leaves))
+                for (next_frame, next_leaves) in self._get_or_populate_trace_frames(
+                    kind, run, frame.callee_id, caller_port=frame.callee_port
+                )
+            ]
+            # Empty results are not memoized so that frames generated later for
+            # the same caller are still picked up.
+            if len(next_frames) > 0:
+                self.next_frames[key] = next_frames
+        return next_frames
 
     def _is_leaf_port(self, port: str) -> bool:
         return (
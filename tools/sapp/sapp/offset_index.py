@@ -0,0 +1,177 @@
+# Copyright (c) 2016-present, Facebook, Inc.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Persistent index of the entries of a jsonlines analysis output file.
+
+The index maps the callable of every entry to the byte offset of its line. It
+is built once per output file, stored next to it and memory-mapped thereafter,
+so looking up entries no longer requires rescanning the output.
+
+Layout (little endian):
+    header:  magic, size and mtime of the indexed file, number of records
+    records: (callable hash, line offset, name offset, name length), sorted
+    names:   utf-8 encoded callable names
+"""
+
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import xxhash
+
+
+log = logging.getLogger("sapp")
+
+INDEX_SUFFIX = ".offsets"
+
+_MAGIC = b"SAPPIDX1"
+_HEADER = struct.Struct("<8sQQQ")
+_RECORD = struct.Struct("<QQQI")
+
+
+def _hash(callable: str) -> int:
+    return xxhash.xxh64(callable.encode()).intdigest()
+
+
+class OffsetIndex:
+    def __init__(self, buffer, stat: Tuple[int, int]) -> None:
+        self.buffer = buffer
+        magic, size, mtime, self.count = _HEADER.unpack_from(buffer, 0)
+        self.valid: bool = magic == _MAGIC and (size, mtime) == stat
+        self.names_start: int = _HEADER.size + self.count * _RECORD.size
+
+    @classmethod
+    def load_or_build(
+        cls, path: str, get_callable: Callable[[bytes], Optional[str]]
+    ) -> "OffsetIndex":
+        """Memory-maps the index of `path`, (re)building it first if it is
+        missing or out of date. `get_callable` returns the callable of an entry
+        line, or None if the line should not be indexed."""
+        stat = _stat(path)
+        index = cls._load(path + INDEX_SUFFIX, stat)
+        if index is not None:
+            return index
+
+        log.info("Building offset index for `%s`", path)
+        data = cls._build(path, stat, get_callable)
+        if not _store(path + INDEX_SUFFIX, data):
+            log.warning("Unable to store offset index of `%s`", path)
+            return cls(data, stat)
+        index = cls._load(path + INDEX_SUFFIX, stat)
+        return index if index is not None else cls(data, stat)
+
+    @classmethod
+    def _load(cls, index_path: str, stat: Tuple[int, int]) -> Optional["OffsetIndex"]:
+        try:
+            with open(index_path, "rb") as index_file:
+                buffer = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(buffer) < _HEADER.size:
+            buffer.close()
+            return None
+        index = cls(buffer, stat)
+        if not index.valid:
+            index.close()
+            return None
+        return index
+
+    @staticmethod
+    def _build(
+        path: str, stat: Tuple[int, int], get_callable: Callable[[bytes], Optional[str]]
+    ) -> bytes:
+        entries: List[Tuple[int, int, bytes]] = []
+        with open(path, "rb") as handle:
+            offset = 0
+            for line in handle:
+                callable = get_callable(line)
+                if callable is not None:
+                    entries.append((_hash(callable), offset, callable.encode()))
+                offset += len(line)
+        entries.sort()
+
+        records = []
+        names = []
+        names_length = 0
+        for callable_hash, offset, name in entries:
+            records.append(_RECORD.pack(callable_hash, offset, names_length, len(name)))
+            names.append(name)
+            names_length += len(name)
+        header = _HEADER.pack(_MAGIC, stat[0], stat[1], len(entries))
+        return b"".join([header] + records + names)
+
+    def _record(self, position: int) -> Tuple[int, int, int, int]:
+        return _RECORD.unpack_from(self.buffer, _HEADER.size + position * _RECORD.size)
+
+    def _name(self, start: int, length: int) -> str:
+        start += self.names_start
+        return bytes(self.buffer[start : start + length]).decode()
+
+    def lookup(self, callable: str) -> List[int]:
+        """Offsets of the entries of `callable`, in file order."""
+        callable_hash = _hash(callable)
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._record(middle)[0] < callable_hash:
+                low = middle + 1
+            else:
+                high = middle
+
+        offsets = []
+        position = low
+        while position < self.count:
+            record_hash, offset, name_start, name_length = self._record(position)
+            if record_hash != callable_hash:
+                break
+            if self._name(name_start, name_length) == callable:
+                offsets.append(offset)
+            position += 1
+        return offsets
+
+    def entries(self) -> Iterable[Tuple[str, int]]:
+        """All (callable, offset) pairs, in file order."""
+        records = sorted(
+            (self._record(position) for position in range(self.count)),
+            key=lambda record: record[1],
+        )
+        for _callable_hash, offset, name_start, name_length in records:
+            yield self._name(name_start, name_length), offset
+
+    def close(self) -> None:
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def __enter__(self) -> "OffsetIndex":
+        return self
+
+    def __exit__(self, *arguments: object) -> None:
+        self.close()
+
+
+def _store(index_path: str, data: bytes) -> bool:
+    # Concurrent readers must never map a partially written index, so the index
+    # is written to a temporary file that replaces the old one in one step.
+    temporary_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(index_path) or ".", delete=False
+        ) as index_file:
+            temporary_path = index_file.name
+            index_file.write(data)
+        os.replace(temporary_path, index_path)
+        return True
+    except OSError:
+        if temporary_path is not None and os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        return False
+
+
+def _stat(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
@@ -35,10 +35,12 @@ class ParallelParser(BaseParser):
 
     def parse(self, input: AnalysisOutput) -> Iterable[Dict[str, Any]]:
         log.info("Parsing in parallel")
-        files = list(input.file_names())
-
-        # Pair up the arguments with each file.
-        args = zip([(self.parser, self.repo_dir, input.metadata)] * len(files), files)
+        # Pair up the arguments with each file. The pool consumes this lazily,
+        # so parsing starts while shards are still being discovered.
+        args = (
+            ((self.parser, self.repo_dir, input.metadata), path)
+            for path in input.file_names()
+        )
 
         with Pool(processes=None) as pool:
             for f in pool.imap_unordered(parse, args):
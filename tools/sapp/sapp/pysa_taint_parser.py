@@ -19,6 +19,7 @@ from .base_parser import (
     ParseType,
     log_trace_keyerror_in_generator,
 )
+from .offset_index import OffsetIndex
 
 
 log = logging.getLogger("sapp")
@@ -29,6 +30,27 @@ class Parser(BaseParser):
     for the Processor.
     """
 
+    def __init__(self, repo_dir=None):
+        super().__init__(repo_dir)
+        # Kept open until the parser is closed, either explicitly or by using it
+        # as a context manager.
+        self._offset_indices: Dict[str, OffsetIndex] = {}
+        self._open_files: Dict[str, IO[bytes]] = {}
+
+    def close(self) -> None:
+        for index in self._offset_indices.values():
+            index.close()
+        for handle in self._open_files.values():
+            handle.close()
+        self._offset_indices = {}
+        self._open_files = {}
+
+    def __enter__(self) -> "Parser":
+        return self
+
+    def __exit__(self, *arguments: object) -> None:
+        self.close()
+
     def parse(self, input: AnalysisOutput) -> Iterable[Dict[str, Any]]:
         for handle in input.file_handles():
             for entry in self.parse_handle(handle):
@@ -41,22 +63,49 @@ class Parser(BaseParser):
     # Instead of returning the actual json from the AnalysisOutput, we return
     # location information so it can be retrieved later.
     def get_json_file_offsets(self, input: AnalysisOutput) -> Iterable[EntryPosition]:
-        for handle in input.file_handles():
-            for entry, position in self._parse_v2(handle):
-                callable = self._get_callable(entry["data"].get("callable")).lstrip(
-                    "\\"
-                )
-                yield EntryPosition(
-                    callable=callable,
-                    shard=position["shard"],
-                    offset=position["offset"],
-                )
+        if input.file_handle is not None and not input.filename_spec:
+            # Nothing to index, fall back to scanning the handle.
+            for handle in input.file_handles():
+                for entry, position in self._parse_v2(handle):
+                    yield EntryPosition(
+                        callable=self._get_entry_callable(entry),
+                        shard=position["shard"],
+                        offset=position["offset"],
+                    )
+            return
+
+        for shard, path in enumerate(input.file_names()):
+            for callable, offset in self.get_offset_index(path).entries():
+                yield EntryPosition(callable=callable, shard=shard, offset=offset)
+
+    def get_offset_index(self, path: str) -> OffsetIndex:
+        """Returns the index of the entries of the jsonlines output at `path`,
+        building it the first time the output is seen."""
+        index = self._offset_indices.get(path)
+        if index is None:
+            index = OffsetIndex.load_or_build(path, self._get_line_callable)
+            self._offset_indices[path] = index
+        return index
 
     # Given a path and an offset, return the json in mostly-raw form.
     def get_json_from_file_offset(self, path: str, offset: int) -> Dict[str, Any]:
-        with open(path) as fh:
-            fh.seek(offset)
-            return json.loads(fh.readline())
+        handle = self._open_files.get(path)
+        if handle is None:
+            handle = open(path, "rb")
+            self._open_files[path] = handle
+        handle.seek(offset)
+        return json.loads(handle.readline())
+
+    def _get_entry_callable(self, entry: Dict[str, Any]) -> str:
+        return self._get_callable(entry["data"].get("callable")).lstrip("\\")
+
+    def _get_line_callable(self, line: bytes) -> Optional[str]:
+        if not line.strip():
+            return None
+        entry = json.loads(line)
+        if not entry or "file_version" in entry:
+            return None
+        return self._get_entry_callable(entry)
 
     def _parse_basic(self, handle: IO[str]) -> Iterable[Dict[str, Any]]:
         file_version = self._guess_file_version(handle)
@@ -0,0 +1,57 @@
+# Copyright (c) 2016-present, Facebook, Inc.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Set-based comparison of the issues found by two runs.
+
+Issues are matched across runs by their handle. All of the work happens in the
+database: only the handles of the resulting sets are loaded.
+"""
+
+from typing import List, NamedTuple
+
+from sqlalchemy.orm import Query, Session
+
+from .models import Issue, IssueInstance
+
+
+class RunDiff(NamedTuple):
+    new: List[str]
+    fixed: List[str]
+    persisting: List[str]
+
+
+def diff_runs(session: Session, base_run_id: int, run_id: int) -> RunDiff:
+    """Compare the issues of `run_id` against those of `base_run_id`.
+
+    New issues only appear in `run_id`, fixed issues only appear in
+    `base_run_id` and persisting issues appear in both."""
+    base_issue_ids = _issue_ids(session, base_run_id)
+    issue_ids = _issue_ids(session, run_id)
+
+    new = _handles(
+        session.query(Issue.handle)
+        .filter(Issue.id.in_(issue_ids))
+        .filter(~Issue.id.in_(base_issue_ids))
+    )
+    fixed = _handles(
+        session.query(Issue.handle)
+        .filter(Issue.id.in_(base_issue_ids))
+        .filter(~Issue.id.in_(issue_ids))
+    )
+    persisting = _handles(
+        session.query(Issue.handle)
+        .filter(Issue.id.in_(base_issue_ids))
+        .filter(Issue.id.in_(issue_ids))
+    )
+    return RunDiff(new=new, fixed=fixed, persisting=persisting)
+
+
+def _issue_ids(session: Session, run_id: int) -> Query:
+    return session.query(IssueInstance.issue_id).filter(IssueInstance.run_id == run_id)
+
+
+def _handles(query) -> List[str]:
+    return [handle for handle, in query.order_by(Issue.handle)]
@@ -6,6 +6,52 @@
 import fnmatch
 import os
 import re
+from typing import Dict, FrozenSet, Tuple, TypeVar
+
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+# Directory listings and the shard totals of patterns, by absolute path, along
+# with the modification time of the directory they were read from. Resolving a
+# shard pattern only needs a single scan of the directory, and repeatedly
+# resolving patterns in the same directory needs a single stat.
+_directory_listings: Dict[str, Tuple[int, FrozenSet[str]]] = {}
+_resolved_patterns: Dict[str, Tuple[int, int]] = {}
+
+# Caches keep this many entries, and forget the oldest ones first.
+MAXIMUM_CACHE_ENTRIES = 1024
+
+
+def store_in_cache(cache: Dict[K, V], key: K, value: V) -> None:
+    cache.pop(key, None)
+    while len(cache) >= MAXIMUM_CACHE_ENTRIES:
+        del cache[next(iter(cache))]
+    cache[key] = value
+
+
+def _directory_mtime(directory: str) -> int:
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def list_directory(directory: str) -> FrozenSet[str]:
+    """Names of the files in `directory`, or an empty set if it can't be
+    listed."""
+    directory = os.path.abspath(directory)
+    mtime = _directory_mtime(directory)
+    cached = _directory_listings.get(directory)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        with os.scandir(directory) as entries:
+            names = frozenset(entry.name for entry in entries if entry.is_file())
+    except OSError:
+        names = frozenset()
+    store_in_cache(_directory_listings, directory, (mtime, names))
+    return names
 
 
 class ShardedFileComponents(object):
@@ -96,46 +142,59 @@ class ShardedFile(object):
         Determine shards from pattern and record errors.
         """
         comps = ShardedFileComponents(pattern)
-        if comps.is_at_star_pattern():
-            comps.shard_total = self._find_unambiguous_shard_total(comps, pattern)
-        elif not comps.is_at_n_pattern():
+        if not comps.is_at_star_pattern() and not comps.is_at_n_pattern():
             raise ValueError("Pattern should use @n or @* for shard specification.")
 
+        # Relative patterns are resolved against the current directory.
+        key = os.path.abspath(pattern)
+        mtime = _directory_mtime(comps.directory)
+        cached = _resolved_patterns.get(key)
+        if cached is not None and cached[0] == mtime:
+            comps.shard_total = cached[1]
+            self._shard_file_names = [
+                comps.get_shard_filename(i) for i in range(comps.shard_total)
+            ]
+            return
+
+        names = list_directory(comps.directory)
+        if comps.is_at_star_pattern():
+            comps.shard_total = self._find_unambiguous_shard_total(comps, names)
+
         # now we have an @n spec.
-        self._set_shard_file_names(comps)
+        self._set_shard_file_names(comps, names)
         self._shard_file_names.sort()
+        store_in_cache(_resolved_patterns, key, (mtime, comps.shard_total))
 
     def get_filenames(self):
         return self._shard_file_names
 
-    def _set_shard_file_names(self, pcomps):
+    def _set_shard_file_names(self, pcomps, names):
         self._shard_file_names = []
         for i in range(pcomps.shard_total):
             filename = pcomps.get_shard_filename(i)
-            if not os.path.isfile(filename):
+            if os.path.basename(filename) not in names:
                 raise ValueError("Shard {} does not exist.".format(filename))
             self._shard_file_names.append(filename)
 
-    def _find_unambiguous_shard_total(self, pcomps, pattern):
+    def _find_unambiguous_shard_total(self, pcomps, names):
         dir = pcomps.directory
         if not os.path.isdir(dir):
             raise ValueError("Not a directory {}".format(dir))
 
         pattern = pcomps.stem + "@?????-of-?????" + pcomps.extension
         seen_shard_count = -1
-        for file in os.listdir(dir):
-            if fnmatch.fnmatch(file, pattern):
-                try:
-                    comps = ShardedFileComponents(file)
-                except ValueError:
-                    continue
-                if seen_shard_count == -1:
-                    seen_shard_count = comps.shard_total
-                elif seen_shard_count != comps.shard_total:
-                    [a, b] = sorted([seen_shard_count, comps.shard_total])
-                    raise ValueError(
-                        "@* matches ambiguous shard sets: @{} and @{}".format(a, b)
-                    )
+        for file in fnmatch.filter(names, pattern):
+            try:
+                comps = ShardedFileComponents(file)
+            except ValueError:
+                continue
+            if seen_shard_count == -1:
+                seen_shard_count = comps.shard_total
+            elif seen_shard_count != comps.shard_total:
+                [a, b] = sorted([seen_shard_count, comps.shard_total])
+                raise ValueError(
+                    "@* matches ambiguous shard sets: @{} and @{}".format(a, b)
+                )
         if seen_shard_count == -1:
             raise ValueError("Pattern matches no sharded file set: {}".format(pattern))
         return seen_shard_count
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from ..analysis_output import AnalysisOutput
+
+
+class AnalysisOutputTest(TestCase):
+    def test_metadata_is_cached_until_it_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            metadata_path = os.path.join(directory, "taint-metadata.json")
+
+            def write_metadata(version: str) -> None:
+                with open(metadata_path, "w") as file:
+                    json.dump(
+                        {
+                            "filename_spec": "taint-output.json",
+                            "root": "/root",
+                            "version": version,
+                        },
+                        file,
+                    )
+
+            write_metadata("1")
+            output = AnalysisOutput.from_directory(directory)
+            self.assertEqual(output.metadata.analysis_tool_version, "1")
+
+            with patch("builtins.open") as open_file, patch(
+                "os.listdir"
+            ) as listdir:
+                output = AnalysisOutput.from_directory(directory)
+                open_file.assert_not_called()
+                listdir.assert_not_called()
+            self.assertEqual(output.metadata.analysis_tool_version, "1")
+
+            write_metadata("22")
+            output = AnalysisOutput.from_directory(directory)
+            self.assertEqual(output.metadata.analysis_tool_version, "22")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+from unittest.mock import patch
+
+from .. import columnar_exporter
+from ..columnar_exporter import ColumnarExporter, parquet
+from ..errors import AIException
+from ..models import IssueStatus, SharedTextKind
+from ..trace_graph import TraceGraph
+from .fake_object_generator import FakeObjectGenerator
+
+
+class MissingPyarrowTest(TestCase):
+    def testMissingPyarrow(self):
+        with patch.object(columnar_exporter, "pyarrow", None):
+            with self.assertRaisesRegex(AIException, "pip install pyarrow"):
+                ColumnarExporter("output")
+            # The extra is named as in setup.py.
+            with self.assertRaisesRegex(AIException, r"sapp\[export\]"):
+                ColumnarExporter("output")
+
+
+@unittest.skipIf(parquet is None, "requires pyarrow")
+class ColumnarExporterTest(TestCase):
+    def setUp(self) -> None:
+        self.graph = TraceGraph()
+        self.fakes = FakeObjectGenerator(graph=self.graph)
+
+    def _read(self, directory: str, name: str):
+        return parquet.read_table(os.path.join(directory, f"{name}.parquet"))
+
+    def testExport(self):
+        run = self.fakes.run(job_id="job")
+        issue = self.fakes.issue(handle="handle", code=6016)
+        issue.status = IssueStatus.UNCATEGORIZED
+        instance = self.fakes.instance(
+            issue_id=issue.id, callable="module.function", filename="module.py"
+        )
+        instance.callable_count = 1
+        sink = self.fakes.sink("RCE")
+        self.graph.add_issue_instance_shared_text_assoc(instance, sink)
+        frame = self.fakes.precondition(caller="module.function", callee="eval")
+        self.graph.add_issue_instance_trace_frame_assoc(instance, frame)
+        self.graph.add_trace_frame_leaf_assoc(frame, sink, 0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            graph, _ = ColumnarExporter(directory).run(self.graph, {"run": run})
+            self.assertIs(graph, self.graph)
+
+            issues = self._read(directory, "issues")
+            self.assertEqual(issues.column("handle").to_pylist(), ["handle"])
+            self.assertEqual(issues.schema.metadata[b"job_id"], b"job")
+
+            instances = self._read(directory, "issue_instances").to_pylist()
+            self.assertEqual(len(instances), 1)
+            self.assertEqual(instances[0]["issue_handle"], "handle")
+            self.assertEqual(instances[0]["code"], 6016)
+            self.assertEqual(instances[0]["callable"], "module.function")
+            self.assertEqual(instances[0]["filename"], "module.py")
+            self.assertEqual(instances[0]["line"], 6)
+
+            shared_texts = self._read(
+                directory, "issue_instance_shared_texts"
+            ).to_pylist()
+            self.assertIn(
+                {
+                    "issue_instance_id": instance.id.local_id,
+                    "kind": SharedTextKind.SINK.name,
+                    "contents": "RCE",
+                },
+                shared_texts,
+            )
+
+            self.assertEqual(
+                self._read(directory, "issue_instance_trace_frames").to_pylist(),
+                [
+                    {
+                        "issue_instance_id": instance.id.local_id,
+                        "trace_frame_id": frame.id.local_id,
+                    }
+                ],
+            )
+
+            frames = self._read(directory, "trace_frames").to_pylist()
+            self.assertEqual(len(frames), 1)
+            self.assertEqual(frames[0]["caller"], "module.function")
+            self.assertEqual(frames[0]["callee"], "eval")
+
+            self.assertEqual(
+                self._read(directory, "trace_frame_leaves").to_pylist(),
+                [
+                    {
+                        "trace_frame_id": frame.id.local_id,
+                        "kind": SharedTextKind.SINK.name,
+                        "leaf": "RCE",
+                        "trace_length": 0,
+                    }
+                ],
+            )
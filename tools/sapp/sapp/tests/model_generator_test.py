@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+from typing import Any, Dict, FrozenSet, List, Set, Tuple
+from unittest import TestCase
+
+from ..model_generator import ModelGenerator
+from ..models import Run, TraceFrame, TraceKind
+
+
+class BaselineModelGenerator(ModelGenerator):
+    """Walks transitive trace frames without memoizing successors, as the model
+    generator originally did."""
+
+    def _generate_transitive_trace_frames(
+        self, run: Run, start_frame: TraceFrame, leaf_ids: Set[int]
+    ):
+        kind = start_frame.kind
+        queue = [(start_frame, leaf_ids)]
+        while len(queue) > 0:
+            frame, leaves = queue.pop()
+            if len(leaves) == 0:
+                continue
+
+            frame_id = frame.id.local_id
+            if frame_id in self.visited_frames:
+                leaves = leaves - self.visited_frames[frame_id]
+                if len(leaves) == 0:
+                    continue
+                else:
+                    self.visited_frames[frame_id].update(leaves)
+            else:
+                self.visited_frames[frame_id] = leaves
+
+            next_frames = self._get_or_populate_trace_frames(
+                kind, run, frame.callee_id, caller_port=frame.callee_port
+            )
+            queue.extend(
+                [
+                    (frame, leaves & frame_leaves)
+                    for (frame, frame_leaves) in next_frames
+                ]
+            )
+
+
+LOCATION = {"line": 1, "start": 1, "end": 2}
+
+
+def callinfo(callee: str, port: str, leaves: List[str]) -> Dict[str, Any]:
+    return {
+        "callee": callee,
+        "port": port,
+        "location": LOCATION,
+        "leaves": [(leaf, 1) for leaf in leaves],
+        "type_interval": {},
+    }
+
+
+def issue(callable: str, preconditions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "callable": callable,
+        "handle": callable,
+        "code": 1,
+        "message": "message",
+        "filename": "file.py",
+        "line": 1,
+        "start": 1,
+        "end": 2,
+        "preconditions": preconditions,
+        "postconditions": [],
+        "features": [],
+        "initial_sources": [],
+        "final_sinks": [],
+    }
+
+
+def frame(
+    caller: str, caller_port: str, callee: str, callee_port: str, sinks: List[str]
+) -> Dict[str, Any]:
+    return {
+        "caller": caller,
+        "caller_port": caller_port,
+        "callee": callee,
+        "callee_port": callee_port,
+        "callee_location": LOCATION,
+        "filename": "file.py",
+        "leaves": [(sink, 1) for sink in sinks],
+        "type_interval": {},
+    }
+
+
+def entries() -> Dict[str, Any]:
+    # `a` reaches `d` along two paths, with different leaves, and `d` calls
+    # back into `b`.
+    frames = [
+        frame("a", "formal(x)", "b", "formal(y)", ["SinkA", "SinkB"]),
+        frame("a", "formal(x)", "c", "formal(z)", ["SinkB", "SinkC"]),
+        frame("b", "formal(y)", "d", "formal(w)", ["SinkA", "SinkB"]),
+        frame("b", "formal(y)", "e", "formal(q)", ["SinkA"]),
+        frame("c", "formal(z)", "d", "formal(w)", ["SinkB", "SinkC"]),
+        frame("d", "formal(w)", "b", "formal(y)", ["SinkA", "SinkB"]),
+        frame("d", "formal(w)", "sink", "sink", ["SinkA", "SinkB", "SinkC"]),
+    ]
+    preconditions: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for entry in frames:
+        preconditions.setdefault((entry["caller"], entry["caller_port"]), []).append(
+            entry
+        )
+    return {
+        "issues": [
+            issue("main", [callinfo("a", "formal(x)", ["SinkA"])]),
+            issue("other", [callinfo("a", "formal(x)", ["SinkB", "SinkC"])]),
+            issue("third", [callinfo("c", "formal(z)", ["SinkC"])]),
+        ],
+        "preconditions": preconditions,
+        "postconditions": {},
+    }
+
+
+FrameKey = Tuple[str, str, str, str]
+
+
+class ModelGeneratorTest(TestCase):
+    def _generate(
+        self, generator: ModelGenerator
+    ) -> Tuple[Dict[FrameKey, FrozenSet[str]], Set[Tuple[str, str]]]:
+        summary = {
+            "job_id": None,
+            "repository": None,
+            "branch": None,
+            "commit_hash": None,
+            "run_kind": None,
+        }
+        graph, summary = generator.run(entries(), summary)
+
+        def text(id) -> str:
+            return graph.get_text(id)
+
+        frames = {
+            frame.id.local_id: (
+                text(frame.caller_id),
+                frame.caller_port,
+                text(frame.callee_id),
+                frame.callee_port,
+            )
+            for frame in graph.get_trace_frames()
+        }
+        leaves = {
+            frames[frame_id]: frozenset(
+                graph._shared_texts[leaf_id].contents for leaf_id in leaf_ids
+            )
+            for frame_id, leaf_ids in generator.visited_frames.items()
+        }
+        self.assertEqual(len(set(frames.values())), len(frames))
+        return leaves, set(summary["missing_traces"][TraceKind.PRECONDITION])
+
+    def test_transitive_trace_frames(self) -> None:
+        expected = self._generate(BaselineModelGenerator())
+        self.assertEqual(self._generate(ModelGenerator()), expected)
+
+        leaves, missing_traces = expected
+        self.assertEqual(
+            leaves[("b", "formal(y)", "d", "formal(w)")], frozenset({"SinkA", "SinkB"}),
+        )
+        self.assertEqual(
+            leaves[("d", "formal(w)", "sink", "sink")],
+            frozenset({"SinkA", "SinkB", "SinkC"}),
+        )
+        self.assertEqual(missing_traces, {("e", "formal(q)")})
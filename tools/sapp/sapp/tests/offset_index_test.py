@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from ..analysis_output import AnalysisOutput
+from ..base_parser import EntryPosition
+from ..offset_index import INDEX_SUFFIX, OffsetIndex
+from ..pysa_taint_parser import Parser
+
+
+def _entry(callable: str) -> str:
+    return json.dumps({"kind": "model", "data": {"callable": callable}}) + "\n"
+
+
+class OffsetIndexTest(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "taint-output.json")
+        self.lines = [
+            json.dumps({"file_version": 2, "config": {}}) + "\n",
+            _entry("foo"),
+            _entry("bar"),
+            "\n",
+            _entry("foo"),
+        ]
+        with open(self.path, "w") as output:
+            output.write("".join(self.lines))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _offset(self, line: int) -> int:
+        return sum(len(previous) for previous in self.lines[:line])
+
+    def testIndex(self) -> None:
+        parser = Parser()
+        with OffsetIndex.load_or_build(self.path, parser._get_line_callable) as index:
+            self.assertTrue(os.path.exists(self.path + INDEX_SUFFIX))
+            self.assertEqual(index.lookup("foo"), [self._offset(1), self._offset(4)])
+            self.assertEqual(index.lookup("bar"), [self._offset(2)])
+            self.assertEqual(index.lookup("baz"), [])
+            self.assertEqual(
+                list(index.entries()),
+                [
+                    ("foo", self._offset(1)),
+                    ("bar", self._offset(2)),
+                    ("foo", self._offset(4)),
+                ],
+            )
+
+        # The stored index is reused, not rebuilt.
+        with OffsetIndex.load_or_build(self.path, lambda line: None) as index:
+            self.assertEqual(index.lookup("bar"), [self._offset(2)])
+        # No temporary files are left behind.
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)),
+            ["taint-output.json", "taint-output.json" + INDEX_SUFFIX],
+        )
+
+    def testIndexIsRebuiltWhenOutputChanges(self) -> None:
+        parser = Parser()
+        OffsetIndex.load_or_build(self.path, parser._get_line_callable).close()
+
+        with open(self.path, "a") as output:
+            output.write(_entry("baz"))
+        with OffsetIndex.load_or_build(self.path, parser._get_line_callable) as index:
+            self.assertEqual(index.lookup("baz"), [self._offset(5)])
+
+    def testParserOffsets(self) -> None:
+        with Parser() as parser:
+            positions = list(
+                parser.get_json_file_offsets(AnalysisOutput.from_file(self.path))
+            )
+            self.assertEqual(
+                positions,
+                [
+                    EntryPosition(callable="foo", shard=0, offset=self._offset(1)),
+                    EntryPosition(callable="bar", shard=0, offset=self._offset(2)),
+                    EntryPosition(callable="foo", shard=0, offset=self._offset(4)),
+                ],
+            )
+            self.assertEqual(
+                parser.get_json_from_file_offset(self.path, positions[1].offset),
+                {"kind": "model", "data": {"callable": "bar"}},
+            )
+            self.assertEqual(
+                parser.get_json_from_file_offset(self.path, positions[0].offset),
+                {"kind": "model", "data": {"callable": "foo"}},
+            )
+        self.assertEqual(parser._open_files, {})
+        self.assertEqual(parser._offset_indices, {})
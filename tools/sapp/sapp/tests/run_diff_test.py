@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+from unittest import TestCase
+
+from ..db import DB, DBType
+from ..models import create as create_models
+from ..run_diff import RunDiff, diff_runs
+from .fake_object_generator import FakeObjectGenerator
+
+
+class RunDiffTest(TestCase):
+    def setUp(self) -> None:
+        self.db = DB(DBType.MEMORY)
+        create_models(self.db)
+        self.fakes = FakeObjectGenerator()
+
+    def testDiffRuns(self):
+        fixed = self.fakes.issue(handle="fixed")
+        persisting = self.fakes.issue(handle="persisting")
+        new = self.fakes.issue(handle="new")
+        self.fakes.save_all(self.db)
+
+        run1 = self.fakes.run()
+        self.fakes.instance(issue_id=fixed.id)
+        self.fakes.instance(issue_id=persisting.id)
+        self.fakes.save_all(self.db)
+
+        run2 = self.fakes.run()
+        self.fakes.instance(issue_id=persisting.id)
+        self.fakes.instance(issue_id=new.id)
+        self.fakes.instance(issue_id=new.id)
+        self.fakes.save_all(self.db)
+
+        with self.db.make_session() as session:
+            session.add(run1)
+            session.add(run2)
+            session.commit()
+
+            self.assertEqual(
+                diff_runs(session, int(run1.id), int(run2.id)),
+                RunDiff(new=["new"], fixed=["fixed"], persisting=["persisting"]),
+            )
+            self.assertEqual(
+                diff_runs(session, int(run2.id), int(run1.id)),
+                RunDiff(new=["fixed"], fixed=["new"], persisting=["persisting"]),
+            )
+            self.assertEqual(
+                diff_runs(session, int(run1.id), int(run1.id)),
+                RunDiff(new=[], fixed=[], persisting=["fixed", "persisting"]),
+            )
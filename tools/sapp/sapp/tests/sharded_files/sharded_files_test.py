@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 
 import os
+import tempfile
 import unittest
+from unittest.mock import patch
 
+from ... import sharded_files
 from ...sharded_files import ShardedFile
 
 
@@ -83,3 +86,62 @@ class TestShardedFiles(unittest.TestCase):
             f"Shard {test_path}/inconsistent@00001-of-00002.baz does not exist.",
         ):
             ShardedFile(pattern)
+
+    def test_resolution_is_cached_until_directory_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            shard = os.path.join(directory, "foo@00000-of-00001.bar")
+            open(shard, "w").close()
+            pattern = os.path.join(directory, "foo@*.bar")
+            self.assertEqual(ShardedFile(pattern).get_filenames(), [shard])
+
+            with patch("os.scandir") as scandir:
+                self.assertEqual(ShardedFile(pattern).get_filenames(), [shard])
+                scandir.assert_not_called()
+
+            os.remove(shard)
+            shards = [
+                os.path.join(directory, "foo@00000-of-00002.bar"),
+                os.path.join(directory, "foo@00001-of-00002.bar"),
+            ]
+            for shard in shards:
+                open(shard, "w").close()
+            self.assertEqual(ShardedFile(pattern).get_filenames(), shards)
+
+    def test_relative_patterns_are_resolved_in_the_current_directory(self):
+        current_directory = os.getcwd()
+        self.addCleanup(os.chdir, current_directory)
+        expected = {}
+        for total in [1, 2]:
+            directory = tempfile.TemporaryDirectory()
+            self.addCleanup(directory.cleanup)
+            expected[directory.name] = [
+                f"./foo@{index:05d}-of-{total:05d}.bar" for index in range(total)
+            ]
+            for name in expected[directory.name]:
+                open(os.path.join(directory.name, name), "w").close()
+
+        for directory, shards in expected.items():
+            os.chdir(directory)
+            self.assertEqual(ShardedFile("foo@*.bar").get_filenames(), shards)
+
+    def test_directories_are_not_shards(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.mkdir(os.path.join(directory, "foo@00000-of-00001.bar"))
+            with self.assertRaisesRegex(ValueError, "does not exist"):
+                ShardedFile(os.path.join(directory, "foo@1.bar"))
+            with self.assertRaisesRegex(ValueError, "matches no sharded file set"):
+                ShardedFile(os.path.join(directory, "foo@*.bar"))
+
+    def test_caches_are_bounded(self):
+        with tempfile.TemporaryDirectory() as directory, patch.object(
+            sharded_files, "MAXIMUM_CACHE_ENTRIES", 2
+        ):
+            for index in range(3):
+                shard = os.path.join(directory, f"foo{index}@00000-of-00001.bar")
+                open(shard, "w").close()
+                pattern = os.path.join(directory, f"foo{index}@*.bar")
+                self.assertEqual(ShardedFile(pattern).get_filenames(), [shard])
+            self.assertLessEqual(len(sharded_files._resolved_patterns), 2)
+            self.assertNotIn(
+                os.path.join(directory, "foo0@*.bar"), sharded_files._resolved_patterns
+            )
@@ -98,6 +98,9 @@ class TraceGraph(object):
     def get_issue(self, issue_id: DBID) -> Issue:
         return self._issues[issue_id.local_id]
 
+    def get_issues(self) -> Iterable[Issue]:
+        return (issue for issue in self._issues.values())
+
     def add_issue_instance(self, instance: IssueInstance) -> None:
         assert (
             instance.id.local_id not in self._issue_instances
@@ -186,6 +189,9 @@ class TraceGraph(object):
             for trace_frame_id in self._trace_frames_map[kind][key]
         ]
 
+    def get_trace_frames(self) -> Iterable[TraceFrame]:
+        return (trace_frame for trace_frame in self._trace_frames.values())
+
     def get_trace_frame_from_id(self, id: int) -> TraceFrame:
         return self._trace_frames[id]
 
@@ -269,6 +275,16 @@ class TraceGraph(object):
         else:
             return []
 
+    def get_issue_instance_trace_frame_assocs(self) -> Iterable[Tuple[int, int]]:
+        return (
+            (instance_id, trace_frame_id)
+            for (
+                instance_id,
+                trace_frame_ids,
+            ) in self._issue_instance_trace_frame_assoc.items()
+            for trace_frame_id in trace_frame_ids
+        )
+
     def get_next_trace_frames(self, trace_frame: TraceFrame) -> Iterable[TraceFrame]:
         return self.get_trace_frames_from_caller(
             trace_frame.kind, trace_frame.callee_id, trace_frame.callee_port
@@ -293,6 +309,18 @@ class TraceGraph(object):
             if self._shared_texts[msg_id].kind == kind
         ]
 
+    def get_issue_instance_shared_text_assocs(
+        self,
+    ) -> Iterable[Tuple[int, SharedText]]:
+        return (
+            (instance_id, self._shared_texts[shared_text_id])
+            for (
+                instance_id,
+                shared_text_ids,
+            ) in self._issue_instance_shared_text_assoc.items()
+            for shared_text_id in shared_text_ids
+        )
+
     def update_bulk_saver(self, bulk_saver: BulkSaver) -> None:
         bulk_saver.add_all(list(self._issues.values()))
         bulk_saver.add_all(list(self._issue_instances.values()))
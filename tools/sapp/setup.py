@@ -11,11 +11,13 @@ from setuptools import find_packages, setup
 with open("requirements.json") as json_file:
     data = json.load(json_file)
     requirements = data["sapp"]
+    extras_requirements = {"export": data["sapp_export"]}
 
 setup(
     name="sapp",
     version="0.1",
     install_requires=requirements,
+    extras_require=extras_requirements,
     entry_points={"console_scripts": ["sapp = sapp.cli:cli"]},
     packages=find_packages(),
     url="https://pyre-check.org/",
@@ -8,7 +8,7 @@ import logging
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Sequence
 
 from ..configuration import Configuration
 from ..errors import Errors, PartialErrorSuppression
@@ -163,8 +163,51 @@ class ProjectErrorSuppressingCommand(ErrorSuppressingCommand):
         parser.add_argument("--no-commit", action="store_true", help=argparse.SUPPRESS)
         parser.add_argument("--submit", action="store_true", help=argparse.SUPPRESS)
 
+    def _check_projects(
+        self, configurations: Sequence[Configuration], number_of_workers: int
+    ) -> Dict[Path, Errors]:
+        """Collects the errors that `_suppress_errors_in_project` would generate
+        for each configuration, checking up to `number_of_workers` projects at a
+        time. Configuration files are restored afterwards, so changes can still
+        be submitted one project at a time.
+
+        This is opt-in: with a single worker, nothing is collected and every
+        project is checked when it is processed, after the suppressions of the
+        projects before it were applied."""
+        if self._error_source == "stdin" and not self._upgrade_version:
+            return {}
+        configurations = [
+            configuration
+            for configuration in configurations
+            if configuration.is_local
+            and (configuration.version or not self._upgrade_version)
+        ]
+        if number_of_workers <= 1 or len(configurations) <= 1:
+            return {}
+
+        original_contents: Dict[Path, str] = {}
+        try:
+            if self._upgrade_version:
+                for configuration in configurations:
+                    path = configuration.get_path()
+                    original_contents[path] = path.read_text()
+                    version = configuration.version
+                    configuration.remove_version()
+                    configuration.write()
+                    configuration.version = version
+            errors = Configuration.get_errors_concurrently(
+                configurations, number_of_workers
+            )
+        finally:
+            for path, contents in original_contents.items():
+                path.write_text(contents)
+        return {
+            configuration.get_path(): configuration_errors
+            for configuration, configuration_errors in zip(configurations, errors)
+        }
+
     def _suppress_errors_in_project(
-        self, configuration: Configuration, root: Path
+        self, configuration: Configuration, root: Path, errors: Optional[Errors] = None
     ) -> None:
         LOG.info("Processing %s", configuration.get_directory())
         if not configuration.is_local:
@@ -175,11 +218,12 @@ class ProjectErrorSuppressingCommand(ErrorSuppressingCommand):
                 configuration.write()
             else:
                 return
-        errors = (
-            Errors.from_stdin(self._only_fix_error_code)
-            if self._error_source == "stdin" and not self._upgrade_version
-            else configuration.get_errors()
-        )
+        if errors is None:
+            errors = (
+                Errors.from_stdin(self._only_fix_error_code)
+                if self._error_source == "stdin" and not self._upgrade_version
+                else configuration.get_errors()
+            )
         if len(errors) > 0:
             self._suppress_errors(errors)
 
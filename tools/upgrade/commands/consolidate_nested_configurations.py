@@ -6,7 +6,7 @@
 import argparse
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional
 
 from typing_extensions import Final
 
@@ -20,6 +20,13 @@ from .command import CommandArguments, ErrorSuppressingCommand
 LOG: logging.Logger = logging.getLogger(__name__)
 
 
+def _read_targets(path: Path) -> List[str]:
+    try:
+        return Configuration(path).targets or []
+    except (OSError, ValueError):
+        return []
+
+
 class ConsolidateNestedConfigurations(ErrorSuppressingCommand):
     def __init__(
         self,
@@ -87,7 +94,12 @@ class ConsolidateNestedConfigurations(ErrorSuppressingCommand):
                 nested_configurations[configuration] = []
         return nested_configurations
 
-    def consolidate(self, topmost: Path, nested: List[Path]) -> None:
+    def consolidate(
+        self,
+        topmost: Path,
+        nested: List[Path],
+        expansions: Optional[Mapping[str, Optional[List[str]]]] = None,
+    ) -> None:
         total_targets = []
         for nested_configuration in nested:
             configuration = Configuration(nested_configuration)
@@ -96,7 +108,7 @@ class ConsolidateNestedConfigurations(ErrorSuppressingCommand):
                 total_targets.extend(targets)
         configuration = Configuration(topmost)
         configuration.add_targets(total_targets)
-        configuration.deduplicate_targets()
+        configuration.deduplicate_targets(expansions)
         configuration.write()
         self._repository.remove_paths(nested)
 
@@ -126,12 +138,24 @@ class ConsolidateNestedConfigurations(ErrorSuppressingCommand):
         # Gather nesting structure of configurations
         nested_configurations = self.gather_nested_configuration_mapping(configurations)
 
+        # Resolve the target patterns of all configurations that are consolidated
+        # at once rather than once per configuration.
+        expansions = Configuration.expand_targets(
+            target
+            for topmost, nested in nested_configurations.items()
+            if len(nested) > 0
+            for path in [topmost, *nested]
+            for target in _read_targets(Path(path))
+        )
+
         # Consolidate targets
         for topmost, nested in nested_configurations.items():
             if len(nested) == 0:
                 continue
             self.consolidate(
-                Path(topmost), [Path(configuration) for configuration in nested]
+                Path(topmost),
+                [Path(configuration) for configuration in nested],
+                expansions,
             )
 
         self._repository.submit_changes(
@@ -5,6 +5,7 @@
 
 import argparse
 import logging
+from typing import Optional
 
 from ..configuration import Configuration
 from ..repository import Repository
@@ -16,6 +17,29 @@ LOG: logging.Logger = logging.getLogger(__name__)
 
 
 class FixmeAll(ProjectErrorSuppressingCommand):
+    def __init__(
+        self,
+        command_arguments: CommandArguments,
+        *,
+        repository: Repository,
+        only_fix_error_code: Optional[int],
+        upgrade_version: bool,
+        error_source: str,
+        no_commit: bool,
+        submit: bool,
+        number_of_workers: int = 1,
+    ) -> None:
+        super().__init__(
+            command_arguments,
+            repository=repository,
+            only_fix_error_code=only_fix_error_code,
+            upgrade_version=upgrade_version,
+            error_source=error_source,
+            no_commit=no_commit,
+            submit=submit,
+        )
+        self._number_of_workers: int = number_of_workers
+
     @staticmethod
     def from_arguments(
         arguments: argparse.Namespace, repository: Repository
@@ -29,17 +53,30 @@ class FixmeAll(ProjectErrorSuppressingCommand):
             error_source=arguments.error_source,
             no_commit=arguments.no_commit,
             submit=arguments.submit,
+            number_of_workers=arguments.number_of_workers,
         )
 
     @classmethod
     def add_arguments(cls, parser: argparse.ArgumentParser) -> None:
         super(FixmeAll, cls).add_arguments(parser)
         parser.set_defaults(command=cls.from_arguments)
+        parser.add_argument(
+            "--number-of-workers",
+            type=int,
+            default=1,
+            help="Number of projects to check concurrently (default: 1). Checking "
+            "projects concurrently needs disk space for all of their builds at "
+            "once, and computes the errors of each project before suppressing "
+            "errors in any of them.",
+        )
 
     def run(self) -> None:
         project_configuration = Configuration.find_project_configuration()
         configurations = Configuration.gather_local_configurations()
+        errors = self._check_projects(configurations, self._number_of_workers)
         for configuration in configurations:
             self._suppress_errors_in_project(
-                configuration, project_configuration.parent
+                configuration,
+                project_configuration.parent,
+                errors.get(configuration.get_path()),
             )
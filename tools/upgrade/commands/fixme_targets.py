@@ -12,7 +12,7 @@ from typing_extensions import Final
 
 from ..configuration import Configuration
 from ..errors import errors_from_targets
-from ..filesystem import Target, find_targets
+from ..filesystem import Target, TargetsIndex, find_targets
 from ..repository import Repository
 from .command import CommandArguments, ErrorSuppressingCommand
 
@@ -29,11 +29,13 @@ class FixmeTargets(ErrorSuppressingCommand):
         subdirectory: Optional[str],
         no_commit: bool,
         submit: bool,
+        cache_targets: bool = False,
     ) -> None:
         super().__init__(command_arguments, repository)
         self._subdirectory: Final[Optional[str]] = subdirectory
         self._no_commit: bool = no_commit
         self._submit: bool = submit
+        self._cache_targets: bool = cache_targets
 
     @staticmethod
     def from_arguments(
@@ -46,6 +48,7 @@ class FixmeTargets(ErrorSuppressingCommand):
             subdirectory=arguments.subdirectory,
             no_commit=arguments.no_commit,
             submit=arguments.submit,
+            cache_targets=arguments.cache_targets,
         )
 
     @classmethod
@@ -59,6 +62,13 @@ class FixmeTargets(ErrorSuppressingCommand):
         parser.add_argument(
             "--no-commit", action="store_true", help="Keep changes in working state."
         )
+        parser.add_argument(
+            "--cache-targets",
+            action="store_true",
+            help="Keep the typecheck targets of parsed TARGETS files in the `.pyre` "
+            "directory of the project, so files are not parsed again by later "
+            "commands.",
+        )
 
     def run(self) -> None:
         subdirectory = self._subdirectory
@@ -67,7 +77,12 @@ class FixmeTargets(ErrorSuppressingCommand):
         project_directory = project_configuration.parent
         search_root = subdirectory if subdirectory else project_directory
 
-        all_targets = find_targets(search_root)
+        index = (
+            TargetsIndex.for_project(project_directory) if self._cache_targets else None
+        )
+        all_targets = find_targets(search_root, index=index)
+        if index is not None:
+            index.save()
         if not all_targets:
             return
         for path, targets in all_targets.items():
@@ -16,6 +16,7 @@ from ..configuration import Configuration
 from ..errors import Errors, PartialErrorSuppression
 from ..filesystem import (
     LocalMode,
+    TargetsIndex,
     add_local_mode,
     find_directories,
     find_files,
@@ -70,6 +71,7 @@ class TargetsToConfiguration(ErrorSuppressingCommand):
         submit: bool,
         pyre_only: bool,
         strict: bool,
+        cache_targets: bool = False,
     ) -> None:
         super().__init__(command_arguments, repository)
         self._subdirectory: Final[Optional[str]] = subdirectory
@@ -79,6 +81,8 @@ class TargetsToConfiguration(ErrorSuppressingCommand):
         self._submit: bool = submit
         self._pyre_only: bool = pyre_only
         self._strict: bool = strict
+        self._cache_targets: bool = cache_targets
+        self._targets_index: Optional[TargetsIndex] = None
 
     @staticmethod
     def from_arguments(
@@ -95,6 +99,7 @@ class TargetsToConfiguration(ErrorSuppressingCommand):
             submit=arguments.submit,
             pyre_only=arguments.pyre_only,
             strict=arguments.strict,
+            cache_targets=arguments.cache_targets,
         )
 
     @classmethod
@@ -130,6 +135,13 @@ class TargetsToConfiguration(ErrorSuppressingCommand):
             "--no-commit", action="store_true", help="Keep changes in working state."
         )
         parser.add_argument("--submit", action="store_true", help=argparse.SUPPRESS)
+        parser.add_argument(
+            "--cache-targets",
+            action="store_true",
+            help="Keep the typecheck targets of parsed TARGETS files in the `.pyre` "
+            "directory of the project, so files are not parsed again by later "
+            "commands.",
+        )
 
     def remove_target_typing_fields(self, files: List[Path]) -> None:
         LOG.info("Removing typing options from %s targets files", len(files))
@@ -154,7 +166,9 @@ class TargetsToConfiguration(ErrorSuppressingCommand):
             subprocess.run(remove_typing_fields_command)
 
     def convert_directory(self, directory: Path) -> None:
-        all_targets = find_targets(directory, pyre_only=self._pyre_only)
+        all_targets = find_targets(
+            directory, pyre_only=self._pyre_only, index=self._targets_index
+        )
         if not all_targets:
             LOG.warning("No configuration created because no targets found.")
             return
@@ -266,6 +280,11 @@ class TargetsToConfiguration(ErrorSuppressingCommand):
         LOG.info(
             "Converting typecheck targets to pyre configurations in `%s`", subdirectory
         )
+        if self._cache_targets:
+            project_configuration = Configuration.find_project_configuration(
+                subdirectory
+            )
+            self._targets_index = TargetsIndex.for_project(project_configuration.parent)
         configuration_directories = self._gather_directories(subdirectory)
         converted = []
         for directory in configuration_directories:
@@ -275,6 +294,9 @@ class TargetsToConfiguration(ErrorSuppressingCommand):
             ):
                 self.convert_directory(directory)
                 converted.append(directory)
+        targets_index = self._targets_index
+        if targets_index is not None:
+            targets_index.save()
 
         summary = self._repository.MIGRATION_SUMMARY
         glob = self._glob
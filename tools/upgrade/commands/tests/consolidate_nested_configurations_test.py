@@ -151,6 +151,7 @@ class ConsolidateNestedConfigurationsTest(unittest.TestCase):
                 Path("subdirectory/a/.pyre_configuration.local"),
                 Path("subdirectory/b/.pyre_configuration.local"),
             ],
+            {},
         )
 
         # Consolidate with no existing topmost configuration
@@ -5,8 +5,11 @@
 
 # pyre-unsafe
 
+import argparse
 import json
+import os
 import subprocess
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, call, mock_open, patch
@@ -142,6 +145,7 @@ class FixmeAllTest(unittest.TestCase):
         arguments.error_source = "generate"
         arguments.upgrade_version = True
         arguments.no_commit = False
+        arguments.number_of_workers = 1
         gather.return_value = []
         FixmeAll.from_arguments(arguments, repository).run()
         suppress_errors.assert_not_called()
@@ -259,6 +263,11 @@ class FixmeAllTest(unittest.TestCase):
         arguments.error_source = "generate"
         arguments.upgrade_version = True
         arguments.no_commit = False
+        # Projects are checked one at a time by default.
+        parser = argparse.ArgumentParser()
+        FixmeAll.add_arguments(parser)
+        arguments.number_of_workers = parser.parse_args([]).number_of_workers
+        self.assertEqual(arguments.number_of_workers, 1)
         gather.return_value = [
             Configuration(Path("local/.pyre_configuration.local"), {"version": 123})
         ]
@@ -327,3 +336,73 @@ class FixmeAllTest(unittest.TestCase):
         submit_changes.assert_called_once_with(
             commit=True, submit=True, title="Update pyre version for local"
         )
+
+    @patch.object(Configuration, "get_errors_concurrently")
+    @patch.object(Configuration, "get_errors")
+    @patch.object(Configuration, "gather_local_configurations")
+    @patch.object(Configuration, "find_project_configuration")
+    @patch.object(ErrorSuppressingCommand, "_suppress_errors")
+    @patch(f"{upgrade.__name__}.Repository.submit_changes")
+    def test_run_fixme_all_concurrently(
+        self,
+        submit_changes,
+        suppress_errors,
+        find_configuration,
+        gather,
+        get_errors,
+        get_errors_concurrently,
+    ) -> None:
+        arguments = MagicMock()
+        arguments.submit = False
+        arguments.lint = False
+        arguments.error_source = "generate"
+        arguments.upgrade_version = True
+        arguments.no_commit = False
+        arguments.number_of_workers = 2
+
+        with tempfile.TemporaryDirectory() as root:
+            find_configuration.return_value = Path(root) / ".pyre_configuration"
+            paths = []
+            for name in ["a", "b"]:
+                os.makedirs(os.path.join(root, name))
+                path = Path(root) / name / ".pyre_configuration.local"
+                path.write_text('{"version": "old"}')
+                paths.append(path)
+            gather.return_value = [Configuration(path) for path in paths]
+
+            def check(configurations, number_of_workers):
+                self.assertEqual(number_of_workers, 2)
+                # Projects are checked without their version override.
+                for path in paths:
+                    self.assertNotIn("version", json.loads(path.read_text()))
+                return [
+                    f"errors in {configuration.root}"
+                    for configuration in configurations
+                ]
+
+            submitted = []
+
+            def submit(**arguments):
+                # Projects that have not been submitted yet keep their original
+                # configuration.
+                submitted.append(arguments["title"])
+                self.assertEqual(
+                    [json.loads(path.read_text()) for path in paths],
+                    [
+                        {} if index < len(submitted) else {"version": "old"}
+                        for index in range(2)
+                    ],
+                )
+
+            get_errors_concurrently.side_effect = check
+            submit_changes.side_effect = submit
+            FixmeAll.from_arguments(arguments, repository).run()
+
+            get_errors.assert_not_called()
+            suppress_errors.assert_has_calls(
+                [
+                    call(f"errors in {paths[0].parent}"),
+                    call(f"errors in {paths[1].parent}"),
+                ]
+            )
+            self.assertEqual(len(submitted), 2)
@@ -34,8 +34,11 @@ class FixmeTargetsTest(unittest.TestCase):
         arguments = MagicMock()
         arguments.subdirectory = None
         arguments.no_commit = False
+        arguments.cache_targets = False
         find_targets.return_value = {}
         FixmeTargets.from_arguments(arguments, repository).run()
+        # TARGETS files are not indexed on disk unless asked to.
+        find_targets.assert_called_once_with(Path("."), index=None)
         fix_file.assert_not_called()
         submit_changes.assert_not_called()
 
@@ -6,9 +6,11 @@
 # pyre-unsafe
 
 import json
+import subprocess
 import unittest
 from pathlib import Path
 from textwrap import dedent
+from typing import List
 from unittest.mock import MagicMock, call, mock_open, patch
 
 import libcst
@@ -413,6 +415,7 @@ class TargetsToConfigurationTest(unittest.TestCase):
         arguments.glob = None
         arguments.fixme_threshold = None
         arguments.no_commit = False
+        arguments.cache_targets = False
 
         gather_directories.return_value = [Path("subdirectory")]
         TargetsToConfiguration.from_arguments(arguments, repository).run()
@@ -439,30 +442,46 @@ class TargetsToConfigurationTest(unittest.TestCase):
 
     @patch("subprocess.check_output")
     def test_deduplicate_targets(self, mock_check_output) -> None:
+        def query_output(**expanded_targets: List[str]) -> bytes:
+            return json.dumps(
+                {f"//{name}/...": targets for name, targets in expanded_targets.items()}
+            ).encode()
+
         configuration = Configuration(Path("test"), {"targets": ["//a:a"]})
         configuration.deduplicate_targets()
         expected_targets = ["//a:a"]
         self.assertEqual(expected_targets, configuration.targets)
+        mock_check_output.assert_not_called()
 
-        mock_check_output.side_effect = [b"a", b"b"]
+        mock_check_output.side_effect = [query_output(a=["a"], b=["b"])]
         configuration = Configuration(Path("test"), {"targets": ["//a/...", "//b/..."]})
         configuration.deduplicate_targets()
         expected_targets = ["//a/...", "//b/..."]
         self.assertEqual(expected_targets, configuration.targets)
+        mock_check_output.assert_called_once_with(
+            ["buck", "query", "--json", "%s", "//a/...", "//b/..."]
+        )
+
+        # Given expansions are not queried again.
+        mock_check_output.reset_mock()
+        configuration = Configuration(Path("test"), {"targets": ["//b/...", "//a/..."]})
+        configuration.deduplicate_targets({"//a/...": ["a"], "//b/...": ["b"]})
+        self.assertEqual(expected_targets, configuration.targets)
+        mock_check_output.assert_not_called()
 
-        mock_check_output.side_effect = [b"a", b"a"]
+        mock_check_output.side_effect = [query_output(a=["a"], b=["a"])]
         configuration = Configuration(Path("test"), {"targets": ["//a/...", "//b/..."]})
         configuration.deduplicate_targets()
         expected_targets = ["//a/..."]
         self.assertEqual(expected_targets, configuration.targets)
 
-        mock_check_output.side_effect = [b"a", b"a\nb"]
+        mock_check_output.side_effect = [query_output(a=["a"], b=["a", "b"])]
         configuration = Configuration(Path("test"), {"targets": ["//a/...", "//b/..."]})
         configuration.deduplicate_targets()
         expected_targets = ["//a/...", "//b/..."]
         self.assertEqual(expected_targets, configuration.targets)
 
-        mock_check_output.side_effect = [b"a", b"//c:c"]
+        mock_check_output.side_effect = [query_output(a=["a"], b=["//c:c"])]
         configuration = Configuration(
             Path("test"), {"targets": ["//a/...", "//b/...", "//c:c"]}
         )
@@ -470,8 +489,31 @@ class TargetsToConfigurationTest(unittest.TestCase):
         expected_targets = ["//a/...", "//b/..."]
         self.assertEqual(expected_targets, configuration.targets)
 
-        mock_check_output.side_effect = [b"//a/b:x\n//a/b:y"]
+        mock_check_output.side_effect = [
+            json.dumps({"//a/b:": ["//a/b:x", "//a/b:y"]}).encode()
+        ]
         configuration = Configuration(Path("test"), {"targets": ["//a/b:", "//a/b:x"]})
         configuration.deduplicate_targets()
         expected_targets = ["//a/b:"]
         self.assertEqual(expected_targets, configuration.targets)
+
+        # Patterns missing from the batched query output are queried on their
+        # own.
+        mock_check_output.side_effect = [query_output(a=["a"]), b"a"]
+        configuration = Configuration(Path("test"), {"targets": ["//a/...", "//b/..."]})
+        configuration.deduplicate_targets()
+        expected_targets = ["//a/..."]
+        self.assertEqual(expected_targets, configuration.targets)
+        mock_check_output.assert_called_with(["buck", "query", "//b/..."])
+
+        # Patterns are queried one by one when the batched query fails, and
+        # kept when they cannot be queried.
+        mock_check_output.side_effect = [
+            subprocess.CalledProcessError(1, "buck"),
+            b"a",
+            subprocess.CalledProcessError(1, "buck"),
+        ]
+        configuration = Configuration(Path("test"), {"targets": ["//a/...", "//b/..."]})
+        configuration.deduplicate_targets()
+        expected_targets = ["//a/...", "//b/..."]
+        self.assertEqual(expected_targets, configuration.targets)
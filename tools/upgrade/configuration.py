@@ -6,9 +6,10 @@
 import json
 import logging
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
 
 from . import UserError
 from .errors import Errors
@@ -18,6 +19,16 @@ from .filesystem import get_filesystem
 LOG: Logger = logging.getLogger(__name__)
 
 
+def _is_target_pattern(target: str) -> bool:
+    return target.endswith("/...") or target.endswith(":")
+
+
+def _query_target(target: str) -> List[str]:
+    return (
+        subprocess.check_output(["buck", "query", target]).decode().strip().split("\n")
+    )
+
+
 class Configuration:
     def __init__(
         self, path: Path, json_contents: Optional[Dict[str, Any]] = None
@@ -154,47 +165,117 @@ class Configuration:
         else:
             self.targets = targets
 
-    def deduplicate_targets(self) -> None:
+    @staticmethod
+    def expand_targets(targets: Iterable[str]) -> Dict[str, Optional[List[str]]]:
+        """Returns the targets matched by each target pattern, or None if it could
+        not be queried. All patterns are resolved with a single `buck query`, and
+        patterns missing from its output are queried one by one."""
+        patterns = sorted({target for target in targets if _is_target_pattern(target)})
+        if not patterns:
+            return {}
+        expanded: Dict[str, Any] = {}
+        try:
+            output = subprocess.check_output(
+                ["buck", "query", "--json", "%s", *patterns]
+            )
+            expanded = json.loads(output.decode())
+        except (subprocess.CalledProcessError, ValueError) as error:
+            # A single invalid pattern fails the whole query.
+            LOG.warning("Failed to query targets in bulk: %s", str(error))
+        expansions: Dict[str, Optional[List[str]]] = {}
+        for pattern in patterns:
+            pattern_targets = expanded.get(pattern)
+            if pattern_targets is None:
+                try:
+                    pattern_targets = _query_target(pattern)
+                except subprocess.CalledProcessError as error:
+                    LOG.warning("Failed to query target: %s\n%s", pattern, str(error))
+            expansions[pattern] = pattern_targets
+        return expansions
+
+    def deduplicate_targets(
+        self, expansions: Optional[Mapping[str, Optional[List[str]]]] = None
+    ) -> None:
+        """Removes targets matched by other target patterns of the configuration.
+        Patterns are expanded with `expand_targets`, unless they are in
+        `expansions`."""
         all_targets = self.targets
         if all_targets:
             all_targets = sorted(set(all_targets))
+            known_expansions = expansions or {}
+            all_expansions = {
+                **Configuration.expand_targets(
+                    target for target in all_targets if target not in known_expansions
+                ),
+                **known_expansions,
+            }
             deduplicated_targets = []
             expanded_targets = set()
             for target in all_targets:
-                if target.endswith("/...") or target.endswith(":"):
-                    try:
-                        expanded = (
-                            subprocess.check_output(["buck", "query", target])
-                            .decode()
-                            .strip()
-                            .split("\n")
-                        )
-                        if not all(target in expanded_targets for target in expanded):
-                            expanded_targets.update(expanded)
-                            deduplicated_targets.append(target)
-                    except subprocess.CalledProcessError as error:
-                        LOG.warning(
-                            "Failed to query target: %s\n%s", target, str(error)
-                        )
+                if _is_target_pattern(target):
+                    expanded = all_expansions[target]
+                    if expanded is None:
+                        deduplicated_targets.append(target)
+                    elif not all(target in expanded_targets for target in expanded):
+                        expanded_targets.update(expanded)
                         deduplicated_targets.append(target)
                 elif target not in expanded_targets:
                     expanded_targets.add(target)
                     deduplicated_targets.append(target)
             self.targets = deduplicated_targets
 
+    @staticmethod
+    def _clean_buck() -> bool:
+        try:
+            # If building targets, run clean or space may run out on device!
+            LOG.info("Running `buck clean`...")
+            subprocess.call(["buck", "clean"], timeout=200)
+            return True
+        except subprocess.TimeoutExpired:
+            LOG.warning("Buck timed out. Try running `buck kill` before retrying.")
+            return False
+        except subprocess.CalledProcessError as error:
+            LOG.warning("Error calling `buck clean`: %s", str(error))
+            return False
+
+    @staticmethod
+    def get_errors_concurrently(
+        configurations: Sequence["Configuration"],
+        number_of_workers: int,
+        only_fix_error_code: Optional[int] = None,
+        should_clean: bool = True,
+    ) -> List[Errors]:
+        """Checks up to `number_of_workers` configurations at a time and returns
+        their errors in order.
+
+        Buck is cleaned once before all checks rather than before each, so the
+        outputs of all concurrent builds accumulate on disk, and the builds
+        contend for the Buck daemon. Errors of all configurations are also
+        computed before any of them are suppressed, so they do not account for
+        suppressions in files shared between projects. Callers should only use
+        this when asked to, and check configurations one at a time with
+        `get_errors` by default."""
+        if (
+            should_clean
+            and any(configuration.targets for configuration in configurations)
+            and not Configuration._clean_buck()
+        ):
+            return [Errors.empty() for _ in configurations]
+        with ThreadPoolExecutor(max_workers=max(number_of_workers, 1)) as executor:
+            return list(
+                executor.map(
+                    lambda configuration: configuration.get_errors(
+                        only_fix_error_code, should_clean=False
+                    ),
+                    configurations,
+                )
+            )
+
     def get_errors(
         self, only_fix_error_code: Optional[int] = None, should_clean: bool = True
     ) -> Errors:
         if self.targets and should_clean:
-            try:
-                # If building targets, run clean or space may run out on device!
-                LOG.info("Running `buck clean`...")
-                subprocess.call(["buck", "clean"], timeout=200)
-            except subprocess.TimeoutExpired:
-                LOG.warning("Buck timed out. Try running `buck kill` before retrying.")
-                return Errors.empty()
-            except subprocess.CalledProcessError as error:
-                LOG.warning("Error calling `buck clean`: %s", str(error))
+            if not Configuration._clean_buck():
                 return Errors.empty()
         try:
             LOG.info("Checking `%s`...", self.root)
@@ -4,12 +4,16 @@
 # LICENSE file in the root directory of this source tree.
 
 import ast as builtin_ast
+import hashlib
+import json
 import logging
+import os
 import re
 import subprocess
+import tempfile
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, NamedTuple
+from typing import Dict, List, NamedTuple, Optional, Set
 
 from ...client.filesystem import get_filesystem
 from . import ast
@@ -74,6 +78,81 @@ class TargetCollector(builtin_ast.NodeVisitor):
         return self._contains_strict
 
 
+class TargetsIndex:
+    """Mapping from the hash of the contents of a TARGETS file to all typecheck
+    targets it declares, so files with the same contents are only parsed once.
+    Given a path, the index is loaded from it and can be saved for later
+    commands."""
+
+    # Bump whenever the targets TargetCollector finds for a file change, so
+    # indexes of previous versions are discarded.
+    VERSION: int = 3
+    # Beyond this size, only entries used by the current command are kept.
+    MAXIMUM_ENTRIES: int = 100000
+
+    def __init__(self, path: Optional[Path]) -> None:
+        self._path: Optional[Path] = path
+        self._entries: Dict[str, List[List[object]]] = {}
+        self._used: Set[str] = set()
+        self._changed: bool = False
+        if path is None:
+            return
+        try:
+            with open(path, "r") as index_file:
+                contents = json.load(index_file)
+            if contents.get("version") == TargetsIndex.VERSION:
+                self._entries = contents["targets"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, AttributeError) as error:
+            LOG.warning("Ignoring invalid targets index at `%s`: %s", path, error)
+
+    @staticmethod
+    def for_project(project_directory: Path) -> "TargetsIndex":
+        return TargetsIndex(project_directory / ".pyre" / "upgrade_targets_index.json")
+
+    def targets(self, source: str) -> List[Target]:
+        source_hash = hashlib.sha1(source.encode()).hexdigest()
+        self._used.add(source_hash)
+        entry = self._entries.get(source_hash)
+        if entry is None:
+            target_finder = TargetCollector(pyre_only=False)
+            target_finder.visit(builtin_ast.parse(source))
+            entry = [list(target) for target in target_finder.result()]
+            self._entries[source_hash] = entry
+            self._changed = True
+        return [
+            Target(str(name), bool(strict), bool(pyre)) for name, strict, pyre in entry
+        ]
+
+    def save(self) -> None:
+        path = self._path
+        if path is None or not self._changed:
+            return
+        entries = self._entries
+        if len(entries) > TargetsIndex.MAXIMUM_ENTRIES:
+            entries = {
+                source_hash: entry
+                for source_hash, entry in entries.items()
+                if source_hash in self._used
+            }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=str(path.parent), delete=False
+            ) as index_file:
+                json.dump(
+                    {
+                        "version": TargetsIndex.VERSION,
+                        "targets": entries,
+                    },
+                    index_file,
+                )
+            os.replace(index_file.name, str(path))
+        except OSError as error:
+            LOG.warning("Could not save targets index to `%s`: %s", path, error)
+
+
 def path_exists(filename: str) -> Path:
     path = Path(filename)
     if not path.exists():
@@ -81,20 +160,25 @@ def path_exists(filename: str) -> Path:
     return path
 
 
-def find_targets(search_root: Path, pyre_only: bool = False) -> Dict[str, List[Target]]:
+def find_targets(
+    search_root: Path, pyre_only: bool = False, index: Optional[TargetsIndex] = None,
+) -> Dict[str, List[Target]]:
+    """Returns the typecheck targets declared by each TARGETS file under
+    `search_root`. Parsed files are added to `index`, which callers save."""
     LOG.info("Finding typecheck targets in %s", search_root)
+    if index is None:
+        index = TargetsIndex(None)
     target_files = find_files(search_root, "TARGETS")
     target_names = {}
     total_targets = 0
     for target_file in target_files:
-        target_finder = TargetCollector(pyre_only)
         with open(target_file, "r") as source:
-            tree = builtin_ast.parse(source.read())
-            target_finder.visit(tree)
-            targets = target_finder.result()
-            if len(targets) > 0:
-                target_names[target_file] = targets
-                total_targets += len(targets)
+            targets = index.targets(source.read())
+        if pyre_only:
+            targets = [target for target in targets if target.pyre]
+        if len(targets) > 0:
+            target_names[target_file] = targets
+            total_targets += len(targets)
 
     LOG.info(
         "Found {} typecheck targets in {} TARGETS files to analyze".format(
@@ -33,3 +33,27 @@ class ConfigurationTest(unittest.TestCase):
         configuration.get_errors()
         assert call.call_count == 1
         assert run.call_count == 1
+
+    @patch("subprocess.call")
+    @patch("subprocess.run", return_value=mock_completed_process)
+    def test_get_errors_concurrently(self, run, call) -> None:
+        configurations = [
+            Configuration(Path("a/.pyre_configuration.local"), {"targets": ["//a"]}),
+            Configuration(Path("b/.pyre_configuration.local"), {"targets": ["//b"]}),
+            Configuration(Path("c/.pyre_configuration.local"), {}),
+        ]
+        errors = Configuration.get_errors_concurrently(configurations, 2)
+        self.assertEqual(
+            [len(configuration_errors) for configuration_errors in errors], [0, 0, 0]
+        )
+        # Buck is only cleaned once for all checks.
+        call.assert_called_once_with(["buck", "clean"], timeout=200)
+        self.assertEqual(run.call_count, 3)
+        self.assertEqual(
+            sorted(arguments[0][0][2] for arguments in run.call_args_list),
+            ["a", "b", "c"],
+        )
+
+        call.reset_mock()
+        Configuration.get_errors_concurrently(configurations, 2, should_clean=False)
+        call.assert_not_called()
@@ -4,11 +4,15 @@
 # LICENSE file in the root directory of this source tree.
 
 import ast
+import os
+import tempfile
 import unittest
+from pathlib import Path
 from textwrap import dedent
 from typing import List
+from unittest.mock import patch
 
-from ..filesystem import Target, TargetCollector
+from ..filesystem import Target, TargetCollector, TargetsIndex, find_targets
 
 
 class FilesystemTest(unittest.TestCase):
@@ -144,3 +148,62 @@ class FilesystemTest(unittest.TestCase):
         """
         expected_targets = [Target("target_name", strict=False, pyre=True)]
         self.assert_collector(source, expected_targets, True)
+
+    def test_find_targets(self) -> None:
+        source = dedent(
+            """
+            python_library(
+                name = "pyre",
+                check_types = True,
+                check_types_options = "strict",
+            )
+            python_library(
+                name = "mypy",
+                check_types = True,
+                check_types_options = "mypy",
+            )
+            """
+        )
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "a"))
+            os.makedirs(os.path.join(root, "b"))
+            for directory in ["a", "b"]:
+                with open(os.path.join(root, directory, "TARGETS"), "w") as targets:
+                    targets.write(source)
+            index_path = Path(root) / "index" / "targets.json"
+
+            all_targets = [Target("pyre", True, True), Target("mypy", False, False)]
+            index = TargetsIndex(index_path)
+            self.assertEqual(
+                find_targets(Path(root), index=index),
+                {
+                    os.path.join(root, "a", "TARGETS"): all_targets,
+                    os.path.join(root, "b", "TARGETS"): all_targets,
+                },
+            )
+            self.assertFalse(index_path.exists())
+            index.save()
+            self.assertTrue(index_path.exists())
+
+            # Files with known contents are not parsed again.
+            with patch.object(TargetCollector, "visit") as visit:
+                self.assertEqual(
+                    find_targets(
+                        Path(root), pyre_only=True, index=TargetsIndex(index_path)
+                    ),
+                    {
+                        os.path.join(root, "a", "TARGETS"): [
+                            Target("pyre", True, True)
+                        ],
+                        os.path.join(root, "b", "TARGETS"): [
+                            Target("pyre", True, True)
+                        ],
+                    },
+                )
+                visit.assert_not_called()
+
+            # Indexes of other versions are discarded.
+            with patch.object(TargetsIndex, "VERSION", TargetsIndex.VERSION + 1):
+                with patch.object(TargetCollector, "visit") as visit:
+                    find_targets(Path(root), index=TargetsIndex(index_path))
+                    visit.assert_called_once()